@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+SPEC-IT Dashboard render benchmark - terminal bytes written per frame
+Usage: python3 bench_dashboard.py [--updates N] [--cols N] [--rows N] [--json]
+
+Runs dashboard.py in a pseudo-terminal against a temporary session, applies
+a series of _status.json updates (the same tmp-file + mv that
+status-update.sh does) and counts the bytes the dashboard writes to the
+terminal for each resulting frame. Compares diff rendering with the
+--full-redraw (clear() every frame) mode.
+"""
+
+import argparse
+import json
+import os
+import pty
+import select
+import signal
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+DASHBOARD = Path(__file__).resolve().parent / "dashboard.py"
+
+
+def write_status(session: Path, data: dict):
+    tmp_file = session / f"_status.json.{os.getpid()}.tmp"
+    with open(tmp_file, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp_file, session / "_status.json")
+
+
+def status_for(update: int) -> dict:
+    steps = ["1.1", "1.2", "1.3", "1.4", "2.1", "2.2", "3.1", "3.2", "4.1", "5.1"]
+    step = steps[update % len(steps)]
+    agents = [
+        {"name": f"agent-{i}", "status": "completed" if i < update else "running"}
+        for i in range(update + 1)
+    ]
+    return {
+        "sessionId": "bench-session",
+        "mode": "plan",
+        "currentPhase": int(step.split(".")[0]),
+        "currentStep": step,
+        "completedPhases": list(range(1, int(step.split(".")[0]))),
+        "agents": agents,
+        "status": "in_progress",
+    }
+
+
+def read_until_quiet(fd: int, quiet: float = 0.15, limit: float = 3.0) -> bytes:
+    out = b""
+    deadline = time.monotonic() + limit
+    while time.monotonic() < deadline:
+        ready, _, _ = select.select([fd], [], [], quiet)
+        if not ready:
+            if out:
+                break
+            continue
+        try:
+            chunk = os.read(fd, 65536)
+        except OSError:
+            break
+        if not chunk:
+            break
+        out += chunk
+    return out
+
+
+def run_mode(full_redraw: bool, updates: int, cols: int, rows: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        session = Path(tmp) / ".spec-it" / "bench" / "plan"
+        session.mkdir(parents=True)
+        write_status(session, status_for(0))
+
+        args = [sys.executable, str(DASHBOARD), str(session), "--idle-refresh", "0"]
+        if full_redraw:
+            args.append("--full-redraw")
+
+        pid, fd = pty.fork()
+        if pid == 0:
+            os.environ["TERM"] = os.environ.get("TERM", "xterm-256color")
+            os.environ["LINES"] = str(rows)
+            os.environ["COLUMNS"] = str(cols)
+            os.execv(sys.executable, args)
+
+        try:
+            initial = len(read_until_quiet(fd, quiet=0.5))
+            frames = []
+            for update in range(1, updates + 1):
+                write_status(session, status_for(update))
+                frames.append(len(read_until_quiet(fd)))
+        finally:
+            try:
+                os.write(fd, b"q")
+                time.sleep(0.1)
+                os.kill(pid, signal.SIGKILL)
+            except OSError:
+                pass
+            os.waitpid(pid, 0)
+            os.close(fd)
+
+    return {
+        "mode": "full-redraw" if full_redraw else "diff",
+        "initialBytes": initial,
+        "frames": len(frames),
+        "totalBytes": sum(frames),
+        "avgBytesPerFrame": round(sum(frames) / len(frames), 1) if frames else 0,
+        "maxBytesPerFrame": max(frames) if frames else 0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dashboard terminal output")
+    parser.add_argument("--updates", type=int, default=20, help="Status updates to apply")
+    parser.add_argument("--cols", type=int, default=120, help="Terminal width")
+    parser.add_argument("--rows", type=int, default=45, help="Terminal height")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = [
+        run_mode(full_redraw, args.updates, args.cols, args.rows)
+        for full_redraw in (True, False)
+    ]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"Terminal {args.cols}x{args.rows}, {args.updates} status updates")
+    print(f"{'MODE':<14}{'INITIAL':>10}{'AVG/FRAME':>12}{'MAX/FRAME':>12}{'TOTAL':>10}")
+    for r in results:
+        print(
+            f"{r['mode']:<14}{r['initialBytes']:>10}{r['avgBytesPerFrame']:>12}"
+            f"{r['maxBytesPerFrame']:>12}{r['totalBytes']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,35 +1,637 @@
 #!/usr/bin/env python3
 """
 SPEC-IT Dashboard - Curses-based real-time monitoring
-Usage: python3 dashboard.py [session_path]
+Usage: python3 dashboard.py [session_path] [--stats-cache] [--poll]
+       python3 dashboard.py --all [search_root]
+       python3 dashboard.py --stream [--all] [path]   (NDJSON, no curses)
 """
 
-import curses
+import argparse
+import ctypes
+import ctypes.util
 import json
 import os
+import select
+import struct
 import subprocess
 import sys
+import time
+import unicodedata
 from datetime import datetime
 from pathlib import Path
+from typing import Optional
+
+try:
+    import curses
+except ImportError:
+    # Headless --stream mode works without curses
+    curses = None
+
+
+# Phase definitions (matches spec-it-execute SKILL.md)
+EXECUTE_PHASES = {
+    1: {"name": "LOAD", "desc": "Loading specs"},
+    2: {"name": "PLAN", "desc": "Execution planning"},
+    3: {"name": "EXECUTE", "desc": "Implementing code"},
+    4: {"name": "QA", "desc": "Build & test loop"},
+    5: {"name": "MIRROR", "desc": "Spec verification"},
+    6: {"name": "UNIT", "desc": "Unit tests (95%)"},
+    7: {"name": "E2E", "desc": "Playwright tests"},
+    8: {"name": "REVIEW", "desc": "Code & security"},
+    9: {"name": "DONE", "desc": "Complete"},
+}
+
+# Steps per phase
+EXECUTE_PHASE_STEPS = {
+    1: ["1.1", "1.2", "1.3"],
+    2: ["2.1", "2.2"],
+    3: ["3.0", "3.1"],
+    4: ["4.1"],
+    5: ["5.1", "5.2"],
+    6: ["6.1", "6.2", "6.3"],
+    7: ["7.1", "7.2", "7.3"],
+    8: ["8.1", "8.2"],
+    9: ["9.1"],
+}
+
+# SPEC-IT (plan) phase definitions
+SPEC_IT_PHASES = {
+    1: {"name": "BRAINSTORM", "desc": "Design Brainstorming"},
+    2: {"name": "UI-ARCH", "desc": "UI Architecture"},
+    3: {"name": "REVIEW", "desc": "Critical Review"},
+    4: {"name": "TEST-SPEC", "desc": "Test Specification"},
+    5: {"name": "ASSEMBLY", "desc": "Final Assembly"},
+    6: {"name": "APPROVAL", "desc": "Final Approval"},
+}
+
+# Steps per phase for progress calculation
+SPEC_IT_PHASE_STEPS = {
+    1: ["1.1", "1.2", "1.3", "1.4"],
+    2: ["2.1", "2.2"],
+    3: ["3.1", "3.2"],
+    4: ["4.1"],
+    5: ["5.1"],
+    6: ["6.1"],
+}
+
+
+class FileStatsIndex:
+    """Incremental markdown file/line counter keyed by (path, mtime, size).
+
+    Only new or changed files are re-read on each scan; entries for deleted
+    files are dropped. When index_file is set the index is persisted there so
+    a restarted dashboard starts warm.
+    """
+
+    VERSION = 1
+
+    def __init__(self, index_file: Optional[Path] = None):
+        self.index_file = index_file
+        # path -> [mtime_ns, size, lines]
+        self.entries = {}
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        if not self.index_file:
+            return
+        try:
+            with open(self.index_file, "r") as f:
+                data = json.load(f)
+            if data.get("version") == self.VERSION:
+                self.entries = {
+                    path: list(entry) for path, entry in data.get("files", {}).items()
+                }
+        except Exception:
+            self.entries = {}
+
+    def save(self):
+        if not self.index_file or not self.dirty:
+            return
+        tmp_file = self.index_file.with_name(self.index_file.name + ".tmp")
+        try:
+            with open(tmp_file, "w") as f:
+                json.dump({"version": self.VERSION, "files": self.entries}, f)
+            os.replace(tmp_file, self.index_file)
+            self.dirty = False
+        except OSError:
+            pass
+
+    @staticmethod
+    def count_lines(filepath: str) -> int:
+        lines = 0
+        last = b"\n"
+        with open(filepath, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 16), b""):
+                lines += chunk.count(b"\n")
+                last = chunk[-1:]
+        # A trailing line without newline still counts as a line
+        return lines + (0 if last == b"\n" else 1)
+
+    def iter_markdown(self, root: Path):
+        """Yield os.DirEntry for every non-underscore .md file under root"""
+        stack = [str(root)]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as it:
+                    for entry in it:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append(entry.path)
+                            elif entry.name.endswith(".md") and not entry.name.startswith("_"):
+                                yield entry
+                        except OSError:
+                            continue
+            except OSError:
+                continue
 
+    def scan(self, root: Path) -> tuple:
+        """Return (files_count, lines_count) for root, re-reading only changed files"""
+        files_count = 0
+        lines_count = 0
+        seen = {}
+        for entry in self.iter_markdown(root):
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            cached = self.entries.get(entry.path)
+            if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+                lines = cached[2]
+            else:
+                try:
+                    lines = self.count_lines(entry.path)
+                except OSError:
+                    lines = 0
+                cached = [st.st_mtime_ns, st.st_size, lines]
+                self.dirty = True
+            seen[entry.path] = cached
+            files_count += 1
+            lines_count += lines
+        if len(seen) != len(self.entries):
+            self.dirty = True
+        self.entries = seen
+        self.save()
+        return files_count, lines_count
+
+
+class InotifyWatcher:
+    """Watch files for changes through Linux inotify (ctypes, no extra deps).
+
+    Parent directories are watched rather than the files themselves, because
+    status-update.sh replaces _status.json with mv (IN_MOVED_TO).
+    """
+
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    EVENT_HEADER = struct.Struct("iIII")
+
+    def __init__(self, paths: list):
+        libc_name = ctypes.util.find_library("c") or "libc.so.6"
+        self.libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        # wd -> (directory, {file names})
+        self.watches = {}
+        for path in paths:
+            self.add(Path(path))
+
+    def add(self, path: Path):
+        directory = path.parent
+        for wd, (watched_dir, names) in self.watches.items():
+            if watched_dir == directory:
+                names.add(path.name)
+                return
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), self.MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed: {directory}")
+        self.watches[wd] = (directory, {path.name})
+
+    def remove(self, path: Path):
+        """Stop watching path; its directory watch goes with the last name"""
+        directory = path.parent
+        for wd, (watched_dir, names) in list(self.watches.items()):
+            if watched_dir == directory:
+                names.discard(path.name)
+                if not names:
+                    # Fails harmlessly when the directory is already gone
+                    self.libc.inotify_rm_watch(self.fd, wd)
+                    del self.watches[wd]
+                return
+
+    def fileno(self) -> int:
+        return self.fd
+
+    def read_events(self) -> set:
+        """Drain pending events and return the set of changed watched paths"""
+        changed = set()
+        while True:
+            try:
+                buf = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            except OSError:
+                break
+            if not buf:
+                break
+            offset = 0
+            while offset + self.EVENT_HEADER.size <= len(buf):
+                wd, _mask, _cookie, name_len = self.EVENT_HEADER.unpack_from(buf, offset)
+                offset += self.EVENT_HEADER.size
+                name = buf[offset : offset + name_len].rstrip(b"\0").decode(
+                    errors="replace"
+                )
+                offset += name_len
+                watch = self.watches.get(wd)
+                if watch and name in watch[1]:
+                    changed.add(watch[0] / name)
+        return changed
+
+    def close(self):
+        try:
+            os.close(self.fd)
+        except OSError:
+            pass
+
+
+class PollingWatcher:
+    """Fallback watcher comparing (mtime_ns, size, inode) of each file"""
+
+    def __init__(self, paths: list, interval: float = 1.0):
+        self.interval = interval
+        self.signatures = {}
+        for path in paths:
+            self.add(Path(path))
+
+    @staticmethod
+    def signature(path: Path):
+        try:
+            st = path.stat()
+            return (st.st_mtime_ns, st.st_size, st.st_ino)
+        except OSError:
+            return None
+
+    def add(self, path: Path):
+        self.signatures[path] = self.signature(path)
+
+    def remove(self, path: Path):
+        self.signatures.pop(path, None)
+
+    def fileno(self):
+        return None
+
+    def read_events(self) -> set:
+        changed = set()
+        for path, old in self.signatures.items():
+            new = self.signature(path)
+            if new != old:
+                self.signatures[path] = new
+                changed.add(path)
+        return changed
+
+    def close(self):
+        pass
+
+
+def create_watcher(paths: list, poll_interval: float = 1.0):
+    """Return an inotify watcher when available, otherwise a polling watcher"""
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(paths)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(paths, poll_interval)
+
+
+def wait_for_activity(watcher, timeout, input_fd: Optional[int] = 0) -> tuple:
+    """Block until watched files change, input arrives or timeout expires.
+
+    Returns (changed_paths, input_ready). timeout=None waits indefinitely
+    (polling watchers still wake every poll interval to check stat info).
+    input_fd=None waits on the watcher only.
+    """
+    fds = [] if input_fd is None else [input_fd]
+    watcher_fd = watcher.fileno()
+    if watcher_fd is not None:
+        fds.append(watcher_fd)
+        wait = timeout
+    else:
+        wait = watcher.interval if timeout is None else min(timeout, watcher.interval)
+    try:
+        ready, _, _ = select.select(fds, [], [], wait)
+    except (OSError, ValueError):
+        ready = []
+    changed = watcher.read_events() if watcher_fd is None or watcher_fd in ready else set()
+    return changed, input_fd in ready
+
+
+class Frame:
+    """In-memory screen model with the subset of the curses window API used
+    by the render methods (getmaxyx/addstr), so a frame can be built first
+    and diffed against the previous one before touching the terminal.
+    """
+
+    # Marks the right half of a double-width character
+    WIDE_TAIL = ""
+
+    def __init__(self, height: int, width: int):
+        self.height = height
+        self.width = width
+        self.chars = [[" "] * width for _ in range(height)]
+        self.attrs = [[0] * width for _ in range(height)]
+
+    def getmaxyx(self) -> tuple:
+        return self.height, self.width
+
+    def addstr(self, y, x, text, attr=0):
+        if y < 0 or y >= self.height:
+            raise curses.error("addstr() returned ERR")
+        chars = self.chars[y]
+        attrs = self.attrs[y]
+        for ch in text:
+            wide = unicodedata.east_asian_width(ch) in ("W", "F")
+            if x + (2 if wide else 1) > self.width:
+                raise curses.error("addstr() returned ERR")
+            chars[x] = ch
+            attrs[x] = attr
+            x += 1
+            if wide:
+                chars[x] = self.WIDE_TAIL
+                attrs[x] = attr
+                x += 1
+
+
+class FrameRenderer:
+    """Flush Frames to a curses window, writing only cells that changed.
+
+    Changed rows are rewritten from their first to last differing cell in
+    runs of equal attributes, then published with noutrefresh/doupdate.
+    full_redraw restores the old clear()-every-frame behaviour (used by the
+    render benchmark for comparison).
+    """
+
+    def __init__(self, full_redraw: bool = False):
+        self.full_redraw = full_redraw
+        self.previous = None
+
+    def invalidate(self):
+        self.previous = None
+
+    def new_frame(self, stdscr) -> Frame:
+        height, width = stdscr.getmaxyx()
+        return Frame(height, width)
+
+    def write_span(self, stdscr, frame: Frame, y: int, start: int, end: int):
+        chars = frame.chars[y]
+        attrs = frame.attrs[y]
+        # Never start in the middle of a double-width character
+        while start > 0 and chars[start] == Frame.WIDE_TAIL:
+            start -= 1
+        x = start
+        while x < end:
+            attr = attrs[x]
+            run_end = x
+            while run_end < end and attrs[run_end] == attr:
+                run_end += 1
+            text = "".join(chars[x:run_end])
+            try:
+                stdscr.addstr(y, x, text, attr)
+            except curses.error:
+                # Writing the bottom-right cell always reports ERR
+                pass
+            x = run_end
+
+    def present(self, stdscr, frame: Frame):
+        previous = self.previous
+        if (
+            self.full_redraw
+            or previous is None
+            or (previous.height, previous.width) != (frame.height, frame.width)
+        ):
+            if self.full_redraw:
+                stdscr.clear()
+            else:
+                stdscr.erase()
+            for y in range(frame.height):
+                self.write_span(stdscr, frame, y, 0, frame.width)
+        else:
+            for y in range(frame.height):
+                chars, attrs = frame.chars[y], frame.attrs[y]
+                old_chars, old_attrs = previous.chars[y], previous.attrs[y]
+                if chars == old_chars and attrs == old_attrs:
+                    continue
+                first = 0
+                while chars[first] == old_chars[first] and attrs[first] == old_attrs[first]:
+                    first += 1
+                last = frame.width
+                while (
+                    chars[last - 1] == old_chars[last - 1]
+                    and attrs[last - 1] == old_attrs[last - 1]
+                ):
+                    last -= 1
+                self.write_span(stdscr, frame, y, first, last)
+        self.previous = frame
+        stdscr.noutrefresh()
+        curses.doupdate()
+
+
+class CursesView:
+    """Shared curses drawing helpers for single- and multi-session views"""
+
+    def format_duration(self, seconds: int) -> str:
+        if seconds < 0:
+            seconds = 0
+        hours = seconds // 3600
+        minutes = (seconds % 3600) // 60
+        secs = seconds % 60
+        return f"{hours:02d}:{minutes:02d}:{secs:02d}"
+
+    def parse_iso_time(self, iso_str: str) -> datetime:
+        try:
+            if "T" in iso_str:
+                dt_part = iso_str.split("T")[0]
+                time_part = iso_str.split("T")[1].split("+")[0].split("-")[0]
+                if "." in time_part:
+                    time_part = time_part.split(".")[0]
+                return datetime.strptime(f"{dt_part} {time_part}", "%Y-%m-%d %H:%M:%S")
+        except:
+            pass
+        return datetime.now()
+
+    def safe_addstr(self, stdscr, y, x, text, attr=0):
+        height, width = stdscr.getmaxyx()
+        if y < 0 or y >= height or x < 0 or x >= width:
+            return
+        max_len = width - x - 1
+        if max_len <= 0:
+            return
+        try:
+            stdscr.addstr(y, x, text[:max_len], attr)
+        except curses.error:
+            pass
+
+    def draw_progress_bar(self, stdscr, y, x, bar_width, percent, color):
+        if bar_width <= 0:
+            return
+        filled = int(bar_width * percent / 100)
+        empty = bar_width - filled
+        self.safe_addstr(stdscr, y, x, "█" * filled, color)
+        self.safe_addstr(stdscr, y, x + filled, "░" * empty)
 
-class Dashboard:
-    def __init__(self, session_path: str):
+    def init_colors(self):
+        curses.start_color()
+        curses.use_default_colors()
+        curses.init_pair(1, curses.COLOR_CYAN, -1)
+        curses.init_pair(2, curses.COLOR_GREEN, -1)
+        curses.init_pair(3, curses.COLOR_YELLOW, -1)
+        curses.init_pair(4, curses.COLOR_RED, -1)
+        curses.init_pair(5, curses.COLOR_WHITE, -1)
+        curses.init_pair(6, curses.COLOR_BLACK, curses.COLOR_YELLOW)
+        curses.curs_set(0)
+
+
+class Dashboard(CursesView):
+    def __init__(
+        self, session_path: str, persist_stats: bool = False, full_redraw: bool = False
+    ):
         self.session_path = Path(session_path)
         self.status_file = self.session_path / "_status.json"
         self.meta_file = self.session_path / "_meta.json"
         # Note: _state.json is no longer used - all state is in _meta.json
+        self.stats_index = FileStatsIndex(
+            self.session_path / "_stats_index.json" if persist_stats else None
+        )
+        # Event-driven mode only rescans stats when session files change
+        self.stats_stale = True
+        self.stats_root = None
+        self.file_stats = (0, 0)
+        self.renderer = FrameRenderer(full_redraw)
+        # read_json / get_status caches keyed by file stat info
+        self.json_cache = {}
+        self.merged_key = None
+        self.merged_status = None
+        self.cache_stats = {
+            "read_hits": 0,
+            "read_misses": 0,
+            "merge_hits": 0,
+            "merge_misses": 0,
+        }
 
-    def read_json(self, filepath: Path) -> dict:
+    def stats_root_for(self, data: dict) -> Path:
+        """Calculate stats (prefer docsDir when available)"""
+        stats_root = self.session_path
+        docs_dir = data.get("docsDir")
+        if docs_dir:
+            try:
+                docs_path = Path(docs_dir)
+                if docs_path.exists():
+                    stats_root = docs_path
+            except Exception:
+                pass
+        return stats_root
+
+    def get_file_stats(self, stats_root: Path) -> tuple:
+        if self.stats_stale or stats_root != self.stats_root:
+            self.file_stats = self.stats_index.scan(stats_root)
+            self.stats_root = stats_root
+            self.stats_stale = False
+        return self.file_stats
+
+    def snapshot(self) -> Optional[dict]:
+        """Progress summary used by --stream (None until the session exists).
+
+        Built from the same get_status/detect_mode/compute_progress logic
+        as the curses views; contains no wall-clock fields so it only
+        changes when the session state does.
+        """
+        data = self.get_status()
+        if not data:
+            return None
+        mode = self.detect_mode(data)
+        phases, overall = self.compute_progress(data, mode)
+        agents = data.get("agents", [])
+        record = {
+            "session": str(self.session_path),
+            "sessionId": data.get("sessionId", "unknown"),
+            "mode": mode,
+            "status": data.get("status", "in_progress"),
+            "currentPhase": data.get("currentPhase", 1),
+            "currentStep": data.get("currentStep", "1.1"),
+            "overallProgress": overall,
+            "phases": [
+                {"phase": num, "name": info["name"], "progress": progress, "state": state}
+                for num, info, progress, state in phases
+            ],
+            "agentsRunning": [
+                a.get("name") for a in agents if isinstance(a, dict) and a.get("status") == "running"
+            ],
+            "agentsCompleted": sum(
+                1 for a in agents if isinstance(a, dict) and a.get("status") == "completed"
+            ),
+            "errors": len(data.get("errors", [])),
+            "waitingForUser": bool(data.get("waitingForUser", False)),
+            "startedAt": data.get("startedAt") or data.get("startTime"),
+        }
+        if record["waitingForUser"]:
+            record["waitingMessage"] = data.get("waitingMessage", "Waiting for user input")
+        if mode == "execute":
+            record["completedTasks"] = len(data.get("completedTasks", []))
+            record["currentTask"] = data.get("currentTask", "")
+            record["qaAttempts"] = data.get("qaAttempts", 0)
+            record["maxQaAttempts"] = data.get("maxQaAttempts", 5)
+        else:
+            files_count, lines_count = self.get_file_stats(self.stats_root_for(data))
+            record["files"] = files_count
+            record["lines"] = lines_count
+        return record
+
+    def read_json_versioned(self, filepath: Path) -> tuple:
+        """Return (version, data) where version is (mtime_ns, size, inode).
+
+        The file is only re-parsed when its stat info changed since the last
+        read; version is None when the file is missing.
+        """
+        try:
+            st = os.stat(filepath)
+        except OSError:
+            self.json_cache.pop(filepath, None)
+            return None, {}
+        version = (st.st_mtime_ns, st.st_size, st.st_ino)
+        cached = self.json_cache.get(filepath)
+        if cached and cached[0] == version:
+            self.cache_stats["read_hits"] += 1
+            return cached
+        self.cache_stats["read_misses"] += 1
         try:
             with open(filepath, "r") as f:
-                return json.load(f)
+                data = json.load(f)
         except:
-            return {}
+            # Partially written or invalid: retry on the next change
+            return version, {}
+        self.json_cache[filepath] = (version, data)
+        return version, data
+
+    def read_json(self, filepath: Path) -> dict:
+        return self.read_json_versioned(filepath)[1]
+
+    def cache_info(self) -> dict:
+        """Cache hit/miss counters for read_json and the status merge"""
+        return dict(self.cache_stats)
 
     def get_status(self) -> dict:
-        status = self.read_json(self.status_file)
-        meta = self.read_json(self.meta_file)
+        status_version, status = self.read_json_versioned(self.status_file)
+        meta_version, meta = self.read_json_versioned(self.meta_file)
+
+        # Merged result only depends on the two input versions
+        merge_key = (status_version, meta_version)
+        if self.merged_status is not None and merge_key == self.merged_key:
+            self.cache_stats["merge_hits"] += 1
+            return self.merged_status
+        self.cache_stats["merge_misses"] += 1
 
         # Merge: meta provides base, status provides runtime updates
         result = {**meta, **status}
@@ -53,6 +655,8 @@ class Dashboard:
         if status_progress and status_progress > 0:
             result["progress"] = status_progress
 
+        self.merged_key = merge_key
+        self.merged_status = result
         return result
 
     def detect_mode(self, data: dict) -> str:
@@ -72,45 +676,61 @@ class Dashboard:
             return "execute"
         return "spec-it"
 
-    def format_duration(self, seconds: int) -> str:
-        if seconds < 0:
-            seconds = 0
-        hours = seconds // 3600
-        minutes = (seconds % 3600) // 60
-        secs = seconds % 60
-        return f"{hours:02d}:{minutes:02d}:{secs:02d}"
+    def compute_progress(self, data: dict, mode: str) -> tuple:
+        """Per-phase and overall progress for a session.
 
-    def parse_iso_time(self, iso_str: str) -> datetime:
-        try:
-            if "T" in iso_str:
-                dt_part = iso_str.split("T")[0]
-                time_part = iso_str.split("T")[1].split("+")[0].split("-")[0]
-                if "." in time_part:
-                    time_part = time_part.split(".")[0]
-                return datetime.strptime(f"{dt_part} {time_part}", "%Y-%m-%d %H:%M:%S")
-        except:
-            pass
-        return datetime.now()
+        Returns (phases, overall) where phases is a list of
+        (phase_num, phase_info, progress, state) and state is one of
+        "complete", "current" or "pending".
+        """
+        if mode == "execute":
+            phases, phase_steps_map = EXECUTE_PHASES, EXECUTE_PHASE_STEPS
+        else:
+            phases, phase_steps_map = SPEC_IT_PHASES, SPEC_IT_PHASE_STEPS
 
-    def safe_addstr(self, stdscr, y, x, text, attr=0):
-        height, width = stdscr.getmaxyx()
-        if y < 0 or y >= height or x < 0 or x >= width:
-            return
-        max_len = width - x - 1
-        if max_len <= 0:
-            return
-        try:
-            stdscr.addstr(y, x, text[:max_len], attr)
-        except curses.error:
-            pass
+        current_phase = data.get("currentPhase", 1)
+        current_step = data.get("currentStep", "1.1")
+        # Normalize to integers
+        completed_phases = [int(p) for p in data.get("completedPhases", [])]
+        status = data.get("status", "in_progress")
 
-    def draw_progress_bar(self, stdscr, y, x, bar_width, percent, color):
-        if bar_width <= 0:
-            return
-        filled = int(bar_width * percent / 100)
-        empty = bar_width - filled
-        self.safe_addstr(stdscr, y, x, "█" * filled, color)
-        self.safe_addstr(stdscr, y, x + filled, "░" * empty)
+        result = []
+        total_progress = 0
+        for phase_num, phase_info in phases.items():
+            phase_steps = phase_steps_map.get(phase_num, [])
+            is_complete = phase_num in completed_phases or (
+                mode != "execute" and status == "completed"
+            )
+            is_current = phase_num == current_phase and not is_complete
+
+            # Simple progress calculation
+            if is_complete:
+                progress = 100
+            elif is_current and current_step:
+                # Calculate from currentStep position in phase_steps
+                # e.g., currentStep="2.1", phase_steps=['2.1','2.2'] → index 0, total 2
+                try:
+                    step_index = phase_steps.index(current_step)
+                    total_steps = len(phase_steps)
+                    # Step in progress = (index / total) * 100 + partial
+                    progress = int((step_index / total_steps) * 100) + int(
+                        50 / total_steps
+                    )
+                except (ValueError, ZeroDivisionError):
+                    progress = 10  # fallback
+            else:
+                progress = 0
+
+            # Accumulate overall progress
+            total_progress += progress / len(phases)
+
+            state = "complete" if is_complete else "current" if is_current else "pending"
+            result.append((phase_num, phase_info, progress, state))
+
+        overall = int(total_progress)
+        if status == "completed":
+            overall = 100
+        return result, overall
 
     def draw_overlay(self, stdscr, height, width, waiting_msg):
         box_width = min(50, width - 4)
@@ -119,11 +739,7 @@ class Dashboard:
         start_x = (width - box_width) // 2
 
         for yy in range(start_y, start_y + box_height):
-            for xx in range(start_x, start_x + box_width):
-                try:
-                    stdscr.addch(yy, xx, " ", curses.color_pair(6))
-                except curses.error:
-                    pass
+            self.safe_addstr(stdscr, yy, start_x, " " * box_width, curses.color_pair(6))
 
         self.safe_addstr(
             stdscr,
@@ -189,37 +805,11 @@ class Dashboard:
         WHITE = curses.color_pair(5)
 
         # Phase definitions (matches spec-it-execute SKILL.md)
-        PHASES = {
-            1: {"name": "LOAD", "desc": "Loading specs"},
-            2: {"name": "PLAN", "desc": "Execution planning"},
-            3: {"name": "EXECUTE", "desc": "Implementing code"},
-            4: {"name": "QA", "desc": "Build & test loop"},
-            5: {"name": "MIRROR", "desc": "Spec verification"},
-            6: {"name": "UNIT", "desc": "Unit tests (95%)"},
-            7: {"name": "E2E", "desc": "Playwright tests"},
-            8: {"name": "REVIEW", "desc": "Code & security"},
-            9: {"name": "DONE", "desc": "Complete"},
-        }
-
-        # Steps per phase
-        PHASE_STEPS = {
-            1: ["1.1", "1.2", "1.3"],
-            2: ["2.1", "2.2"],
-            3: ["3.0", "3.1"],
-            4: ["4.1"],
-            5: ["5.1", "5.2"],
-            6: ["6.1", "6.2", "6.3"],
-            7: ["7.1", "7.2", "7.3"],
-            8: ["8.1", "8.2"],
-            9: ["9.1"],
-        }
+        PHASES = EXECUTE_PHASES
 
         session_id = data.get("sessionId", "unknown")
         current_phase = data.get("currentPhase", 1)
         current_step = data.get("currentStep", "1.1")
-        completed_phases = data.get("completedPhases", [])
-        # Normalize to integers
-        completed_phases = [int(p) for p in completed_phases]
         qa_attempts = data.get("qaAttempts", 0)
         max_qa = data.get("maxQaAttempts", 5)
         spec_source = data.get("specSource", "-")
@@ -262,30 +852,11 @@ class Dashboard:
         y += 1
 
         bar_width = min(20, width - 35)
-        total_progress = 0
-
-        for phase_num, phase_info in PHASES.items():
-            phase_steps = PHASE_STEPS.get(phase_num, [])
-            is_complete = phase_num in completed_phases
-            is_current = phase_num == current_phase and not is_complete
-            is_future = phase_num > current_phase and not is_complete
-
-            # Simple progress calculation (same as spec-it)
-            if is_complete:
-                progress = 100
-            elif is_current and current_step:
-                try:
-                    step_index = phase_steps.index(current_step)
-                    total_steps = len(phase_steps)
-                    progress = int((step_index / total_steps) * 100) + int(
-                        50 / total_steps
-                    )
-                except (ValueError, ZeroDivisionError):
-                    progress = 10
-            else:
-                progress = 0
+        phases, overall_progress = self.compute_progress(data, "execute")
 
-            total_progress += progress / 9  # 9 phases in execute mode
+        for phase_num, phase_info, progress, state in phases:
+            is_complete = state == "complete"
+            is_current = state == "current"
 
             # Phase indicator
             if is_complete:
@@ -314,9 +885,6 @@ class Dashboard:
         y += 1
 
         # Overall Progress
-        overall_progress = int(total_progress)
-        if status == "completed":
-            overall_progress = 100
         self.safe_addstr(stdscr, y, 0, "─" * (width - 1))
         y += 1
         self.safe_addstr(stdscr, y, 2, "OVERALL", curses.A_BOLD)
@@ -380,32 +948,12 @@ class Dashboard:
         WHITE = curses.color_pair(5)
 
         # Phase definitions
-        PHASES = {
-            1: {"name": "BRAINSTORM", "desc": "Design Brainstorming"},
-            2: {"name": "UI-ARCH", "desc": "UI Architecture"},
-            3: {"name": "REVIEW", "desc": "Critical Review"},
-            4: {"name": "TEST-SPEC", "desc": "Test Specification"},
-            5: {"name": "ASSEMBLY", "desc": "Final Assembly"},
-            6: {"name": "APPROVAL", "desc": "Final Approval"},
-        }
-
-        # Steps per phase for progress calculation
-        PHASE_STEPS = {
-            1: ["1.1", "1.2", "1.3", "1.4"],
-            2: ["2.1", "2.2"],
-            3: ["3.1", "3.2"],
-            4: ["4.1"],
-            5: ["5.1"],
-            6: ["6.1"],
-        }
+        PHASES = SPEC_IT_PHASES
 
         session_id = data.get("sessionId", "unknown")
         current_phase = data.get("currentPhase", 1)
         current_step = data.get("currentStep", "1.1")
         completed_steps = data.get("completedSteps", [])
-        completed_phases = data.get("completedPhases", [])
-        # Normalize to integers
-        completed_phases = [int(p) for p in completed_phases]
         status = data.get("status", "in_progress")
 
         start_time_str = data.get("startTime") or data.get("startedAt", "")
@@ -415,26 +963,7 @@ class Dashboard:
         else:
             runtime = 0
 
-        # Calculate stats (prefer docsDir when available)
-        stats_root = self.session_path
-        docs_dir = data.get("docsDir")
-        if docs_dir:
-            try:
-                docs_path = Path(docs_dir)
-                if docs_path.exists():
-                    stats_root = docs_path
-            except Exception:
-                pass
-
-        files_count = 0
-        lines_count = 0
-        for md_file in stats_root.glob("**/*.md"):
-            if not md_file.name.startswith("_"):
-                files_count += 1
-                try:
-                    lines_count += sum(1 for _ in open(md_file))
-                except:
-                    pass
+        files_count, lines_count = self.get_file_stats(self.stats_root_for(data))
 
         y = 0
 
@@ -462,38 +991,11 @@ class Dashboard:
         y += 1
 
         bar_width = min(20, width - 35)
-        total_progress = 0
-
-        for phase_num, phase_info in PHASES.items():
-            phase_steps = PHASE_STEPS.get(phase_num, [])
-            is_complete = (
-                phase_num in completed_phases
-                or str(phase_num) in [str(p) for p in completed_phases]
-                or (status == "completed" and phase_num <= 6)
-            )
-            is_current = phase_num == current_phase and not is_complete
-            is_future = phase_num > current_phase and not is_complete
-
-            # Simple progress calculation
-            if is_complete:
-                progress = 100
-            elif is_current and current_step:
-                # Calculate from currentStep position in phase_steps
-                # e.g., currentStep="2.1", phase_steps=['2.1','2.2'] → index 0, total 2
-                try:
-                    step_index = phase_steps.index(current_step)
-                    total_steps = len(phase_steps)
-                    # Step in progress = (index / total) * 100 + partial
-                    progress = int((step_index / total_steps) * 100) + int(
-                        50 / total_steps
-                    )
-                except (ValueError, ZeroDivisionError):
-                    progress = 10  # fallback
-            else:
-                progress = 0
+        phases, overall_progress = self.compute_progress(data, "spec-it")
 
-            # Accumulate overall progress
-            total_progress += progress / 6
+        for phase_num, phase_info, progress, state in phases:
+            is_complete = state == "complete"
+            is_current = state == "current"
 
             # Phase indicator
             if is_complete:
@@ -526,9 +1028,6 @@ class Dashboard:
         y += 1
         self.safe_addstr(stdscr, y, 2, "OVERALL", curses.A_BOLD)
         overall_bar_width = min(40, width - 20)
-        overall_progress = int(total_progress)
-        if status == "completed":
-            overall_progress = 100
         self.safe_addstr(stdscr, y, 12, "[")
         self.draw_progress_bar(
             stdscr, y, 13, overall_bar_width, overall_progress, GREEN
@@ -664,102 +1163,650 @@ class Dashboard:
 
         return False
 
-    def render(self, stdscr):
-        curses.start_color()
-        curses.use_default_colors()
-        curses.init_pair(1, curses.COLOR_CYAN, -1)
-        curses.init_pair(2, curses.COLOR_GREEN, -1)
-        curses.init_pair(3, curses.COLOR_YELLOW, -1)
-        curses.init_pair(4, curses.COLOR_RED, -1)
-        curses.init_pair(5, curses.COLOR_WHITE, -1)
-        curses.init_pair(6, curses.COLOR_BLACK, curses.COLOR_YELLOW)
+    def draw(self, stdscr):
+        """Build the next frame and flush only what changed to the terminal"""
+        frame = self.renderer.new_frame(stdscr)
+        self.draw_frame(frame)
+        self.renderer.present(stdscr, frame)
 
-        curses.curs_set(0)
-        stdscr.timeout(1000)
+    def draw_frame(self, stdscr):
+        """Draw one full frame (stdscr may be a curses window or a Frame)"""
+        height, width = stdscr.getmaxyx()
 
-        while True:
-            try:
-                stdscr.clear()
-                height, width = stdscr.getmaxyx()
+        data = self.get_status()
 
-                data = self.get_status()
+        if not data:
+            self.safe_addstr(
+                stdscr, 1, 2, "Waiting for session...", curses.color_pair(3)
+            )
+            self.safe_addstr(stdscr, 2, 2, f"Path: {self.session_path}")
+            self.safe_addstr(stdscr, height - 1, 2, "Press 'q' to quit")
+            return
 
-                if not data:
-                    self.safe_addstr(
-                        stdscr, 1, 2, "Waiting for session...", curses.color_pair(3)
-                    )
-                    self.safe_addstr(stdscr, 2, 2, f"Path: {self.session_path}")
-                    self.safe_addstr(stdscr, height - 1, 2, "Press 'q' to quit")
-                    stdscr.refresh()
-                    if stdscr.getch() == ord("q"):
-                        break
-                    continue
+        mode = self.detect_mode(data)
+        waiting = data.get("waitingForUser", False)
+        waiting_msg = data.get("waitingMessage", "Waiting for user input")
+
+        # Render based on mode
+        if mode == "execute":
+            self.render_execute(stdscr, data, width, height)
+        else:
+            self.render_spec_it(stdscr, data, width, height)
 
-                mode = self.detect_mode(data)
-                waiting = data.get("waitingForUser", False)
-                waiting_msg = data.get("waitingMessage", "Waiting for user input")
+        # Common footer
+        self.render_footer(stdscr, width, height)
 
-                # Render based on mode
-                if mode == "execute":
-                    self.render_execute(stdscr, data, width, height)
-                else:
-                    self.render_spec_it(stdscr, data, width, height)
+        # Overlay for user input
+        if waiting:
+            self.draw_overlay(stdscr, height, width, waiting_msg)
 
-                # Common footer
-                self.render_footer(stdscr, width, height)
+    def handle_key(self, key) -> bool:
+        """Handle a key press; returns False when the dashboard should exit"""
+        if key == ord("q"):
+            return False
+        elif key == ord("r"):
+            if self.return_to_parent_terminal():
+                # Successfully switched, continue running dashboard
+                pass
+        return True
 
-                # Overlay for user input
-                if waiting:
-                    self.draw_overlay(stdscr, height, width, waiting_msg)
+    def render(self, stdscr, watch: bool = True, idle_refresh: float = 1.0):
+        self.init_colors()
+        if watch:
+            self.render_watch(stdscr, idle_refresh)
+        else:
+            self.render_poll(stdscr)
 
-                stdscr.refresh()
+    def render_poll(self, stdscr):
+        """Legacy mode: redraw everything once per second"""
+        stdscr.timeout(1000)
 
-                key = stdscr.getch()
-                if key == ord("q"):
+        while True:
+            try:
+                self.stats_stale = True
+                self.draw(stdscr)
+                if not self.handle_key(stdscr.getch()):
                     break
-                elif key == ord("r"):
-                    if self.return_to_parent_terminal():
-                        # Successfully switched, continue running dashboard
-                        pass
 
             except KeyboardInterrupt:
                 break
             except Exception as e:
                 self.safe_addstr(stdscr, 0, 0, f"Error: {str(e)}")
                 stdscr.refresh()
+                self.renderer.invalidate()
                 if stdscr.getch() == ord("q"):
                     break
 
+    def render_watch(self, stdscr, idle_refresh: float = 1.0):
+        """Event-driven mode: repaint when session files change or a key arrives.
+
+        Idle wakeups (idle_refresh seconds, 0 to disable) only advance the
+        runtime clock and pick up terminal resizes; the diff renderer makes
+        such a frame nearly free. File stats are rescanned on session file
+        changes.
+        """
+        watcher = create_watcher([self.status_file, self.meta_file])
+        try:
+            run_event_loop(stdscr, self, watcher, idle_refresh)
+        finally:
+            watcher.close()
+
+    def on_files_changed(self, changed: set):
+        self.stats_stale = True
+
+    def on_idle(self):
+        pass
+
+
+class MultiDashboard(CursesView):
+    """Compact list of every .spec-it session under a root directory.
+
+    All sessions share one watcher and one event loop. Enter opens the
+    regular single-session view for the selected row, b/Esc returns.
+    """
+
+    def __init__(
+        self,
+        start_path: str = ".",
+        persist_stats: bool = False,
+        discover_interval: float = 5.0,
+        full_redraw: bool = False,
+        use_registry: bool = True,
+        rescan: bool = False,
+    ):
+        self.start_path = start_path
+        self.use_registry = use_registry
+        self.rescan = rescan
+        self.persist_stats = persist_stats
+        self.renderer = FrameRenderer(full_redraw)
+        self.discover_interval = discover_interval
+        self.last_discover = 0.0
+        self.sessions = {}
+        self.selected = 0
+        self.scroll = 0
+        self.detail = None
+        self.watcher = None
+        # Session dir -> (get_status merge key, session_summary row)
+        self.summaries = {}
+
+    def discover(self) -> bool:
+        """Pick up new sessions and drop removed ones; returns True on change"""
+        self.last_discover = time.monotonic()
+        found = find_sessions(self.start_path, self.use_registry, self.rescan)
+        # Later rediscovery only relists the known .spec-it roots
+        self.rescan = False
+        changed = False
+        for session_path in found:
+            if session_path not in self.sessions:
+                dashboard = Dashboard(session_path, persist_stats=self.persist_stats)
+                self.sessions[session_path] = dashboard
+                if self.watcher:
+                    self.watcher.add(dashboard.status_file)
+                    self.watcher.add(dashboard.meta_file)
+                changed = True
+        # Sessions no longer found take their watches and stats index along
+        for session_path in set(self.sessions) - set(found):
+            dashboard = self.sessions.pop(session_path)
+            self.summaries.pop(dashboard.session_path, None)
+            if self.watcher:
+                self.watcher.remove(dashboard.status_file)
+                self.watcher.remove(dashboard.meta_file)
+            if self.detail is dashboard:
+                self.detail = None
+            changed = True
+        # Keep discovery order (most recently updated first)
+        order = {path: i for i, path in enumerate(found)}
+        self.sessions = dict(
+            sorted(self.sessions.items(), key=lambda item: order.get(item[0], len(order)))
+        )
+        self.selected = min(self.selected, max(0, len(self.sessions) - 1))
+        return changed
+
+    def session_summary(self, dashboard) -> dict:
+        """Row data for one session, recomputed only when the versions of
+        its _status.json/_meta.json (the get_status merge key) change"""
+        data = dashboard.get_status()
+        cached = self.summaries.get(dashboard.session_path)
+        if cached is not None and cached[0] == dashboard.merged_key:
+            return cached[1]
+        if not data:
+            summary = {"data": data}
+            self.summaries[dashboard.session_path] = (dashboard.merged_key, summary)
+            return summary
+        mode = dashboard.detect_mode(data)
+        _, overall = dashboard.compute_progress(data, mode)
+        current_phase = data.get("currentPhase", 1)
+        phase_info = (EXECUTE_PHASES if mode == "execute" else SPEC_IT_PHASES).get(
+            current_phase, {"name": "Unknown"}
+        )
+        summary = {
+            "data": data,
+            "mode": mode,
+            "overall": overall,
+            "phase": f"P{current_phase} {phase_info['name']}",
+            "step": str(data.get("currentStep", "")),
+            "status": data.get("status", "in_progress"),
+            "waiting": data.get("waitingForUser", False),
+        }
+        self.summaries[dashboard.session_path] = (dashboard.merged_key, summary)
+        return summary
+
+    def draw(self, stdscr):
+        frame = self.renderer.new_frame(stdscr)
+        if self.detail is not None:
+            self.detail.draw_frame(frame)
+        else:
+            self.draw_frame(frame)
+        self.renderer.present(stdscr, frame)
+
+    def draw_frame(self, stdscr):
+        CYAN = curses.color_pair(1)
+        GREEN = curses.color_pair(2)
+        YELLOW = curses.color_pair(3)
+        RED = curses.color_pair(4)
+
+        height, width = stdscr.getmaxyx()
+
+        self.safe_addstr(stdscr, 0, 0, "═" * (width - 1), CYAN)
+        self.safe_addstr(
+            stdscr, 1, 2, f"SPEC-IT SESSIONS ({len(self.sessions)})", CYAN | curses.A_BOLD
+        )
+        self.safe_addstr(stdscr, 2, 0, "═" * (width - 1), CYAN)
+        self.safe_addstr(
+            stdscr,
+            3,
+            4,
+            f"{'SESSION':<22}{'MODE':<9}{'PHASE':<15}{'STEP':<6}PROGRESS",
+            curses.A_BOLD,
+        )
+
+        list_top = 4
+        rows = max(1, height - list_top - 2)
+        if self.selected < self.scroll:
+            self.scroll = self.selected
+        elif self.selected >= self.scroll + rows:
+            self.scroll = self.selected - rows + 1
+
+        if not self.sessions:
+            self.safe_addstr(stdscr, list_top, 4, "No sessions found", YELLOW)
+
+        bar_width = max(0, min(20, width - 75))
+        visible = list(self.sessions.items())[self.scroll : self.scroll + rows]
+        for i, (session_path, dashboard) in enumerate(visible):
+            y = list_top + i
+            index = self.scroll + i
+            summary = self.session_summary(dashboard)
+            row_attr = curses.A_REVERSE if index == self.selected else 0
+            marker = "►" if index == self.selected else " "
+            session_id = Path(session_path).parent.name
+            self.safe_addstr(stdscr, y, 2, marker, row_attr)
+
+            if not summary["data"]:
+                self.safe_addstr(
+                    stdscr, y, 4, f"{session_id[:21]:<22}waiting for session...", row_attr
+                )
+                continue
+
+            session_id = str(summary["data"].get("sessionId", session_id))
+            mode_label = "EXECUTE" if summary["mode"] == "execute" else "PLAN"
+            self.safe_addstr(
+                stdscr,
+                y,
+                4,
+                f"{session_id[:21]:<22}{mode_label:<9}{summary['phase'][:14]:<15}"
+                f"{summary['step'][:5]:<6}",
+                row_attr,
+            )
+            x = 56
+            self.safe_addstr(stdscr, y, x, "[")
+            self.draw_progress_bar(stdscr, y, x + 1, bar_width, summary["overall"], GREEN)
+            self.safe_addstr(stdscr, y, x + 1 + bar_width, f"] {summary['overall']:3d}%")
+            x += bar_width + 8
+            status = summary["status"]
+            status_color = GREEN if status == "completed" else RED if status == "error" else 0
+            self.safe_addstr(stdscr, y, x, status[:12], status_color)
+            if summary["waiting"]:
+                self.safe_addstr(stdscr, y, x + 13, "! INPUT", YELLOW | curses.A_BOLD)
+
+        self.safe_addstr(
+            stdscr, height - 1, 2, "q: Quit  |  ↑/↓ j/k: Select  |  Enter: Details"
+        )
+
+    def handle_key(self, key) -> bool:
+        if self.detail is not None:
+            if key in (27, ord("b"), curses.KEY_BACKSPACE, curses.KEY_LEFT):
+                self.detail = None
+                return True
+            return self.detail.handle_key(key)
+
+        if key == ord("q"):
+            return False
+        elif key in (curses.KEY_UP, ord("k")):
+            self.selected = max(0, self.selected - 1)
+        elif key in (curses.KEY_DOWN, ord("j")):
+            self.selected = min(max(0, len(self.sessions) - 1), self.selected + 1)
+        elif key in (curses.KEY_ENTER, 10, 13):
+            sessions = list(self.sessions.values())
+            if sessions:
+                self.detail = sessions[self.selected]
+                self.detail.stats_stale = True
+        return True
+
+    def on_files_changed(self, changed: set):
+        for dashboard in self.sessions.values():
+            if dashboard.status_file in changed or dashboard.meta_file in changed:
+                dashboard.stats_stale = True
+
+    def on_idle(self):
+        if time.monotonic() - self.last_discover >= self.discover_interval:
+            self.discover()
+
+    def render(self, stdscr, idle_refresh: float = 1.0):
+        self.init_colors()
+        self.discover()
+        paths = []
+        for dashboard in self.sessions.values():
+            paths += [dashboard.status_file, dashboard.meta_file]
+        self.watcher = create_watcher(paths)
+        # Rediscovery runs on idle wakeups, so they never stop entirely here
+        if idle_refresh and idle_refresh > 0:
+            idle_refresh = min(idle_refresh, self.discover_interval)
+        else:
+            idle_refresh = self.discover_interval
+        try:
+            run_event_loop(stdscr, self, self.watcher, idle_refresh)
+        finally:
+            self.watcher.close()
+
+
+def run_event_loop(stdscr, view, watcher, idle_refresh: float = 1.0):
+    """Shared refresh scheduler: draw, then sleep until files change or input.
+
+    view provides draw(stdscr), handle_key(key) -> bool,
+    on_files_changed(paths) and on_idle().
+    """
+    stdscr.nodelay(True)
+    timeout = idle_refresh if idle_refresh and idle_refresh > 0 else None
+
+    while True:
+        try:
+            view.draw(stdscr)
+            changed, input_ready = wait_for_activity(watcher, timeout)
+            if changed:
+                view.on_files_changed(changed)
+            elif not input_ready:
+                view.on_idle()
+            if input_ready or not changed:
+                key = stdscr.getch()
+                while key != -1:
+                    if not view.handle_key(key):
+                        return
+                    key = stdscr.getch()
+
+        except KeyboardInterrupt:
+            break
+        except Exception as e:
+            view.safe_addstr(stdscr, 0, 0, f"Error: {str(e)}")
+            stdscr.refresh()
+            view.renderer.invalidate()
+            stdscr.nodelay(False)
+            if stdscr.getch() == ord("q"):
+                break
+            stdscr.nodelay(True)
+
+
+class StatusStream:
+    """Headless NDJSON emitter: one record per real session state change.
 
-def find_session(start_path: str = ".") -> str:
-    # New structure: .spec-it/{sessionId}/(plan|execute)
-    candidates = []
-    patterns = [
-        ".spec-it/*/plan/_status.json",
-        ".spec-it/*/execute/_status.json",
-        "**/.spec-it/*/plan/_status.json",
-        "**/.spec-it/*/execute/_status.json",
-    ]
+    Only the last emitted snapshot per session is kept, so memory stays
+    bounded by the number of sessions being followed.
+    """
 
-    for pattern in patterns:
-        for f in Path(start_path).glob(pattern):
+    def __init__(self, out=None):
+        self.out = out or sys.stdout
+        self.last = {}
+
+    def emit(self, record: dict):
+        record = {"ts": datetime.now().astimezone().isoformat(timespec="seconds"), **record}
+        self.out.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self.out.flush()
+
+    def emit_changes(self, dashboards: dict):
+        for path, dashboard in dashboards.items():
+            record = dashboard.snapshot()
+            if record is None or record == self.last.get(path):
+                continue
+            self.last[path] = record
+            self.emit(record)
+        for path in list(self.last):
+            if path not in dashboards:
+                del self.last[path]
+                self.emit({"session": path, "event": "removed"})
+
+
+def run_stream(view, once: bool = False):
+    """Emit NDJSON snapshots for a Dashboard or MultiDashboard until interrupted"""
+    stream = StatusStream()
+    multi = isinstance(view, MultiDashboard)
+    if multi:
+        view.discover()
+        dashboards = view.sessions
+    else:
+        dashboards = {str(view.session_path): view}
+
+    paths = []
+    for dashboard in dashboards.values():
+        paths += [dashboard.status_file, dashboard.meta_file]
+    watcher = create_watcher(paths)
+    if multi:
+        view.watcher = watcher
+    timeout = view.discover_interval if multi else None
+
+    try:
+        while True:
+            stream.emit_changes(view.sessions if multi else dashboards)
+            if once:
+                break
+            changed, _ = wait_for_activity(watcher, timeout, input_fd=None)
+            if changed:
+                view.on_files_changed(changed)
+            elif multi:
+                view.on_idle()
+    except (KeyboardInterrupt, BrokenPipeError):
+        pass
+    finally:
+        watcher.close()
+
+
+# Directories never searched for .spec-it roots
+SESSION_SEARCH_IGNORED_DIRS = {
+    "node_modules",
+    ".git",
+    ".hg",
+    ".svn",
+    ".next",
+    ".nuxt",
+    "dist",
+    "build",
+    "coverage",
+    "__pycache__",
+    ".venv",
+    "venv",
+    ".turbo",
+    ".cache",
+    "target",
+}
+
+
+# Remembered .spec-it roots are trusted for this many seconds
+REGISTRY_TTL = 600
+
+
+def registry_path() -> Path:
+    """Session root registry under the user's state dir"""
+    state_home = os.environ.get("XDG_STATE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".local", "state"
+    )
+    return Path(state_home) / "spec-it" / "session-roots.json"
+
+
+def load_registry() -> dict:
+    try:
+        with open(registry_path(), "r") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except Exception:
+        return {}
+
+
+def save_registry(registry: dict):
+    path = registry_path()
+    tmp_file = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_file, "w") as f:
+            json.dump(registry, f, indent=2)
+        os.replace(tmp_file, path)
+    except OSError:
+        pass
+
+
+def find_spec_it_roots(start_path: str = ".") -> list:
+    """Walk start_path for .spec-it directories.
+
+    Ignored directories (node_modules, .git, dist, ...) and the .spec-it
+    directories themselves are pruned; the rest of the tree is still walked,
+    so nested monorepo packages with their own .spec-it are found too.
+    """
+    roots = []
+    for root, dirs, _files in os.walk(start_path):
+        if ".spec-it" in dirs:
+            roots.append(os.path.abspath(os.path.join(root, ".spec-it")))
+        dirs[:] = [
+            d for d in dirs if d != ".spec-it" and d not in SESSION_SEARCH_IGNORED_DIRS
+        ]
+    return roots
+
+
+def list_root_sessions(spec_it_root: str) -> dict:
+    """Map session dir -> _status.json mtime for .spec-it/{sessionId}/(plan|execute)"""
+    sessions = {}
+    try:
+        entries = list(os.scandir(spec_it_root))
+    except OSError:
+        return sessions
+    for entry in entries:
+        if not entry.is_dir():
+            continue
+        for kind in ("plan", "execute"):
+            session_dir = os.path.join(entry.path, kind)
             try:
-                candidates.append((f.stat().st_mtime, f.parent))
-            except Exception:
+                sessions[session_dir] = os.stat(
+                    os.path.join(session_dir, "_status.json")
+                ).st_mtime
+            except OSError:
                 continue
+    return sessions
+
+
+def registry_entry_stale(entry, start_path: str) -> bool:
+    """Whether remembered roots need a new walk: missing or malformed, older
+    than REGISTRY_TTL or than start_path itself, or a root disappeared"""
+    if not isinstance(entry, dict) or not entry.get("roots"):
+        return True
+    walked = entry.get("walked", 0)
+    try:
+        if time.time() - walked > REGISTRY_TTL or os.stat(start_path).st_mtime > walked:
+            return True
+    except (OSError, TypeError):
+        return True
+    return not all(os.path.isdir(root) for root in entry["roots"])
+
+
+def find_sessions(
+    start_path: str = ".", use_registry: bool = True, rescan: bool = False
+) -> list:
+    """All session directories under start_path, most recently updated first.
+
+    Known .spec-it roots are remembered per start path in the registry, so
+    repeat launches skip the directory walk; a walk happens on the first
+    launch, with rescan=True, when start_path changed since the last walk,
+    when that walk is older than REGISTRY_TTL, or when a remembered root
+    disappeared.
+    """
+    key = str(Path(start_path).resolve())
+    registry = load_registry() if use_registry else {}
+    entry = registry.get(key)
+    if rescan or registry_entry_stale(entry, start_path):
+        walked = time.time()
+        roots = find_spec_it_roots(start_path)
+        if use_registry and roots:
+            registry[key] = {"roots": roots, "walked": walked}
+            save_registry(registry)
+    else:
+        roots = entry["roots"]
+
+    candidates = {}
+    for root in roots:
+        candidates.update(list_root_sessions(root))
 
-    if not candidates:
-        return ""
+    return sorted(candidates, key=lambda path: candidates[path], reverse=True)
 
-    candidates.sort(key=lambda item: item[0], reverse=True)
-    return str(candidates[0][1])
+
+def find_session(
+    start_path: str = ".", use_registry: bool = True, rescan: bool = False
+) -> str:
+    sessions = find_sessions(start_path, use_registry, rescan)
+    return sessions[0] if sessions else ""
 
 
 def main():
-    if len(sys.argv) > 1:
-        session_path = sys.argv[1]
-    else:
-        session_path = find_session()
+    parser = argparse.ArgumentParser(description="SPEC-IT real-time dashboard")
+    parser.add_argument(
+        "session_path",
+        nargs="?",
+        help="Session directory (search root with --all)",
+    )
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="Monitor every .spec-it session under the search root in one view",
+    )
+    stats_cache = parser.add_mutually_exclusive_group()
+    stats_cache.add_argument(
+        "--stats-cache",
+        action="store_true",
+        help="Persist the file stats index as _stats_index.json next to _status.json "
+        "so a restarted dashboard starts warm (writes into the session directory)",
+    )
+    stats_cache.add_argument(
+        "--no-stats-cache",
+        action="store_false",
+        dest="stats_cache",
+        help="Keep the file stats index in memory only (the default)",
+    )
+    parser.add_argument(
+        "--poll",
+        action="store_true",
+        help="Redraw every second instead of waiting for session file changes",
+    )
+    parser.add_argument(
+        "--idle-refresh",
+        type=float,
+        default=1.0,
+        help="Seconds between runtime clock updates while idle (default: 1.0, "
+        "0 = only redraw on session file changes and keys)",
+    )
+    parser.add_argument(
+        "--full-redraw",
+        action="store_true",
+        help="Clear and repaint the whole screen every frame (no diffing)",
+    )
+    parser.add_argument(
+        "--rescan",
+        action="store_true",
+        help="Ignore remembered .spec-it roots and walk the search root again",
+    )
+    parser.add_argument(
+        "--no-registry",
+        action="store_true",
+        help="Do not read or write the session root registry",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Headless mode: print one NDJSON record per session state change",
+    )
+    parser.add_argument(
+        "--once",
+        action="store_true",
+        help="With --stream, print the current state of each session and exit",
+    )
+    args = parser.parse_args()
+
+    if curses is None and not args.stream:
+        print("curses is not available; use --stream for headless output")
+        sys.exit(1)
+
+    if args.all:
+        multi = MultiDashboard(
+            args.session_path or ".",
+            persist_stats=args.stats_cache,
+            full_redraw=args.full_redraw,
+            use_registry=not args.no_registry,
+            rescan=args.rescan,
+        )
+        if args.stream:
+            run_stream(multi, once=args.once)
+        else:
+            curses.wrapper(multi.render, idle_refresh=args.idle_refresh)
+        return
+
+    session_path = args.session_path
+    if not session_path:
+        session_path = find_session(
+            use_registry=not args.no_registry, rescan=args.rescan
+        )
         if not session_path:
             print("Usage: python3 dashboard.py <session_path>")
             sys.exit(1)
@@ -768,8 +1815,17 @@ def main():
         print(f"Session path not found: {session_path}")
         sys.exit(1)
 
-    dashboard = Dashboard(session_path)
-    curses.wrapper(dashboard.render)
+    dashboard = Dashboard(
+        session_path,
+        persist_stats=args.stats_cache,
+        full_redraw=args.full_redraw,
+    )
+    if args.stream:
+        run_stream(dashboard, once=args.once)
+        return
+    curses.wrapper(
+        dashboard.render, watch=not args.poll, idle_refresh=args.idle_refresh
+    )
 
 
 if __name__ == "__main__":
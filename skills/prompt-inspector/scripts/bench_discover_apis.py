@@ -0,0 +1,880 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for discover_apis.py
+
+Usage:
+    python bench_discover_apis.py parallel [project_path] [--files N] [--workers 1,2,4]
+    python bench_discover_apis.py lines [--calls N]
+    python bench_discover_apis.py read [project_path] [--files N] [--large N]
+    python bench_discover_apis.py adversarial [--sizes KB,KB,...] [--case NAME]
+    python bench_discover_apis.py memory [--hits N] [--per-file N] [--output FORMAT]
+    python bench_discover_apis.py routes [--routes N,N,...] [--calls-per-route N]
+    python bench_discover_apis.py suite [--count KIND=N ...] [--scale F] [--save PATH] [--compare PATH]
+
+Without a project path a deterministic synthetic project is generated in a
+temporary directory.
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import discover_apis  # noqa: E402
+
+RESOURCES = ['users', 'posts', 'orders', 'accounts', 'invoices', 'teams', 'projects', 'comments']
+
+
+def generate_project(root: Path, files: int = 2000, seed: int = 42) -> Path:
+    """Write a deterministic mix of frontend, backend and noise files"""
+    rng = random.Random(seed)
+    (root / 'lib').mkdir(parents=True, exist_ok=True)
+    (root / 'lib' / 'api.ts').write_text(
+        "import axios from 'axios';\n"
+        "export const apiClient = axios.create({ baseURL: '/api' });\n"
+    )
+
+    for i in range(files):
+        resource = rng.choice(RESOURCES)
+        kind = i % 6
+        if kind == 0:
+            path = root / 'hooks' / f'use{resource.title()}{i}.ts'
+            body = "import { apiClient } from '../lib/api';\n\n"
+            for j in range(rng.randint(1, 8)):
+                method = rng.choice(['get', 'post', 'put', 'delete'])
+                body += f"export const call{j} = () => apiClient.{method}<Result>('/v1/{resource}/{j}', data);\n"
+        elif kind == 1:
+            path = root / 'components' / f'{resource.title()}List{i}.tsx'
+            body = "import useSWR from 'swr';\n\n"
+            body += f"const {{ data }} = useSWR('/api/{resource}');\n"
+            body += f"fetch('/api/{resource}/{i}', {{ method: 'POST', body: '{{}}' }});\n"
+        elif kind == 2:
+            path = root / 'app' / 'api' / resource / str(i) / 'route.ts'
+            body = "export async function GET(request: Request) {\n  return Response.json([]);\n}\n"
+            body += "export async function POST(request: Request) {\n  return Response.json({});\n}\n"
+        elif kind == 3:
+            path = root / 'server' / f'{resource}{i}.js'
+            body = "const router = require('express').Router();\n"
+            body += f"router.get('/{resource}', list);\nrouter.post('/{resource}/:id', update);\n"
+        elif kind == 4:
+            path = root / 'backend' / f'{resource}_{i}.py'
+            body = "from fastapi import APIRouter\nrouter = APIRouter()\n\n"
+            body += f"@router.get('/{resource}/{{item_id}}')\ndef read_item(item_id: int):\n    return {{}}\n"
+        else:
+            path = root / 'src' / 'utils' / f'util{i}.ts'
+            body = '\n'.join(
+                f"export const value{j} = Math.max({j}, {rng.randint(0, 99)});" for j in range(40)
+            ) + '\n'
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(body)
+
+    return root
+
+
+def serialize(apis) -> str:
+    return json.dumps([asdict(api) for api in apis], indent=2)
+
+
+def bench_parallel(project_path: Path, workers_list: list[int], chunk_size: int, repeat: int) -> dict:
+    results = []
+    baseline = None
+    for workers in workers_list:
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            apis = discover_apis.scan_directory(project_path, workers=workers, chunk_size=chunk_size)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        output = serialize(apis)
+        if baseline is None:
+            baseline = (best, output)
+        results.append({
+            'workers': workers,
+            'seconds': round(best, 4),
+            'apis': len(apis),
+            'speedup': round(baseline[0] / best, 2) if best else None,
+            'identical': output == baseline[1],
+        })
+    return {'benchmark': 'parallel', 'project': str(project_path), 'results': results}
+
+
+def generate_client_file(calls: int = 20000) -> str:
+    """A large generated API client: one call per method, thousands of hits"""
+    lines = ["import axios from 'axios';", "export const client = axios.create({ baseURL: '/api' });", ""]
+    for i in range(calls):
+        resource = RESOURCES[i % len(RESOURCES)]
+        lines.append(f"export async function op{i}(body: Body) {{")
+        lines.append(f"  return client.post<Op{i}Response>('/v1/{resource}/{i}', body);")
+        lines.append("}")
+    return '\n'.join(lines) + '\n'
+
+
+def bench_lines(calls: int, repeat: int) -> dict:
+    """Prefix-count line numbers vs the shared LineIndex on one big client file"""
+    content = generate_client_file(calls)
+    offsets = [m.start() for m in discover_apis.re.finditer(r'client\.post', content)]
+
+    def best_of(func):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = func()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best, result
+
+    prefix_time, prefix_lines = best_of(lambda: [content[:o].count('\n') + 1 for o in offsets])
+    index_time, index_lines = best_of(lambda: list(map(discover_apis.LineIndex(content).line_of, offsets)))
+    finder_time, apis = best_of(lambda: discover_apis.find_frontend_apis(Path('client.ts'), content))
+
+    return {
+        'benchmark': 'lines',
+        'bytes': len(content),
+        'matches': len(offsets),
+        'prefixCountSeconds': round(prefix_time, 4),
+        'lineIndexSeconds': round(index_time, 4),
+        'speedup': round(prefix_time / index_time, 1) if index_time else None,
+        'identical': prefix_lines == index_lines,
+        'findFrontendApisSeconds': round(finder_time, 4),
+        'findFrontendApisHits': len(apis),
+    }
+
+
+def add_large_files(root: Path, count: int, calls: int = 20000) -> None:
+    """Generated clients over the mmap threshold, half of them Latin-1 encoded"""
+    content = generate_client_file(calls)
+    for i in range(count):
+        path = root / 'generated' / f'client{i}.ts'
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if i % 2:
+            path.write_bytes(f"// Généré automatiquement - client {i}\n".encode('latin-1') + content.encode())
+        else:
+            path.write_text(content)
+
+
+def project_size(project_path: Path) -> int:
+    return sum(path.stat().st_size for path in discover_apis.iter_source_files(project_path))
+
+
+def run_discover(project_path: Path, read_mode: Optional[str] = 'mmap',
+                 output: str = 'ndjson') -> tuple[float, int, bytes]:
+    """One cold discover_apis.py run in a child process: (seconds, peak RSS
+    KiB, output). read_mode None leaves the script's default."""
+    script = Path(discover_apis.__file__).resolve()
+    args = [sys.executable, str(script), str(project_path), '--output', output, '--no-cache',
+            '--workers', '1', '--max-file-size', '0']
+    if read_mode is not None:
+        args += ['--read-mode', read_mode]
+    with tempfile.TemporaryFile() as out:
+        start = time.perf_counter()
+        proc = subprocess.Popen(args, stdout=out, stderr=subprocess.DEVNULL)
+        _, status, usage = os.wait4(proc.pid, 0)
+        elapsed = time.perf_counter() - start
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        out.seek(0)
+        return elapsed, usage.ru_maxrss, out.read()
+
+
+# UTF-8 sources where bytes patterns alone would differ from text ones:
+# non-ASCII identifiers (\w), Unicode whitespace (\s), case folding, a
+# lone \r newline
+UNICODE_SOURCES = {
+    'src/accents.ts': "import axios from 'axios';\nconst é = axios.create();\n"
+                      "export const a = () => é.get('/x');\nexport const b = () => café.post('/y');\n",
+    'src/spaces.ts': "export const c = () => api.get(\u00a0'/spaces');\nfetch(\u3000'/ideographic');\n",
+    'src/case.ts': "export const d = () => client.OPTIONſ('/k');\nexport const e = () => ſtore.get('/s');\n",
+    'src/controls.js': "export const f = () => api.get(\x1c'/fs');\n",
+    'src/mac.js': "api.get('/one');\rapi.post('/two');\r",
+}
+
+
+def check_read_modes(root: Path) -> list[str]:
+    """The default and mmap read modes must report exactly what text mode
+    does on any UTF-8 project"""
+    for rel_path, source in UNICODE_SOURCES.items():
+        path = root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(source.encode())
+    _, _, expected = run_discover(root, 'text')
+    failures = []
+    for mode in (None, 'mmap'):
+        _, _, output = run_discover(root, mode)
+        if output != expected:
+            failures.append(f'{mode or "default"} read mode output differs from text mode')
+    return failures
+
+
+def bench_read(project_path: Path, repeat: int) -> dict:
+    """Text decode vs mmap bytes scanning, each in a fresh process"""
+    files = sum(1 for _ in discover_apis.iter_source_files(project_path))
+    size = project_size(project_path)
+    results = []
+    for mode in ('text', 'mmap'):
+        best = rss = None
+        for _ in range(repeat):
+            elapsed, maxrss, output = run_discover(project_path, mode)
+            best = elapsed if best is None else min(best, elapsed)
+            rss = maxrss if rss is None else min(rss, maxrss)
+        results.append({
+            'readMode': mode,
+            'seconds': round(best, 4),
+            'filesPerSecond': round(files / best, 1),
+            'mbPerSecond': round(size / best / 2 ** 20, 2),
+            'peakRssKiB': rss,
+            'apis': output.count(b'\n'),
+        })
+    return {'benchmark': 'read', 'project': str(project_path), 'files': files, 'bytes': size,
+            'results': results}
+
+
+def add_hit_files(root: Path, hits: int, per_file: int) -> None:
+    """Generated clients with exactly hits API calls in total"""
+    for i in range(0, hits, per_file):
+        path = root / 'src' / 'api' / f'client{i // per_file}.ts'
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(generate_client_file(min(per_file, hits - i)))
+
+
+def bench_memory(project_path: Path, outputs: list[str], repeat: int) -> dict:
+    """Peak RSS and wall time of a full scan per output format, each in a
+    fresh process, on a project with a very large number of hits"""
+    results = []
+    for output in outputs:
+        best = rss = None
+        for _ in range(repeat):
+            elapsed, maxrss, written = run_discover(project_path, output=output)
+            best = elapsed if best is None else min(best, elapsed)
+            rss = maxrss if rss is None else min(rss, maxrss)
+        results.append({
+            'output': output,
+            'seconds': round(best, 2),
+            'peakRssKiB': rss,
+            'outputBytes': len(written),
+        })
+    return {'benchmark': 'memory', 'project': str(project_path), 'bytes': project_size(project_path),
+            'results': results}
+
+
+def synthetic_routes(count: int, calls_per_route: int, seed: int = 42) -> list:
+    """Backend endpoints in mixed parameter styles plus frontend calls to
+    them: concrete ids, template literals, an /api prefix on mounted routers,
+    full URLs, and a share of calls that match nothing"""
+    rng = random.Random(seed)
+    APICall = discover_apis.APICall
+    apis = []
+    for i in range(count):
+        resource = f'{RESOURCES[i % len(RESOURCES)]}{i // len(RESOURCES)}'
+        method = ('GET', 'POST', 'PUT', 'DELETE')[i % 4]
+        style = i % 4
+        if style == 0:
+            path, library = f'/{resource}/:id/items', 'express'
+        elif style == 1:
+            path, library = f'/{resource}/{{item_id}}/items', 'fastapi'
+        elif style == 2:
+            path, library = f'/api/{resource}/{{id}}/items', 'nextjs-api'
+        else:
+            path, library = f'/v1/{resource}/{{id}}/items', 'openapi'
+        apis.append(APICall('spec' if library == 'openapi' else 'backend', method, path,
+                            f'server/{resource}.ts', i + 1, library))
+        for j in range(calls_per_route):
+            base = path.split('/')[1]
+            call = (f'/{resource}/{j}/items' if style < 2 else f'/{base}/{resource}/{j}/items',
+                    f'/api/{resource}/${{id}}/items', f'https://api.example.com/{resource}/{j}/items',
+                    f'/unknown/{resource}/{j}')[rng.randrange(4)]
+            apis.append(APICall('frontend', method, call, f'web/{resource}.ts', j + 1, 'axios', 'api'))
+    return apis
+
+
+# (NestJS controller source, call path, route the call must bind to or None)
+ROUTE_CHECKS = (
+    ("@Controller('items')\nclass A {\n  @Get(':id')\n  one() {}\n}\n", '/items/7', '/items/{}'),
+    ("@Controller()\nclass A {\n  @Get(':id')\n  one() {}\n}\n", '/items', None),
+    ("@Controller()\nclass A {\n  @Get(':id')\n  one() {}\n}\n", '/health', None),
+    ("@Controller()\nclass A {\n  @Get(':id')\n  one() {}\n}\n", '/${id}', '/{}'),
+    ("@Controller({ path: 'v1/users' })\nclass A {\n  @Get()\n  all() {}\n}\n", '/api/v1/users', '/v1/users'),
+)
+
+
+def check_routes() -> list[str]:
+    """Bindings the matcher must get right whatever its speed: param-only
+    routes do not swallow one-segment calls, controller prefixes compose"""
+    failures = []
+    for source, call_path, expected in ROUTE_CHECKS:
+        apis = discover_apis.scan_content(Path('src/a.controller.ts'), source)
+        apis.append(discover_apis.APICall('frontend', 'GET', call_path, 'web/a.ts', 1, 'axios', 'api'))
+        _, bindings = discover_apis.bind_routes(apis)
+        route = bindings[0][1]
+        bound = route.path if route is not None else None
+        if bound != expected:
+            failures.append(f'{call_path}: bound to {bound}, expected {expected}')
+    return failures
+
+
+def bench_routes(counts: list[int], calls_per_route: int, repeat: int) -> dict:
+    """route_coverage at growing route counts: with the segment trie the
+    time per call stays flat instead of growing with the number of routes"""
+    results = []
+    for count in counts:
+        apis = synthetic_routes(count, calls_per_route)
+        best = report = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            report = discover_apis.route_coverage(apis)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        summary = report['summary']
+        results.append({
+            'routes': count,
+            'calls': summary['calls'],
+            'seconds': round(best, 4),
+            'microsecondsPerCall': round(best / max(1, summary['calls']) * 1e6, 2),
+            'matchedCalls': summary['matchedCalls'],
+            'suffixMatchedCalls': summary['suffixMatchedCalls'],
+            'frontendOnlyCalls': summary['frontendOnlyCalls'],
+            'backendOnlyEndpoints': summary['backendOnlyEndpoints'],
+        })
+    return {'benchmark': 'routes', 'checkFailures': check_routes(), 'results': results}
+
+
+# One unit of a minified bundle: calls, option objects and closures on a
+# single line, as bundlers emit them
+MINIFIED_UNIT = (
+    'function(e){return r.get("/api/v1/users/"+e,{params:{q:e}}).then(function(t){return t.data})},'
+    'fetch("/api/items",{method:"POST",headers:{"Content-Type":"application/json"},body:JSON.stringify(n)}),'
+    'o.post(`${c}/orders/${e}`,n),useSWR("/api/session"),a.useQuery(["k",e],function(){return fetch(u)}),'
+)
+
+# name -> (file suffix, repeated unit, prefix): inputs that make a regex
+# rescan the same run from every candidate token
+ADVERSARIAL_CASES = {
+    'minified-bundle': ('.js', MINIFIED_UNIT, ''),
+    'unclosed-call-args': ('.ts', "client.post('/v1/x', {a: '/b', c: [", ''),
+    'unclosed-template': ('.ts', 'api.get(`${base}/a/b/c', ''),
+    'unclosed-generic': ('.ts', 'api.get<Response<', ''),
+    'unclosed-options': ('.js', "fetch('/x', { body: ", ''),
+    'unclosed-query': ('.tsx', 'useQuery(fetch ', ''),
+    'unclosed-nest': ('.ts', '@Get( ', ''),
+    'unclosed-object': ('.ts', 'const a = b.create({ c: d.get, ', ''),
+    'unclosed-imports': ('.ts', 'import { a,\n', 'export const api = axios.create();\n'),
+    'whitespace-run': ('.ts', 'api.get' + ' ' * 4096, ''),
+    'angle-brackets': ('.ts', '<' * 64, "api.get('/x' "),
+    'slashes-in-args': ('.ts', '/a', "api.get(`"),
+}
+
+
+def adversarial_content(case: str, size: int) -> str:
+    _, unit, prefix = ADVERSARIAL_CASES[case]
+    return prefix + unit * max(1, (size - len(prefix)) // len(unit))
+
+
+def bench_adversarial(sizes_kb: list[int], cases: list[str], repeat: int) -> dict:
+    """Worst-case scan time per MB: each case at growing sizes, scanned as
+    text, as bytes (the mmap read mode) and, for JS/TS, by the instance
+    index symbol pass. Linear patterns keep seconds per MB flat as the
+    size grows; backtracking ones grow with it."""
+    results = []
+    for case in cases:
+        suffix = ADVERSARIAL_CASES[case][0]
+        path = Path(f'adversarial{suffix}')
+        for size_kb in sizes_kb:
+            content = adversarial_content(case, size_kb * 1024)
+            row = {'case': case, 'kb': size_kb}
+            runs = [
+                ('text', lambda: discover_apis.scan_content(path, content)),
+                ('bytes', lambda: discover_apis.scan_content(path, encoded)),
+            ]
+            if suffix in discover_apis.FRONTEND_EXTENSIONS:
+                runs.append(('symbols', lambda: discover_apis.extract_symbols(content)))
+            encoded = content.encode()
+            for mode, func in runs:
+                best = None
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    result = func()
+                    elapsed = time.perf_counter() - start
+                    best = elapsed if best is None else min(best, elapsed)
+                row[f'{mode}SecondsPerMB'] = round(best / (len(encoded) / 2 ** 20), 4)
+                if mode != 'symbols':
+                    row[f'{mode}Apis'] = len(result)
+            results.append(row)
+
+    def slowest(row):
+        return max(value for key, value in row.items() if key.endswith('SecondsPerMB'))
+
+    worst = max(results, key=slowest)
+    return {
+        'benchmark': 'adversarial',
+        'results': results,
+        'worst': {'case': worst['case'], 'kb': worst['kb'], 'secondsPerMB': slowest(worst)},
+    }
+
+
+# Synthetic project for the suite: kind -> files generated by default
+SUITE_COUNTS = {
+    'axios': 400,
+    'ky': 100,
+    'fetch': 300,
+    'swr': 200,
+    'nextjs-app': 150,
+    'nextjs-pages': 100,
+    'express': 150,
+    'fastapi': 150,
+    'nestjs': 100,
+    'openapi': 10,
+    'noise': 2000,
+    'minified': 10,
+}
+SUITE_FORMAT_VERSION = 1
+
+
+def suite_axios(rng: random.Random, i: int) -> tuple[str, str]:
+    resource = rng.choice(RESOURCES)
+    lines = ["import axios from 'axios';", "", "const api = axios.create({ baseURL: '/api' });", ""]
+    for j in range(rng.randint(2, 10)):
+        method = rng.choice(['get', 'post', 'put', 'delete', 'patch'])
+        client = rng.choice(['api', 'axios'])
+        if j % 3:
+            call = f"{client}.{method}<{resource.title()}>('/v1/{resource}/{j}')"
+        else:
+            call = f"{client}.{method}(`/v1/{resource}/${{id}}/items`, body)"
+        lines.append(f"export const {method}{resource.title()}{j} = (id: string, body?: unknown) => {call};")
+    return f'src/services/{resource}{i}.ts', '\n'.join(lines) + '\n'
+
+
+def suite_ky(rng: random.Random, i: int) -> tuple[str, str]:
+    resource = rng.choice(RESOURCES)
+    lines = ["import ky from 'ky';", ""]
+    for j in range(rng.randint(1, 6)):
+        method = rng.choice(['get', 'post', 'delete'])
+        lines.append(f"export const load{j} = () => ky.{method}('/api/{resource}/{j}').json();")
+    return f'src/ky/{resource}{i}.ts', '\n'.join(lines) + '\n'
+
+
+def suite_fetch(rng: random.Random, i: int) -> tuple[str, str]:
+    resource = rng.choice(RESOURCES)
+    lines = []
+    for j in range(rng.randint(1, 5)):
+        if j % 2:
+            lines.append(f"export async function save{j}(body) {{\n  const res = await fetch('/api/{resource}/{j}', "
+                         f"{{ method: 'POST', headers: {{ 'Content-Type': 'application/json' }}, "
+                         f"body: JSON.stringify(body) }});\n  return res.json();\n}}")
+        else:
+            lines.append(f"export const list{j} = () => fetch('/api/{resource}?page={j}').then(r => r.json());")
+    return f'src/api/{resource}{i}.js', '\n'.join(lines) + '\n'
+
+
+def suite_swr(rng: random.Random, i: int) -> tuple[str, str]:
+    resource = rng.choice(RESOURCES)
+    name = f'{resource.title()}Panel{i}'
+    body = (
+        "import useSWR from 'swr';\n"
+        "import { useQuery } from '@tanstack/react-query';\n\n"
+        f"export function {name}({{ id }}: {{ id: string }}) {{\n"
+        f"  const {{ data }} = useSWR('/api/{resource}', fetcher);\n"
+        f"  const detail = useSWR(`/api/{resource}/${{id}}`, fetcher);\n"
+        f"  const stats = useQuery(['{resource}', fetch('/api/{resource}/stats')]);\n"
+        "  return <div>{data?.length}</div>;\n"
+        "}\n"
+    )
+    return f'src/components/{name}.tsx', body
+
+
+def suite_nextjs_app(rng: random.Random, i: int) -> tuple[str, str]:
+    resource = rng.choice(RESOURCES)
+    methods = rng.sample(['GET', 'POST', 'PUT', 'DELETE', 'PATCH'], rng.randint(1, 3))
+    body = "import { NextResponse } from 'next/server';\n\n" + '\n'.join(
+        f"export async function {method}(request: Request, {{ params }}: {{ params: {{ id: string }} }}) {{\n"
+        f"  return NextResponse.json({{ id: params.id }});\n}}\n"
+        for method in methods
+    )
+    return f'app/api/{resource}{i}/[id]/route.ts', body
+
+
+def suite_nextjs_pages(rng: random.Random, i: int) -> tuple[str, str]:
+    resource = rng.choice(RESOURCES)
+    body = (
+        "import type { NextApiRequest, NextApiResponse } from 'next';\n\n"
+        "export default async function handler(req: NextApiRequest, res: NextApiResponse) {\n"
+        "  if (req.method === 'POST') {\n    return res.status(201).json(req.body);\n  }\n"
+        "  res.status(200).json([]);\n}\n"
+        "export async function GET() {\n  return Response.json([]);\n}\n"
+    )
+    return f'pages/api/{resource}/{i}.ts', body
+
+
+def suite_express(rng: random.Random, i: int) -> tuple[str, str]:
+    resource = rng.choice(RESOURCES)
+    lines = ["const express = require('express');", "const router = express.Router();", ""]
+    for j in range(rng.randint(2, 6)):
+        method = rng.choice(['get', 'post', 'put', 'delete', 'patch'])
+        path = f'/{resource}' if j == 0 else f'/{resource}/:id/part{j}'
+        lines.append(f"router.{method}('{path}', async (req, res) => res.json(await svc.run(req)));")
+    lines += ["", "module.exports = router;"]
+    return f'server/routes/{resource}{i}.js', '\n'.join(lines) + '\n'
+
+
+def suite_fastapi(rng: random.Random, i: int) -> tuple[str, str]:
+    resource = rng.choice(RESOURCES)
+    lines = ["from fastapi import APIRouter", "", f"router = APIRouter(prefix='/{resource}')", ""]
+    for j in range(rng.randint(2, 6)):
+        method = rng.choice(['get', 'post', 'put', 'delete'])
+        lines += [f"@router.{method}('/{{item_id}}/part{j}')", f"async def handler_{j}(item_id: int):",
+                  "    return {'id': item_id}", ""]
+    return f'backend/routers/{resource}_{i}.py', '\n'.join(lines)
+
+
+def suite_nestjs(rng: random.Random, i: int) -> tuple[str, str]:
+    resource = rng.choice(RESOURCES)
+    lines = ["import { Controller, Get, Post, Put, Delete, Param, Body } from '@nestjs/common';", "",
+             f"@Controller('{resource}')", f"export class {resource.title()}{i}Controller {{"]
+    for j, decorator in enumerate(rng.sample(["@Get()", "@Get(':id')", "@Post()", "@Put(':id')", "@Delete(':id')"],
+                                             rng.randint(2, 5))):
+        lines += [f"  {decorator}", f"  handler{j}(@Param('id') id: string) {{", "    return this.service.run(id);",
+                  "  }", ""]
+    lines.append("}")
+    return f'src/{resource}{i}/{resource}.controller.ts', '\n'.join(lines) + '\n'
+
+
+def suite_openapi(rng: random.Random, i: int) -> tuple[str, str]:
+    operations = []
+    for j in range(rng.randint(20, 60)):
+        resource = rng.choice(RESOURCES)
+        path = f'/{resource}/{{id}}/op{j}' if j % 2 else f'/{resource}{j}'
+        operations.append((path, rng.choice(['get', 'post', 'put', 'delete']), f'Operation {j} on {resource}'))
+    if i % 2:
+        lines = ["openapi: 3.0.0", "info:", f"  title: Service {i}", "  version: '1.0'", "paths:"]
+        for path, method, summary in operations:
+            lines += [f"  {path}:", f"    {method}:", f"      summary: {summary}",
+                      "      responses:", "        '200':", "          description: OK"]
+        return f'specs/service{i}.yaml', '\n'.join(lines) + '\n'
+    spec = {'openapi': '3.0.0', 'info': {'title': f'Service {i}', 'version': '1.0'}, 'paths': {}}
+    for path, method, summary in operations:
+        spec['paths'].setdefault(path, {})[method] = {'summary': summary, 'responses': {'200': {'description': 'OK'}}}
+    return f'specs/service{i}.json', json.dumps(spec, indent=2) + '\n'
+
+
+def suite_noise(rng: random.Random, i: int) -> tuple[str, str]:
+    """Code without API calls, but with the tokens the anchors look for"""
+    kind = i % 3
+    if kind == 0:
+        lines = [f"export const value{j} = cache.get('key{j}') ?? settings.get(\"k{j}\", {rng.randint(0, 99)});"
+                 for j in range(rng.randint(10, 60))]
+        return f'src/utils/util{i}.ts', '\n'.join(lines) + '\n'
+    if kind == 1:
+        lines = ["def transform(rows):", "    out = {}"] + [
+            f"    out['f{j}'] = rows.get('f{j}', {rng.randint(0, 99)})  # export, import, fetch" for j in range(30)
+        ] + ["    return out", ""]
+        return f'lib/transform_{i}.py', '\n'.join(lines)
+    lines = [f"function step{j}(ctx) {{ return ctx.items.map(x => x * {j}).filter(Boolean); }}"
+             for j in range(rng.randint(10, 40))]
+    return f'src/lib/steps{i}.js', '\n'.join(lines) + '\n'
+
+
+def suite_minified(rng: random.Random, i: int) -> tuple[str, str]:
+    """A one-line bundle; half named .min.js, the rest only recognisable by content"""
+    name = f'bundle{i}.min.js' if i % 2 else f'chunk-{i}.js'
+    return f'public/assets/{name}', MINIFIED_UNIT * rng.randint(200, 800) + '\n'
+
+
+SUITE_GENERATORS = {
+    'axios': suite_axios,
+    'ky': suite_ky,
+    'fetch': suite_fetch,
+    'swr': suite_swr,
+    'nextjs-app': suite_nextjs_app,
+    'nextjs-pages': suite_nextjs_pages,
+    'express': suite_express,
+    'fastapi': suite_fastapi,
+    'nestjs': suite_nestjs,
+    'openapi': suite_openapi,
+    'noise': suite_noise,
+    'minified': suite_minified,
+}
+
+
+def generate_suite_project(root: Path, counts: dict, seed: int = 42) -> Path:
+    """Write the suite project: counts[kind] files of each kind. The same
+    counts and seed always give byte-identical files"""
+    for kind, generate in SUITE_GENERATORS.items():
+        # One generator per kind, so changing one count leaves the other files alone
+        rng = random.Random(f'{seed}:{kind}')
+        for i in range(counts.get(kind, 0)):
+            rel_path, content = generate(rng, i)
+            path = root / rel_path
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content)
+    return root
+
+
+# Runs in a fresh interpreter so peak RSS is the scan's own
+SUITE_CHILD = """
+import json, sys, time
+from collections import Counter
+from pathlib import Path
+sys.path.insert(0, sys.argv[1])
+import discover_apis
+project = Path(sys.argv[2])
+admission = discover_apis.FileAdmission(project, skip_generated=sys.argv[5] == 'skip-generated')
+profile = discover_apis.ScanProfile(top=5)
+start = time.perf_counter()
+apis = discover_apis.scan_directory(project, workers=int(sys.argv[3]), admission=admission,
+                                    use_mmap=sys.argv[4] == 'mmap', profile=profile)
+report = profile.report(project, time.perf_counter() - start, admission.skipped)
+report['apis'] = dict(sorted(Counter(api.type for api in apis).items()))
+print(json.dumps(report))
+"""
+
+
+def git_revision() -> dict:
+    """Commit of the discover_apis.py being measured, and whether it has local edits"""
+    script = Path(discover_apis.__file__).resolve()
+    try:
+        commit = subprocess.run(['git', '-C', str(script.parent), 'rev-parse', 'HEAD'],
+                                capture_output=True, check=True, text=True).stdout.strip()
+        status = subprocess.run(['git', '-C', str(script.parent), 'status', '--porcelain', '--', script.name],
+                                capture_output=True, check=True, text=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return {'commit': None, 'dirty': None}
+    return {'commit': commit, 'dirty': bool(status.strip())}
+
+
+def run_suite_scan(project_path: Path, workers: int, read_mode: str, skip_generated: bool) -> tuple[dict, int]:
+    """One scan_directory run in a child process: (profile report, peak RSS KiB)"""
+    script_dir = str(Path(discover_apis.__file__).resolve().parent)
+    args = [sys.executable, '-c', SUITE_CHILD, script_dir, str(project_path), str(workers), read_mode,
+            'skip-generated' if skip_generated else 'include-generated']
+    with tempfile.TemporaryFile() as out:
+        proc = subprocess.Popen(args, stdout=out)
+        _, status, usage = os.wait4(proc.pid, 0)
+        if os.waitstatus_to_exitcode(status):
+            raise RuntimeError(f'suite scan failed with exit code {os.waitstatus_to_exitcode(status)}')
+        out.seek(0)
+        return json.loads(out.read()), usage.ru_maxrss
+
+
+def bench_suite(project_path: Path, config: dict) -> dict:
+    """files/s, MB/s, peak RSS and per-finder seconds of scan_directory on
+    the suite project; the fastest of config['repeat'] fresh-process runs"""
+    best = None
+    rss = None
+    for _ in range(config['repeat']):
+        report, maxrss = run_suite_scan(project_path, config['workers'], config['readMode'],
+                                        config['skipGenerated'])
+        if best is None or report['wallSeconds'] < best['wallSeconds']:
+            best = report
+        rss = maxrss if rss is None else min(rss, maxrss)
+
+    seconds = best['wallSeconds']
+    return {
+        'benchmark': 'suite',
+        'formatVersion': SUITE_FORMAT_VERSION,
+        **git_revision(),
+        'createdAt': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'python': sys.version.split()[0],
+        'platform': sys.platform,
+        'cpus': os.cpu_count(),
+        'config': config,
+        'project': {'files': sum(1 for _ in discover_apis.iter_source_files(project_path)),
+                    'bytes': project_size(project_path)},
+        'result': {
+            'seconds': seconds,
+            'filesPerSecond': round(best['files']['scanned'] / seconds, 1) if seconds else None,
+            'mbPerSecond': round(best['bytesRead'] / seconds / 2 ** 20, 2) if seconds else None,
+            'peakRssKiB': rss,
+            'files': best['files'],
+            'bytesRead': best['bytesRead'],
+            'apis': best['apis'],
+            'finders': {family['family']: family['seconds'] for family in best['families']},
+            'slowestFiles': best['slowestFiles'],
+        },
+    }
+
+
+def compare_suite(baseline: dict, current: dict, threshold: float, min_seconds: float = 0.05) -> dict:
+    """Relative change of every metric against a saved suite result; a
+    regression is a change for the worse beyond threshold"""
+    old, new = baseline['result'], current['result']
+    # metric -> (baseline, current, higher is better)
+    metrics = {
+        'seconds': (old['seconds'], new['seconds'], False),
+        'filesPerSecond': (old['filesPerSecond'], new['filesPerSecond'], True),
+        'mbPerSecond': (old['mbPerSecond'], new['mbPerSecond'], True),
+        'peakRssKiB': (old['peakRssKiB'], new['peakRssKiB'], False),
+    }
+    for family in sorted(set(old['finders']) | set(new['finders'])):
+        before, after = old['finders'].get(family, 0.0), new['finders'].get(family, 0.0)
+        # Families that take next to no time are all noise
+        if max(before, after) >= min_seconds:
+            metrics[f'finders.{family}'] = (before, after, False)
+
+    changes = {}
+    regressions = []
+    for name, (before, after, higher_is_better) in metrics.items():
+        change = (after - before) / before if before else None
+        changes[name] = {'baseline': before, 'current': after,
+                         'change': round(change, 4) if change is not None else None}
+        worse = change is not None and (-change if higher_is_better else change) > threshold
+        if worse:
+            regressions.append(name)
+
+    def measured(config: dict) -> dict:
+        # The number of runs changes the noise, not what is measured
+        return {key: value for key, value in (config or {}).items() if key != 'repeat'}
+
+    return {
+        'baseline': {'commit': baseline.get('commit'), 'createdAt': baseline.get('createdAt')},
+        'sameConfig': measured(baseline.get('config')) == measured(current.get('config')),
+        'sameApis': old['apis'] == new['apis'],
+        'threshold': threshold,
+        'metrics': changes,
+        'regressions': regressions,
+    }
+
+
+def parse_counts(items: list[str], scale: float) -> dict:
+    counts = {kind: int(round(count * scale)) for kind, count in SUITE_COUNTS.items()}
+    for item in items or []:
+        kind, _, value = item.partition('=')
+        if kind not in SUITE_COUNTS or not value.isdigit():
+            raise ValueError(f"--count expects KIND=N with KIND one of {', '.join(SUITE_COUNTS)}: {item}")
+        counts[kind] = int(value)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description='discover_apis.py benchmarks')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('parallel', help='Serial vs process-pool scan_directory')
+    p.add_argument('project_path', nargs='?', help='Project to scan (default: synthetic)')
+    p.add_argument('--files', type=int, default=3000, help='Synthetic project size')
+    p.add_argument('--workers', default=f"1,2,{os.cpu_count() or 1}",
+                   help='Comma-separated worker counts (first is the baseline)')
+    p.add_argument('--chunk-size', type=int, default=64)
+    p.add_argument('--repeat', type=int, default=3)
+
+    p = sub.add_parser('lines', help='Line-number lookup on a large generated client file')
+    p.add_argument('--calls', type=int, default=20000, help='API calls in the client file')
+    p.add_argument('--repeat', type=int, default=3)
+
+    p = sub.add_parser('adversarial', help='Worst-case scan time per MB on pathological inputs')
+    p.add_argument('--sizes', default='64,256,1024', help='Comma-separated input sizes in KiB')
+    p.add_argument('--case', action='append', choices=sorted(ADVERSARIAL_CASES),
+                   help='Only run this case (repeatable; default: all)')
+    p.add_argument('--repeat', type=int, default=1)
+
+    p = sub.add_parser('routes', help='Frontend-to-backend route matching at growing route counts')
+    p.add_argument('--routes', default='1000,10000,50000', help='Comma-separated endpoint counts')
+    p.add_argument('--calls-per-route', type=int, default=4, help='Frontend calls generated per endpoint')
+    p.add_argument('--repeat', type=int, default=1)
+
+    p = sub.add_parser('suite', help='Reproducible scan_directory benchmark on a generated project, '
+                                     'saved as JSON and compared across commits')
+    p.add_argument('project_path', nargs='?', help='Project to scan (default: generated suite project)')
+    p.add_argument('--count', action='append', metavar='KIND=N',
+                   help=f"Files of one kind (repeatable; kinds: {', '.join(SUITE_COUNTS)})")
+    p.add_argument('--scale', type=float, default=1.0, help='Multiply every default count')
+    p.add_argument('--seed', type=int, default=42)
+    p.add_argument('--workers', type=int, default=1)
+    p.add_argument('--read-mode', choices=['mmap', 'text'], default='text')
+    p.add_argument('--skip-generated', action='store_true',
+                   help='Skip minified bundles at admission, as discover_apis.py --skip-generated does')
+    p.add_argument('--repeat', type=int, default=3, help='Fresh-process runs; the fastest is reported')
+    p.add_argument('--save', type=Path, metavar='PATH', help='Also write the result JSON to PATH')
+    p.add_argument('--compare', type=Path, metavar='PATH',
+                   help='Saved result to compare against; exits 1 on a regression beyond --threshold')
+    p.add_argument('--threshold', type=float, default=0.10,
+                   help='Relative change counted as a regression (default: 0.10)')
+
+    p = sub.add_parser('memory', help='Peak RSS per output format on a project with many hits')
+    p.add_argument('project_path', nargs='?', help='Project to scan (default: synthetic)')
+    p.add_argument('--hits', type=int, default=500000, help='API calls in the synthetic project')
+    p.add_argument('--per-file', type=int, default=1000, help='API calls per synthetic file')
+    p.add_argument('--output', action='append', choices=['json', 'ndjson', 'inspector', 'markdown'],
+                   help='Only measure this output format (repeatable; default: all)')
+    p.add_argument('--repeat', type=int, default=1)
+
+    p = sub.add_parser('read', help='Text vs mmap read mode: throughput and peak RSS')
+    p.add_argument('project_path', nargs='?', help='Project to scan (default: synthetic)')
+    p.add_argument('--files', type=int, default=3000, help='Synthetic project size')
+    p.add_argument('--large', type=int, default=8,
+                   help='Large generated client files added to the synthetic project (half Latin-1)')
+    p.add_argument('--repeat', type=int, default=3)
+
+    args = parser.parse_args()
+
+    if args.command == 'lines':
+        print(json.dumps(bench_lines(args.calls, args.repeat), indent=2))
+        return 0
+    if args.command == 'routes':
+        counts = [int(count) for count in args.routes.split(',')]
+        report = bench_routes(counts, args.calls_per_route, args.repeat)
+        print(json.dumps(report, indent=2))
+        return 1 if report['checkFailures'] else 0
+    if args.command == 'adversarial':
+        sizes = [int(size) for size in args.sizes.split(',')]
+        print(json.dumps(bench_adversarial(sizes, args.case or list(ADVERSARIAL_CASES), args.repeat), indent=2))
+        return 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.project_path:
+            project_path = Path(args.project_path).resolve()
+        elif args.command == 'memory':
+            project_path = Path(tmp) / 'project'
+            add_hit_files(project_path, args.hits, max(1, args.per_file))
+        elif args.command == 'suite':
+            try:
+                counts = parse_counts(args.count, args.scale)
+            except ValueError as e:
+                parser.error(str(e))
+            project_path = generate_suite_project(Path(tmp) / 'project', counts, args.seed)
+        else:
+            project_path = generate_project(Path(tmp) / 'project', args.files)
+            if args.command == 'read':
+                add_large_files(project_path, args.large)
+
+        if args.command == 'parallel':
+            workers_list = [int(w) for w in dict.fromkeys(args.workers.split(','))]
+            report = bench_parallel(project_path, workers_list, args.chunk_size, args.repeat)
+        elif args.command == 'memory':
+            outputs = args.output or ['json', 'ndjson', 'inspector', 'markdown']
+            report = bench_memory(project_path, outputs, args.repeat)
+        elif args.command == 'suite':
+            config = {
+                'counts': None if args.project_path else counts,
+                'seed': None if args.project_path else args.seed,
+                'workers': max(1, args.workers),
+                'readMode': args.read_mode,
+                'skipGenerated': args.skip_generated,
+                'repeat': max(1, args.repeat),
+            }
+            report = bench_suite(project_path, config)
+        else:
+            report = bench_read(project_path, args.repeat)
+            report['checkFailures'] = check_read_modes(Path(tmp) / 'unicode')
+
+    status = 0
+    if args.command == 'suite':
+        if args.save:
+            args.save.write_text(json.dumps(report, indent=2) + '\n')
+        if args.compare:
+            report['comparison'] = compare_suite(json.loads(args.compare.read_text()), report, args.threshold)
+            status = 1 if report['comparison']['regressions'] else 0
+    elif args.command == 'read':
+        status = 1 if report['checkFailures'] else 0
+
+    print(json.dumps(report, indent=2))
+    return status
+
+
+if __name__ == '__main__':
+    exit(main())
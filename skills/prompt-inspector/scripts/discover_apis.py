@@ -8,28 +8,148 @@ Scans a project directory to find:
 3. OpenAPI/Swagger specification files
 
 Usage:
-    python discover_apis.py <project_path> [--output json|markdown]
+    python discover_apis.py <project_path> [--output json|ndjson|markdown] [--workers N]
+                            [--cache | --cache-file PATH] [--read-mode text|mmap]
+                            [--profile [--profile-top N]]
+    python discover_apis.py <project_path> --coverage [--output json|markdown]
+    python discover_apis.py <project_path> ... --output-file PATH
+    python discover_apis.py <project_path> --output sqlite --output-file catalog.db
+    python discover_apis.py <project_path> --watch [--output json|inspector]
+    python discover_apis.py <project_path> --since <rev> [--output json|markdown]
 """
 
 import os
 import re
+import sys
+import io
 import json
+import time
+import ctypes
+import ctypes.util
+import select
+import struct
+import hashlib
+import heapq
+import mmap
 import argparse
+import subprocess
+from bisect import bisect_left, bisect_right
+from collections import Counter, deque
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from itertools import chain
+from operator import attrgetter
 from pathlib import Path
-from dataclasses import dataclass, asdict
-from typing import Optional, Set
-
-@dataclass
+from dataclasses import dataclass, replace
+from typing import Iterable, Iterator, Optional, Set, TextIO
+
+try:
+    import yaml
+except ImportError:
+    # YAML OpenAPI specs are skipped without PyYAML
+    yaml = None
+
+try:
+    import sqlite3
+except ImportError:
+    # --output sqlite needs Python built with sqlite3
+    sqlite3 = None
+
+if yaml is not None:
+    YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    YAML_ERRORS = (yaml.YAMLError,)
+else:
+    YAML_LOADER = None
+    YAML_ERRORS = ()
+
+# Bump when APICall or the cache layout changes; the script's own source is
+# also hashed into the cache fingerprint, so pattern edits invalidate it too
+CACHE_FORMAT_VERSION = 1
+
+@dataclass(init=False)
 class APICall:
-    """Represents a discovered API call or endpoint"""
+    """Represents a discovered API call or endpoint.
+
+    Slotted, and every string field is interned: a monorepo scan holds
+    hundreds of thousands of these, and type, method, library, file and
+    instance name take only a handful of distinct values between them, so
+    each field is one pointer to a shared string (an enum code that is
+    still a plain str for comparisons and output). __slots__ and __init__
+    are spelled out because dataclass(slots=True) needs Python 3.10."""
+    __slots__ = ('type', 'method', 'path', 'file', 'line', 'library', 'instance_name', 'function_name')
     type: str  # 'frontend', 'backend', or 'spec'
     method: str  # GET, POST, PUT, DELETE, PATCH
     path: str  # API path/URL
     file: str  # Source file
     line: int  # Line number
     library: str  # axios, fetch, express, openapi, etc.
-    instance_name: Optional[str] = None  # Custom instance name if applicable
-    function_name: Optional[str] = None  # Function/handler name if available
+    instance_name: Optional[str]  # Custom instance name if applicable
+    function_name: Optional[str]  # Function/handler name if available
+
+    def __init__(self, type: str, method: str, path: str, file: str, line: int, library: str,
+                 instance_name: Optional[str] = None, function_name: Optional[str] = None):
+        intern = sys.intern
+        self.type = intern(type)
+        self.method = intern(method)
+        self.path = intern(path)
+        self.file = intern(file)
+        self.line = line
+        self.library = intern(library)
+        self.instance_name = intern(instance_name) if instance_name is not None else None
+        self.function_name = function_name
+
+    def __reduce__(self):
+        # Unpickle through __init__ so results from worker processes are
+        # interned in the parent as well
+        return APICall, (self.type, self.method, self.path, self.file, self.line, self.library,
+                         self.instance_name, self.function_name)
+
+
+# JSON output without asdict(): its recursive deep copy builds a throwaway
+# dict per hit, and json.dumps(..., indent=2) runs the pure-Python encoder
+encode_json_string = json.encoder.encode_basestring_ascii
+
+
+def encode_json_optional(value: Optional[str]) -> str:
+    return 'null' if value is None else encode_json_string(value)
+
+
+def api_json_fields(api: APICall) -> list[str]:
+    """The '"key": value' members of json.dumps(asdict(api)), in field order"""
+    return [
+        f'"type": {encode_json_string(api.type)}',
+        f'"method": {encode_json_string(api.method)}',
+        f'"path": {encode_json_string(api.path)}',
+        f'"file": {encode_json_string(api.file)}',
+        f'"line": {api.line:d}',
+        f'"library": {encode_json_string(api.library)}',
+        f'"instance_name": {encode_json_optional(api.instance_name)}',
+        f'"function_name": {encode_json_optional(api.function_name)}',
+    ]
+
+
+def api_json(api: APICall) -> str:
+    """json.dumps(asdict(api))"""
+    return '{' + ', '.join(api_json_fields(api)) + '}'
+
+
+def api_dict(api: APICall) -> dict:
+    """asdict(api) without the deep copy"""
+    return {
+        'type': api.type, 'method': api.method, 'path': api.path, 'file': api.file, 'line': api.line,
+        'library': api.library, 'instance_name': api.instance_name, 'function_name': api.function_name,
+    }
+
+
+def write_json_apis(apis: Iterable[APICall], out) -> None:
+    """print(json.dumps([asdict(api) for api in apis], indent=2), file=out),
+    written one record at a time"""
+    separator = '[\n  {\n    '
+    for api in apis:
+        out.write(separator + ',\n    '.join(api_json_fields(api)))
+        separator = '\n  },\n  {\n    '
+    out.write('[]\n' if separator.startswith('[') else '\n  }\n]\n')
 
 # HTTP methods to detect
 HTTP_METHODS = {'get', 'post', 'put', 'delete', 'patch', 'head', 'options'}
@@ -47,12 +167,20 @@ HTTP_CLIENT_CREATORS = {
     'apisauce': [r'create\s*\(\s*\{[^}]*baseURL', r'import.*from\s*[\'"]apisauce[\'"]'],
 }
 
+# Upper bounds for runs that an unclosed construct could stretch to the end
+# of the file. Patterns are tried at every anchor token, and on a long
+# minified line an unclosed call, object or type argument would otherwise
+# be rescanned from each token: quadratic. Bounded, every attempt costs at
+# most this much and the scan stays linear in the input.
+MAX_ARGS_CHARS = 1024  # call arguments, option objects, import/export lists
+MAX_GENERIC_CHARS = 256  # TypeScript type arguments
+
 # Patterns to find custom HTTP client instance declarations
 INSTANCE_DECLARATION_PATTERNS = [
     # export const apiClient = axios.create(...)
     r'(?:export\s+)?(?:const|let|var)\s+(\w+)\s*=\s*(?:axios|ky|got|superagent|wretch|redaxios)(?:\.create|\.extend)?\s*\(',
     # const api = axios.create(...)
-    r'(?:const|let|var)\s+(\w+)\s*=\s*\w+\.create\s*\(\s*\{[^}]*baseURL',
+    rf'(?:const|let|var)\s+(\w+)\s*=\s*\w+\.create\s*\(\s*\{{[^}}]{{0,{MAX_ARGS_CHARS}}}baseURL',
     # export const http = new HttpClient(...)
     r'(?:export\s+)?(?:const|let|var)\s+(\w+)\s*=\s*new\s+\w*(?:Http|Api|Client|Service)\w*\s*\(',
 ]
@@ -72,113 +200,608 @@ IGNORED_DIRS = {
 FRONTEND_EXTENSIONS = {'.js', '.jsx', '.ts', '.tsx', '.mjs'}
 BACKEND_EXTENSIONS = {'.js', '.ts', '.py', '.mjs'}
 SPEC_EXTENSIONS = {'.json', '.yaml', '.yml'}
+SCAN_EXTENSIONS = FRONTEND_EXTENSIONS | BACKEND_EXTENSIONS | SPEC_EXTENSIONS
 
 
 def should_skip_dir(dir_name: str) -> bool:
     return dir_name in IGNORED_DIRS or dir_name.startswith('.')
 
 
-def find_http_client_instances(content: str) -> Set[str]:
+class LineIndex:
+    """Offset -> 1-based line number lookup, built once per file.
+
+    Newline offsets are collected lazily on the first lookup (files without
+    matches never pay for it); each lookup is a bisect.
+    """
+
+    __slots__ = ('content', 'newlines')
+
+    def __init__(self, content):
+        self.content = content
+        self.newlines = None
+
+    def line_of(self, offset: int) -> int:
+        if self.newlines is None:
+            newlines = []
+            newline = '\n' if isinstance(self.content, str) else b'\n'
+            find = self.content.find
+            pos = find(newline)
+            while pos != -1:
+                newlines.append(pos)
+                pos = find(newline, pos + 1)
+            self.newlines = newlines
+        return bisect_left(self.newlines, offset) + 1
+
+
+class FamilyTimer:
+    """Splits a finder run into pattern families: lap(family) charges the
+    time and the hits appended to apis since the previous lap to family"""
+
+    __slots__ = ('profile', 'apis', 'mark', 'count')
+
+    def __init__(self, profile: 'ScanProfile', apis: list):
+        self.profile = profile
+        self.apis = apis
+        self.count = len(apis)
+        self.mark = time.perf_counter()
+
+    def lap(self, family: str):
+        now = time.perf_counter()
+        count = len(self.apis)
+        self.profile.seconds[family] += now - self.mark
+        self.profile.matches[family] += count - self.count
+        self.mark = now
+        self.count = count
+
+
+class NullTimer:
+    __slots__ = ()
+
+    def lap(self, family: str):
+        pass
+
+
+NO_TIMER = NullTimer()
+
+
+class ScanProfile:
+    """--profile statistics: time and hits per pattern family, bytes read
+    and the slowest files.
+
+    Each scanning process fills its own profile; batch profiles from pool
+    workers are merged into the parent's, so seconds are summed CPU-side
+    time rather than wall time.
+    """
+
+    def __init__(self, top: int = 10):
+        self.top = top
+        self.seconds = Counter()
+        self.matches = Counter()
+        self.files = Counter()
+        self.bytes_read = 0
+        # Min-heap of (seconds, file, bytes, hits): the top slowest files
+        self.slowest = []
+
+    def timer(self, apis: list) -> FamilyTimer:
+        return FamilyTimer(self, apis)
+
+    def record_file(self, file_path: str, seconds: float, size: int, hits: int):
+        self.files['scanned'] += 1
+        self.bytes_read += size
+        if len(self.slowest) < self.top:
+            heapq.heappush(self.slowest, (seconds, file_path, size, hits))
+        elif self.top:
+            heapq.heappushpop(self.slowest, (seconds, file_path, size, hits))
+
+    def merge(self, other: 'ScanProfile'):
+        self.seconds.update(other.seconds)
+        self.matches.update(other.matches)
+        self.files.update(other.files)
+        self.bytes_read += other.bytes_read
+        for entry in other.slowest:
+            if len(self.slowest) < self.top:
+                heapq.heappush(self.slowest, entry)
+            elif self.top:
+                heapq.heappushpop(self.slowest, entry)
+
+    def report(self, project_path: Path, wall_seconds: float, skipped: Counter,
+               cache: Optional['ScanCache'] = None) -> dict:
+        total = sum(self.seconds.values())
+        families = [
+            {
+                'family': family,
+                'seconds': round(seconds, 4),
+                'share': round(seconds / total, 3) if total else 0.0,
+                'matches': self.matches[family],
+            }
+            for family, seconds in sorted(self.seconds.items(), key=lambda item: (-item[1], item[0]))
+        ]
+        report = {
+            'wallSeconds': round(wall_seconds, 4),
+            'files': {
+                'scanned': self.files['scanned'],
+                'unreadable': self.files['unreadable'],
+                'skipped': dict(sorted(skipped.items())),
+            },
+            'bytesRead': self.bytes_read,
+            'families': families,
+            'slowestFiles': [
+                {
+                    'file': os.path.relpath(file_path, project_path),
+                    'seconds': round(seconds, 4),
+                    'bytes': size,
+                    'matches': hits,
+                }
+                for seconds, file_path, size, hits in sorted(self.slowest, reverse=True)
+            ],
+        }
+        if cache is not None:
+            report['files']['cached'] = cache.hits
+        return report
+
+
+# Precompiled finder patterns. The methods alternation is sorted so the
+# compiled patterns (and the cache fingerprint) do not depend on set order.
+METHODS_PATTERN = '|'.join(sorted(HTTP_METHODS))
+
+INSTANCE_DECLARATION_RES = [re.compile(pattern, re.MULTILINE) for pattern in INSTANCE_DECLARATION_PATTERNS]
+
+# Frontend finders. String literal runs are left unbounded: every anchor
+# prefix contains the closing quote, so a run never spans another attempt.
+# Adjacent optional whitespace is written once (\s*(?:<...>\s*)?\( rather
+# than \s*(?:<...>)?\s*\(), which would otherwise split every long
+# whitespace run both ways.
+GENERIC_METHOD_RE = re.compile(
+    rf'(\w+)\.({METHODS_PATTERN})\s*(?:<[^>]{{0,{MAX_GENERIC_CHARS}}}>\s*)?\(\s*([\'"`][^)]{{1,{MAX_ARGS_CHARS}}})',
+    re.IGNORECASE)
+FETCH_RE = re.compile(
+    rf'fetch\s*\(\s*([\'"`][^\'"`]+[\'"`])\s*(?:,\s*\{{[^}}]{{0,{MAX_ARGS_CHARS}}}method:\s*[\'"`](\w+)[\'"`])?',
+    re.IGNORECASE)
+SWR_RE = re.compile(r'useSWR\s*\(\s*[\'"`]([^\'"`]+)[\'"`]')
+QUERY_RE = re.compile(rf'useQuery\s*\([^)]{{0,{MAX_ARGS_CHARS}}}fetch\s*\(\s*[\'"`]([^\'"`]+)[\'"`]')
+
+# Backend finders
+NEXTJS_FUNCTION_RE = re.compile(r'export\s+(async\s+)?function\s+(GET|POST|PUT|DELETE|PATCH)')
+NEXTJS_CONST_RE = re.compile(r'export\s+const\s+(GET|POST|PUT|DELETE|PATCH)\s*=')
+EXPRESS_RE = re.compile(r'(app|router)\.(get|post|put|delete|patch)\s*\(\s*[\'"`]([^\'"`]+)[\'"`]', re.IGNORECASE)
+FASTAPI_RE = re.compile(r'@(?:app|router)\.(get|post|put|delete|patch)\s*\(\s*[\'"`]([^\'"`]+)[\'"`]', re.IGNORECASE)
+# The path run also takes whitespace: (?!\s) stops the leading \s* from
+# giving whitespace back to it (that can never turn a miss into a match)
+# and the trailing \s* only follows a closing quote. Paths have no '(',
+# so an unclosed decorator stops at the next one.
+NESTJS_RE = re.compile(
+    rf'@(Get|Post|Put|Delete|Patch)\s*\(\s*(?!\s)[\'"`]?([^\'"`()]{{0,{MAX_ARGS_CHARS}}})(?:[\'"`]\s*)?\)')
+# @Controller('users') or @Controller({ path: 'users' }) prefixes the routes
+# of the decorators that follow it
+NESTJS_CONTROLLER_RE = re.compile(
+    rf'@Controller\s*\(\s*(?:\{{[^{{}}()]{{0,{MAX_ARGS_CHARS}}}?\bpath\s*:\s*)?'
+    rf'(?:[\'"`]([^\'"`()]{{0,{MAX_ARGS_CHARS}}})[\'"`])?')
+
+# URL extraction (template paths: see template_path)
+TS_GENERIC_RE = re.compile(r'<[^>]+>\s*')
+STRING_PATH_RE = re.compile(r'[\'"`](/[^\'"`\s]+)[\'"`]')
+FULL_URL_RE = re.compile(r'[\'"`](https?://[^\'"`\s]+)[\'"`]')
+
+# Single-pass matcher: every finder pattern starts at (or next to) one of
+# these short tokens. One alternation with a named group per token family
+# finds all candidate offsets in a single scan; the finder patterns above
+# are then only tried with .match() at those offsets. Tokens never overlap
+# each other, so no candidate is hidden by another match.
+ANCHOR_TOKENS = {
+    'decl': r'const|let|var',
+    'call': rf'\.(?i:{METHODS_PATTERN})\b',
+    'fetch': r'(?i:fetch)',
+    'swr': r'useSWR',
+    'query': r'useQuery',
+    'export': r'export',
+    'nest': r'@(?:Get|Post|Put|Delete|Patch)',
+    'controller': r'@Controller',
+}
+FRONTEND_ANCHORS = ('decl', 'call', 'fetch', 'swr', 'query')
+BACKEND_ANCHORS = ('export', 'call', 'nest', 'controller')
+
+
+def compile_anchor_pattern(families) -> re.Pattern:
+    return re.compile('|'.join(f'(?P<{family}>{ANCHOR_TOKENS[family]})' for family in families))
+
+
+ANCHOR_PATTERNS = {
+    FRONTEND_ANCHORS: compile_anchor_pattern(FRONTEND_ANCHORS),
+    BACKEND_ANCHORS: compile_anchor_pattern(BACKEND_ANCHORS),
+    tuple(ANCHOR_TOKENS): compile_anchor_pattern(ANCHOR_TOKENS),
+}
+
+# Literal prefilter: a file containing none of these cannot produce a hit
+CALL_LITERALS = tuple(f'.{method}' for method in sorted(HTTP_METHODS))
+NESTJS_LITERALS = ('@Get', '@Post', '@Put', '@Delete', '@Patch')
+
+NON_CLIENT_NAMES = {'console', 'math', 'array', 'object', 'string', 'promise', 'window', 'document'}
+
+# Bytes-level scanning (mmap'd files): every pattern above gets a bytes twin
+# with the same source. \w, \s and IGNORECASE are ASCII-only there.
+BYTES_PATTERNS = {}
+WORD_BYTES = frozenset(b'0123456789_abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ')
+
+
+def for_content(pattern: re.Pattern, content) -> re.Pattern:
+    """pattern itself for str content, its bytes twin for bytes/mmap content"""
+    if isinstance(content, str):
+        return pattern
+    twin = BYTES_PATTERNS.get(pattern)
+    if twin is None:
+        twin = re.compile(pattern.pattern.encode('utf-8'), pattern.flags & ~re.UNICODE)
+        BYTES_PATTERNS[pattern] = twin
+    return twin
+
+
+def span_text(value) -> Optional[str]:
+    """A matched group as str. Bytes spans are decoded leniently: a stray
+    Latin-1 byte costs one replacement character, not the whole file."""
+    if isinstance(value, bytes):
+        return value.decode('utf-8', errors='replace')
+    return value
+
+
+CALL_LITERALS_BYTES = tuple(literal.encode() for literal in CALL_LITERALS)
+NESTJS_LITERALS_BYTES = tuple(literal.encode() for literal in NESTJS_LITERALS)
+# The same prefilter for mapped files, without making a lowered copy
+FRONTEND_PREFILTER_RE = re.compile(
+    rb'(?i:fetch|' + b'|'.join(re.escape(literal.encode()) for literal in CALL_LITERALS) + rb')|useSWR')
+BACKEND_PREFILTER_RE = re.compile(
+    rb'(?i:' + b'|'.join(re.escape(literal.encode()) for literal in CALL_LITERALS) + rb')|'
+    + b'|'.join(re.escape(literal.encode()) for literal in NESTJS_LITERALS))
+
+
+def may_have_frontend_apis(content, lowered) -> bool:
+    if isinstance(content, bytes):
+        return (b'fetch' in lowered or b'useSWR' in content
+                or any(literal in lowered for literal in CALL_LITERALS_BYTES))
+    return ('fetch' in lowered or 'useSWR' in content
+            or any(literal in lowered for literal in CALL_LITERALS))
+
+
+def may_have_backend_apis(content, lowered) -> bool:
+    if isinstance(content, bytes):
+        return (any(literal in lowered for literal in CALL_LITERALS_BYTES)
+                or any(literal in content for literal in NESTJS_LITERALS_BYTES))
+    return (any(literal in lowered for literal in CALL_LITERALS)
+            or any(literal in content for literal in NESTJS_LITERALS))
+
+
+def is_nextjs_route(file_path: Path) -> bool:
+    return '/app/api/' in str(file_path) or '/pages/api/' in str(file_path)
+
+
+def scan_anchors(content, families: tuple) -> dict:
+    """One regex pass over content: token family -> list of match offsets"""
+    pattern = for_content(ANCHOR_PATTERNS.get(families) or compile_anchor_pattern(families), content)
+    positions = {family: [] for family in families}
+    for match in pattern.finditer(content):
+        positions[match.lastgroup].append(match.start())
+    return positions
+
+
+def word_start(content, end: int) -> int:
+    """Start offset of the identifier that ends right before end"""
+    start = end
+    if isinstance(content, str):
+        while start > 0 and (content[start - 1].isalnum() or content[start - 1] == '_'):
+            start -= 1
+    else:
+        while start > 0 and content[start - 1] in WORD_BYTES:
+            start -= 1
+    return start
+
+
+def find_http_client_instances(content: str, decl_positions: Optional[list[int]] = None) -> Set[str]:
     """Find custom HTTP client instance names in the file"""
     instances = set()
 
-    for pattern in INSTANCE_DECLARATION_PATTERNS:
-        for match in re.finditer(pattern, content, re.MULTILINE):
-            if match.group(1):
-                instances.add(match.group(1))
+    if decl_positions is None:
+        decl_positions = scan_anchors(content, ('decl',))['decl']
+
+    # Each declaration pattern keeps its own finditer-style non-overlap
+    for pattern in INSTANCE_DECLARATION_RES:
+        pattern = for_content(pattern, content)
+        last_end = 0
+        for pos in decl_positions:
+            if pos < last_end:
+                continue
+            match = pattern.match(content, pos)
+            if match:
+                last_end = match.end()
+                if match.group(1):
+                    instances.add(span_text(match.group(1)))
 
     return instances
 
 
+# Module-level bindings for the cross-file instance index (InstanceIndex).
+# The statement patterns are tried at SYMBOL_ANCHOR_RE hits that start a line.
+MODULE_SPEC = r'[\'"]([^\'"\n]+)[\'"]'
+# Plain literals (no \b) keep the scan on the fast first-character path.
+# Exported declarations only matter when they declare an instance, which
+# EXPORTED_INSTANCE_RE checks separately, so they are not anchors.
+SYMBOL_ANCHOR_RE = re.compile(
+    r'import|exports\.|export(?!\s+(?:const|let|var|function|async|class|interface|type|enum|abstract)\b)'
+    r'|module\.exports')
+# Import/export name lists never contain '{', so an unclosed list stops at
+# the next statement instead of running to MAX_ARGS_CHARS.
+IMPORT_RE = re.compile(
+    r'import\s+(?:type\s+)?(?:([\w$]+)\s*(?:,\s*)?)?'
+    rf'(?:(?:\{{([^{{}}]{{0,{MAX_ARGS_CHARS}}})\}}|\*\s*as\s+[\w$]+)\s*)?from\s*' + MODULE_SPEC)
+REQUIRE_RE = re.compile(rf'(?:const|let|var)\s+(?:([\w$]+)|\{{([^{{}}]{{0,{MAX_ARGS_CHARS}}})\}})\s*=\s*require\s*\(\s*' + MODULE_SPEC + r'\s*\)')
+EXPORTED_INSTANCE_RE = re.compile(r'^[ \t]*export\s+(?:const|let|var)\s+([\w$]+)', re.MULTILINE)
+EXPORT_LIST_RE = re.compile(rf'export\s+(?:type\s+)?\{{([^{{}}]{{0,{MAX_ARGS_CHARS}}})\}}(?:\s*from\s*' + MODULE_SPEC + ')?')
+EXPORT_STAR_RE = re.compile(r'export\s+\*\s*from\s*' + MODULE_SPEC)
+EXPORT_DEFAULT_RE = re.compile(r'export\s+default\s+([\w$]+)\s*(?:;|$)', re.MULTILINE)
+CJS_EXPORT_RE = re.compile(
+    rf'module\.exports\s*=\s*(?:([\w$]+)\s*(?:;|$)|\{{([^}}]{{0,{MAX_ARGS_CHARS}}})\}})', re.MULTILINE)
+CJS_NAMED_EXPORT_RE = re.compile(r'(?:module\.)?exports\.([\w$]+)\s*=\s*([\w$]+)\s*(?:;|$)', re.MULTILINE)
+# export default axios.create(...) / module.exports = new ApiClient(...)
+DEFAULT_INSTANCE_RE = re.compile(
+    r'(?:export\s+default\s+|module\.exports\s*=\s*)'
+    r'(?:(?:axios|ky|got|superagent|wretch|redaxios)(?:\.create|\.extend)?|new\s+\w*(?:Http|Api|Client|Service)\w*)\s*\(')
+# Every INSTANCE_DECLARATION_PATTERNS match contains one of these
+INSTANCE_HINTS = ('new', '.create', 'axios', 'ky', 'got', 'superagent', 'wretch')
+NAME_ITEM_RE = re.compile(r'(?:type\s+)?([\w$]+)(?:\s*(?:\bas\b|:)\s*([\w$]+))?')
+
+
+def parse_name_list(names: str) -> list[tuple[str, str]]:
+    """'a, b as c' or 'a, b: c' -> [('a', 'a'), ('b', 'c')]"""
+    pairs = []
+    for item in names.split(','):
+        match = NAME_ITEM_RE.fullmatch(item.strip())
+        if match:
+            pairs.append((match.group(1), match.group(2) or match.group(1)))
+    return pairs
+
+
+def starts_line(content: str, pos: int) -> bool:
+    # Walk back over indentation only: rfind('\n') is quadratic when a
+    # minified line is full of anchors
+    while pos > 0 and content[pos - 1] in ' \t':
+        pos -= 1
+    return pos == 0 or content[pos - 1] == '\n'
+
+
+def add_esm_export(content: str, pos: int, exports: dict, reexports: list):
+    """Record the export statement at pos"""
+    match = EXPORT_LIST_RE.match(content, pos)
+    if match:
+        for name, exported in parse_name_list(match.group(1)):
+            if match.group(2):
+                reexports.append([exported, match.group(2), name])
+            else:
+                exports[exported] = name
+        return
+    match = EXPORT_STAR_RE.match(content, pos)
+    if match:
+        reexports.append(['*', match.group(1), '*'])
+        return
+    match = EXPORT_DEFAULT_RE.match(content, pos)
+    if match:
+        exports['default'] = match.group(1)
+
+
+def extract_symbols(content: str) -> Optional[dict]:
+    """Client instances, exports, re-exports and imports of one module.
+
+    exports maps exported name -> local name ('default' is also the local
+    name of an anonymous default-exported instance), imports maps local
+    name -> [module specifier, imported name], reexports lists
+    [exported name, module specifier, imported name] ('*' for export *).
+    None when the module has none of these.
+    """
+    instances = set()
+    exports = {}
+    reexports = []
+    imports = {}
+
+    for anchor in SYMBOL_ANCHOR_RE.finditer(content):
+        pos = anchor.start()
+        if not starts_line(content, pos):
+            continue
+        keyword = anchor.group()
+        if keyword == 'import':
+            match = IMPORT_RE.match(content, pos)
+            if match:
+                if match.group(1):
+                    imports[match.group(1)] = [match.group(3), 'default']
+                if match.group(2):
+                    for name, local in parse_name_list(match.group(2)):
+                        imports[local] = [match.group(3), name]
+            continue
+
+        if DEFAULT_INSTANCE_RE.match(content, pos):
+            instances.add('default')
+            exports['default'] = 'default'
+        elif keyword == 'export':
+            add_esm_export(content, pos, exports, reexports)
+        else:
+            match = CJS_NAMED_EXPORT_RE.match(content, pos)
+            if match:
+                exports[match.group(1)] = match.group(2)
+                continue
+            match = CJS_EXPORT_RE.match(content, pos)
+            if match and match.group(1):
+                exports['default'] = match.group(1)
+            elif match:
+                for exported, name in parse_name_list(match.group(2)):
+                    exports[exported] = name
+
+    if 'require' in content:
+        for match in REQUIRE_RE.finditer(content):
+            if match.group(1):
+                imports[match.group(1)] = [match.group(3), 'default']
+            else:
+                for name, local in parse_name_list(match.group(2)):
+                    imports[local] = [match.group(3), name]
+
+    # Only exported instances matter to other modules
+    if 'export' in content and any(hint in content for hint in INSTANCE_HINTS):
+        declared = find_http_client_instances(content)
+        instances.update(declared)
+        for match in EXPORTED_INSTANCE_RE.finditer(content):
+            if match.group(1) in declared:
+                exports[match.group(1)] = match.group(1)
+
+    symbols = {}
+    for key, value in (('instances', sorted(instances)), ('exports', exports),
+                       ('reexports', reexports), ('imports', imports)):
+        if value:
+            symbols[key] = value
+    return symbols or None
+
+
+def strip_ts_generics(text: str) -> str:
+    """TS_GENERIC_RE.sub('', text) without rescanning the tail after the
+    last '>' from every unclosed '<' (quadratic on '<<<<...')"""
+    end = text.rfind('>') + 1
+    pieces = []
+    last = 0
+    for match in TS_GENERIC_RE.finditer(text, 0, end):
+        pieces.append(text[last:match.start()])
+        last = match.end()
+    if not pieces:
+        return text
+    tail = text[last:]
+    # A generic ending at the last '>' also takes the whitespace after it
+    pieces.append(tail.lstrip() if last == end else tail)
+    return ''.join(pieces)
+
+
+def template_path(text: str) -> Optional[str]:
+    """Path part of the first template literal that has one: from the last
+    '/' with no '${' after it to the closing backtick (`${base}/users` ->
+    /users). Same result as searching `[^`]*(/[^`$]+)` but linear"""
+    start = text.find('`')
+    while start != -1:
+        end = text.find('`', start + 1)
+        if end == -1:
+            return None
+        slash = text.rfind('/', start + 1, end)
+        if slash == end - 1:
+            slash = text.rfind('/', start + 1, slash)
+        if slash != -1 and text.find('$', slash, end) == -1:
+            return text[slash:end]
+        start = end
+    return None
+
+
 def extract_url_from_match(match_str: str) -> Optional[str]:
     """Extract URL/path from various string formats"""
     # Remove TypeScript generics like <T> or <ResponseType>
-    match_str = re.sub(r'<[^>]+>\s*', '', match_str)
+    match_str = strip_ts_generics(match_str)
 
     # Handle template literals: `${baseUrl}/path` -> extract /path part
-    template_match = re.search(r'`[^`]*(/[^`\$]+)`', match_str)
-    if template_match:
-        return template_match.group(1)
+    path = template_path(match_str)
+    if path:
+        return path
 
     # Handle simple strings: '/api/users' or "/api/users"
-    string_match = re.search(r'[\'"`](/[^\'"`\s]+)[\'"`]', match_str)
+    string_match = STRING_PATH_RE.search(match_str)
     if string_match:
         return string_match.group(1)
 
     # Handle full URLs
-    url_match = re.search(r'[\'"`](https?://[^\'"`\s]+)[\'"`]', match_str)
+    url_match = FULL_URL_RE.search(match_str)
     if url_match:
         return url_match.group(1)
 
     return None
 
 
-def find_frontend_apis(file_path: Path, content: str) -> list[APICall]:
-    """Find frontend API calls in a file"""
-    apis = []
+def match_at(pattern: re.Pattern, content: str, positions: list[int], offset: int = 0) -> Iterator[re.Match]:
+    """Matches of pattern tried at each anchor position (+offset), without
+    overlapping, i.e. what pattern.finditer(content) would have produced"""
+    pattern = for_content(pattern, content)
+    last_end = 0
+    for pos in positions:
+        start = pos + offset
+        if start < last_end or start < 0:
+            continue
+        match = pattern.match(content, start)
+        if match:
+            last_end = match.end()
+            yield match
 
-    # Find custom instances in this file
-    custom_instances = find_http_client_instances(content)
 
-    # Build dynamic pattern for HTTP method calls
-    # Matches: instanceName.method<T>('/path', ...) or instanceName.method('/path', ...)
-    all_instances = custom_instances | COMMON_INSTANCE_NAMES | {'axios', 'ky', 'got', 'superagent', 'fetch'}
+def find_frontend_apis(file_path: Path, content: str, lines: Optional[LineIndex] = None,
+                       anchors: Optional[dict] = None, profile: Optional[ScanProfile] = None) -> list[APICall]:
+    """Find frontend API calls in a file"""
+    apis = []
+    if anchors is None:
+        if isinstance(content, (str, bytes)) and not may_have_frontend_apis(content, content.lower()):
+            return apis
+        anchors = scan_anchors(content, FRONTEND_ANCHORS)
+    lines = lines or LineIndex(content)
+    timer = profile.timer(apis) if profile is not None else NO_TIMER
 
     # Pattern 1: instance.method<T?>('/path') - covers axios, ky, got, custom instances
     # Handles: apiClient.post<LoginResponse>('/v1/accounts/login/email', data)
-    methods_pattern = '|'.join(HTTP_METHODS)
-    instance_pattern = '|'.join(re.escape(name) for name in all_instances)
-
-    # Generic pattern for any potential HTTP client call
-    # Match: word.httpMethod<optional generic>( string or template literal
-    generic_method_pattern = rf'(\w+)\.({methods_pattern})\s*(?:<[^>]*>)?\s*\(\s*([\'"`][^)]+)'
+    if anchors['call']:
+        # Find custom instances in this file (only needed when there are calls)
+        custom_instances = find_http_client_instances(content, anchors['decl'])
+        timer.lap('frontend.instances')
+
+        # The pattern starts at the identifier in front of each ".method" token
+        generic_method_re = for_content(GENERIC_METHOD_RE, content)
+        last_end = 0
+        for dot in anchors['call']:
+            start = max(word_start(content, dot), last_end)
+            if start >= dot:
+                continue
+            match = generic_method_re.match(content, start)
+            if not match:
+                continue
+            last_end = match.end()
 
-    for match in re.finditer(generic_method_pattern, content, re.IGNORECASE):
-        instance_name = match.group(1)
-        method = match.group(2).upper()
-        url_part = match.group(3)
+            instance_name = span_text(match.group(1))
+            method = span_text(match.group(2)).upper()
+            url_part = span_text(match.group(3))
 
-        # Skip if it doesn't look like an HTTP client call
-        if instance_name.lower() in {'console', 'math', 'array', 'object', 'string', 'promise', 'window', 'document'}:
-            continue
+            # Skip if it doesn't look like an HTTP client call
+            if instance_name.lower() in NON_CLIENT_NAMES:
+                continue
 
-        url = extract_url_from_match(url_part)
-        if not url:
-            continue
+            url = extract_url_from_match(url_part)
+            if not url:
+                continue
 
-        line_num = content[:match.start()].count('\n') + 1
-
-        # Determine library
-        library = 'unknown'
-        if instance_name in custom_instances:
-            library = 'custom-instance'
-        elif instance_name.lower() in {'axios'}:
-            library = 'axios'
-        elif instance_name.lower() in {'ky'}:
-            library = 'ky'
-        elif instance_name.lower() in {'got'}:
-            library = 'got'
-        elif instance_name in COMMON_INSTANCE_NAMES:
-            library = 'http-client'
+            line_num = lines.line_of(match.start())
+
+            # Determine library
+            library = 'unknown'
+            if instance_name in custom_instances:
+                library = 'custom-instance'
+            elif instance_name.lower() in {'axios'}:
+                library = 'axios'
+            elif instance_name.lower() in {'ky'}:
+                library = 'ky'
+            elif instance_name.lower() in {'got'}:
+                library = 'got'
+            elif instance_name in COMMON_INSTANCE_NAMES:
+                library = 'http-client'
 
-        apis.append(APICall(
-            type='frontend',
-            method=method,
-            path=url,
-            file=str(file_path),
-            line=line_num,
-            library=library,
-            instance_name=instance_name if instance_name not in {'axios', 'ky', 'got', 'fetch'} else None
-        ))
+            apis.append(APICall(
+                type='frontend',
+                method=method,
+                path=url,
+                file=str(file_path),
+                line=line_num,
+                library=library,
+                instance_name=instance_name if instance_name not in {'axios', 'ky', 'got', 'fetch'} else None
+            ))
+        timer.lap('frontend.method-call')
 
     # Pattern 2: fetch('/path', { method: 'POST' }) or fetch('/path')
-    fetch_pattern = r'fetch\s*\(\s*([\'"`][^\'"`]+[\'"`])\s*(?:,\s*\{[^}]*method:\s*[\'"`](\w+)[\'"`])?'
-    for match in re.finditer(fetch_pattern, content, re.IGNORECASE):
-        url = extract_url_from_match(match.group(1))
+    for match in match_at(FETCH_RE, content, anchors['fetch']):
+        url = extract_url_from_match(span_text(match.group(1)))
         if not url:
             continue
-        method = match.group(2).upper() if match.group(2) else 'GET'
-        line_num = content[:match.start()].count('\n') + 1
+        method = span_text(match.group(2)).upper() if match.group(2) else 'GET'
+        line_num = lines.line_of(match.start())
 
         apis.append(APICall(
             type='frontend',
@@ -188,13 +811,13 @@ def find_frontend_apis(file_path: Path, content: str) -> list[APICall]:
             line=line_num,
             library='fetch'
         ))
+    timer.lap('frontend.fetch')
 
     # Pattern 3: useSWR('/api/users') or useQuery(['/api/users'])
-    swr_pattern = r'useSWR\s*\(\s*[\'"`]([^\'"`]+)[\'"`]'
-    for match in re.finditer(swr_pattern, content):
-        url = match.group(1)
+    for match in match_at(SWR_RE, content, anchors['swr']):
+        url = span_text(match.group(1))
         if url.startswith('/') or url.startswith('http'):
-            line_num = content[:match.start()].count('\n') + 1
+            line_num = lines.line_of(match.start())
             apis.append(APICall(
                 type='frontend',
                 method='GET',
@@ -203,13 +826,13 @@ def find_frontend_apis(file_path: Path, content: str) -> list[APICall]:
                 line=line_num,
                 library='swr'
             ))
+    timer.lap('frontend.swr')
 
     # Pattern 4: useQuery with fetch
-    query_pattern = r'useQuery\s*\([^)]*fetch\s*\(\s*[\'"`]([^\'"`]+)[\'"`]'
-    for match in re.finditer(query_pattern, content):
-        url = match.group(1)
+    for match in match_at(QUERY_RE, content, anchors['query']):
+        url = span_text(match.group(1))
         if url.startswith('/') or url.startswith('http'):
-            line_num = content[:match.start()].count('\n') + 1
+            line_num = lines.line_of(match.start())
             apis.append(APICall(
                 type='frontend',
                 method='GET',
@@ -218,16 +841,25 @@ def find_frontend_apis(file_path: Path, content: str) -> list[APICall]:
                 line=line_num,
                 library='react-query'
             ))
+    timer.lap('frontend.react-query')
 
     return apis
 
 
-def find_backend_apis(file_path: Path, content: str) -> list[APICall]:
+def find_backend_apis(file_path: Path, content: str, lines: Optional[LineIndex] = None,
+                      anchors: Optional[dict] = None, profile: Optional[ScanProfile] = None) -> list[APICall]:
     """Find backend API endpoints in a file"""
     apis = []
+    nextjs_route = is_nextjs_route(file_path)
+    if anchors is None:
+        if isinstance(content, (str, bytes)) and not nextjs_route and not may_have_backend_apis(content, content.lower()):
+            return apis
+        anchors = scan_anchors(content, BACKEND_ANCHORS)
+    lines = lines or LineIndex(content)
+    timer = profile.timer(apis) if profile is not None else NO_TIMER
 
     # Detect Next.js API routes from file path
-    if '/app/api/' in str(file_path) or '/pages/api/' in str(file_path):
+    if nextjs_route:
         path_str = str(file_path)
         if '/app/api/' in path_str:
             route = path_str.split('/app/api/')[-1]
@@ -237,9 +869,9 @@ def find_backend_apis(file_path: Path, content: str) -> list[APICall]:
             route = '/api/' + route.replace('.ts', '').replace('.js', '')
 
         # Find exported HTTP methods
-        for match in re.finditer(r'export\s+(async\s+)?function\s+(GET|POST|PUT|DELETE|PATCH)', content):
-            method = match.group(2)
-            line_num = content[:match.start()].count('\n') + 1
+        for match in match_at(NEXTJS_FUNCTION_RE, content, anchors['export']):
+            method = span_text(match.group(2))
+            line_num = lines.line_of(match.start())
             apis.append(APICall(
                 type='backend',
                 method=method,
@@ -249,9 +881,9 @@ def find_backend_apis(file_path: Path, content: str) -> list[APICall]:
                 library='nextjs-api'
             ))
 
-        for match in re.finditer(r'export\s+const\s+(GET|POST|PUT|DELETE|PATCH)\s*=', content):
-            method = match.group(1)
-            line_num = content[:match.start()].count('\n') + 1
+        for match in match_at(NEXTJS_CONST_RE, content, anchors['export']):
+            method = span_text(match.group(1))
+            line_num = lines.line_of(match.start())
             apis.append(APICall(
                 type='backend',
                 method=method,
@@ -260,13 +892,26 @@ def find_backend_apis(file_path: Path, content: str) -> list[APICall]:
                 line=line_num,
                 library='nextjs-api'
             ))
+        timer.lap('backend.nextjs')
 
     # Express/Hono style: app.get('/path', ...) or router.post('/path', ...)
-    express_pattern = r'(app|router)\.(get|post|put|delete|patch)\s*\(\s*[\'"`]([^\'"`]+)[\'"`]'
-    for match in re.finditer(express_pattern, content, re.IGNORECASE):
-        method = match.group(2).upper()
-        path = match.group(3)
-        line_num = content[:match.start()].count('\n') + 1
+    # The "app"/"router" prefix sits right before the ".method" token
+    express_re = for_content(EXPRESS_RE, content)
+    express_matches = []
+    last_end = 0
+    for dot in anchors['call']:
+        for start in (dot - 6, dot - 3):
+            if start < last_end or start < 0:
+                continue
+            match = express_re.match(content, start)
+            if match:
+                last_end = match.end()
+                express_matches.append(match)
+                break
+    for match in express_matches:
+        method = span_text(match.group(2)).upper()
+        path = span_text(match.group(3))
+        line_num = lines.line_of(match.start())
         apis.append(APICall(
             type='backend',
             method=method,
@@ -275,13 +920,25 @@ def find_backend_apis(file_path: Path, content: str) -> list[APICall]:
             line=line_num,
             library='express'
         ))
+    timer.lap('backend.express')
 
     # FastAPI style: @app.get('/path')
-    fastapi_pattern = r'@(?:app|router)\.(get|post|put|delete|patch)\s*\(\s*[\'"`]([^\'"`]+)[\'"`]'
-    for match in re.finditer(fastapi_pattern, content, re.IGNORECASE):
-        method = match.group(1).upper()
-        path = match.group(2)
-        line_num = content[:match.start()].count('\n') + 1
+    fastapi_re = for_content(FASTAPI_RE, content)
+    fastapi_matches = []
+    last_end = 0
+    for dot in anchors['call']:
+        for start in (dot - 7, dot - 4):
+            if start < last_end or start < 0:
+                continue
+            match = fastapi_re.match(content, start)
+            if match:
+                last_end = match.end()
+                fastapi_matches.append(match)
+                break
+    for match in fastapi_matches:
+        method = span_text(match.group(1)).upper()
+        path = span_text(match.group(2))
+        line_num = lines.line_of(match.start())
         apis.append(APICall(
             type='backend',
             method=method,
@@ -290,13 +947,20 @@ def find_backend_apis(file_path: Path, content: str) -> list[APICall]:
             line=line_num,
             library='fastapi'
         ))
-
-    # NestJS style: @Get('/path'), @Post(), etc.
-    nestjs_pattern = r'@(Get|Post|Put|Delete|Patch)\s*\(\s*[\'"`]?([^\'"`\)]*)[\'"`]?\s*\)'
-    for match in re.finditer(nestjs_pattern, content):
-        method = match.group(1).upper()
-        path = match.group(2) if match.group(2) else '/'
-        line_num = content[:match.start()].count('\n') + 1
+    timer.lap('backend.fastapi')
+
+    # NestJS style: @Get('/path'), @Post(), etc., under the nearest
+    # @Controller() above them
+    controllers = [(match.start(), span_text(match.group(1)) or '')
+                   for match in match_at(NESTJS_CONTROLLER_RE, content, anchors['controller'])]
+    controller_starts = [start for start, _ in controllers]
+    for match in match_at(NESTJS_RE, content, anchors['nest']):
+        method = span_text(match.group(1)).upper()
+        path = span_text(match.group(2)) if match.group(2) else '/'
+        index = bisect_right(controller_starts, match.start())
+        if index:
+            path = nestjs_path(controllers[index - 1][1], path)
+        line_num = lines.line_of(match.start())
         apis.append(APICall(
             type='backend',
             method=method,
@@ -305,154 +969,1212 @@ def find_backend_apis(file_path: Path, content: str) -> list[APICall]:
             line=line_num,
             library='nestjs'
         ))
+    timer.lap('backend.nestjs')
 
     return apis
 
 
+def nestjs_path(prefix: str, path: str) -> str:
+    """A handler path joined to its controller prefix: ('users', ':id') -> '/users/:id'"""
+    segments = [part.strip().strip('/') for part in (prefix, path)]
+    return '/' + '/'.join(segment for segment in segments if segment)
+
+
+# An OpenAPI/Swagger document names itself in a top-level key, normally in
+# the first lines; this sniff runs before any JSON/YAML parsing
+SPEC_SNIFF_CHARS = 4096
+JSON_SPEC_KEY_RE = re.compile(r'"(?:openapi|swagger)"\s*:')
+YAML_SPEC_KEY_RE = re.compile(r'^["\']?(?:openapi|swagger)["\']?\s*:', re.MULTILINE)
+
+# JSON specs above this size are walked member by member instead of json.loads()
+SPEC_STREAM_CHARS = 1024 * 1024
+JSON_WHITESPACE_RE = re.compile(r'[ \t\n\r]*')
+JSON_DECODER = json.JSONDecoder()
+
+# Top-level spec keys whose values are needed besides "paths"
+SPEC_HEAD_KEYS = {'openapi', 'swagger', 'basePath', 'servers'}
+YAML_BLOCK_KEY_RE = re.compile(r'["\']?([^"\'\s:#][^"\':]*)["\']?\s*:')
+
+
+def sniff_openapi(content: str, is_json: bool) -> bool:
+    """Cheap check for an openapi/swagger key, before any parsing"""
+    key_res = (JSON_SPEC_KEY_RE,) if is_json else (YAML_SPEC_KEY_RE, JSON_SPEC_KEY_RE)
+    if any(key_re.search(content, 0, SPEC_SNIFF_CHARS) for key_re in key_res):
+        return True
+    # Key order is free: look further only when the word occurs at all
+    if 'openapi' not in content and 'swagger' not in content:
+        return False
+    return any(key_re.search(content) for key_re in key_res)
+
+
+def openapi_base_path(spec: dict) -> str:
+    base_path = ''
+    if 'basePath' in spec:  # Swagger 2.0
+        base_path = spec['basePath']
+    elif 'servers' in spec and spec['servers']:  # OpenAPI 3.x
+        server_url = spec['servers'][0].get('url', '')
+        # Extract path from URL if present
+        if '/' in server_url.replace('://', ''):
+            base_path = '/' + server_url.split('/', 3)[-1] if server_url.count('/') > 2 else ''
+    return base_path
+
+
+def openapi_operations(path: str, methods) -> Iterator[tuple[str, str, Optional[str]]]:
+    """(path, METHOD, summary) for each operation of one path item"""
+    if not isinstance(methods, dict):
+        return
+
+    for method, details in methods.items():
+        if not isinstance(method, str) or method.upper() not in HTTP_METHODS_UPPER:
+            continue
+
+        summary = ''
+        if isinstance(details, dict):
+            summary = details.get('summary', details.get('operationId', ''))
+
+        yield path, method.upper(), summary if summary else None
+
+
+def openapi_apis(file_path: Path, head: dict, operations: Iterable[tuple]) -> list[APICall]:
+    """APICalls for a spec, or nothing when head has no openapi/swagger key"""
+    if not ('openapi' in head or 'swagger' in head):
+        return []
+
+    base_path = openapi_base_path(head)
+    return [
+        APICall(
+            type='spec',
+            method=method,
+            path=base_path + path,
+            file=str(file_path),
+            line=1,
+            library='openapi',
+            function_name=summary
+        )
+        for path, method, summary in operations
+    ]
+
+
+def skip_json_value(content: str, pos: int, depth: int = 2) -> int:
+    """End offset of the JSON value at pos.
+
+    Containers are walked depth levels deep and everything below that is
+    decoded one element at a time and dropped, so a skipped section never
+    exists in memory as a whole.
+    """
+    opener = content[pos]
+    if depth == 0 or opener not in '[{':
+        return JSON_DECODER.raw_decode(content, pos)[1]
+    closer = '}' if opener == '{' else ']'
+    pos = JSON_WHITESPACE_RE.match(content, pos + 1).end()
+    if content[pos] == closer:
+        return pos + 1
+    while True:
+        if opener == '{':
+            _, pos = read_json_key(content, pos)
+        pos = JSON_WHITESPACE_RE.match(content, skip_json_value(content, pos, depth - 1)).end()
+        if content[pos] == closer:
+            return pos + 1
+        if content[pos] != ',':
+            raise ValueError('expected comma')
+        pos = JSON_WHITESPACE_RE.match(content, pos + 1).end()
+
+
+def read_json_key(content: str, pos: int) -> tuple[str, int]:
+    """Parse '"key" :' at pos; returns the key and the offset of its value"""
+    if content[pos] != '"':
+        raise ValueError('expected key')
+    key, pos = json.decoder.scanstring(content, pos + 1)
+    pos = JSON_WHITESPACE_RE.match(content, pos).end()
+    if content[pos] != ':':
+        raise ValueError('expected colon')
+    return key, JSON_WHITESPACE_RE.match(content, pos + 1).end()
+
+
+def iter_json_members(content: str, pos: int,
+                      decode_keys: Optional[set] = None) -> Iterator[tuple[str, object, int]]:
+    """Members of the JSON object at pos as (key, value, value_start).
+
+    With decode_keys only those members are decoded (the others yield
+    None), so memory is bounded by the largest decoded member rather than
+    the whole object.
+    """
+    pos = JSON_WHITESPACE_RE.match(content, pos).end()
+    if content[pos] != '{':
+        raise ValueError('expected object')
+    pos = JSON_WHITESPACE_RE.match(content, pos + 1).end()
+    while content[pos] != '}':
+        key, start = read_json_key(content, pos)
+        if decode_keys is None or key in decode_keys:
+            value, pos = JSON_DECODER.raw_decode(content, start)
+        else:
+            value, pos = None, skip_json_value(content, start)
+        yield key, value, start
+        pos = JSON_WHITESPACE_RE.match(content, pos).end()
+        if content[pos] == ',':
+            pos = JSON_WHITESPACE_RE.match(content, pos + 1).end()
+        elif content[pos] != '}':
+            raise ValueError('expected comma')
+
+
+def stream_json_spec(file_path: Path, content: str) -> list[APICall]:
+    """Spec APIs from a large JSON document, one path item in memory at a time"""
+    head = {}
+    operations = []
+    for key, value, start in iter_json_members(content, 0, SPEC_HEAD_KEYS):
+        if key == 'paths':
+            operations = []
+            for path, methods, _ in iter_json_members(content, start):
+                operations.extend(openapi_operations(path, methods))
+        elif key in SPEC_HEAD_KEYS:
+            head[key] = value
+    return openapi_apis(file_path, head, operations)
+
+
+def iter_yaml_blocks(content: str, start: int, end: int, indent: int) -> Iterator[tuple[int, int]]:
+    """(start, end) of each block in content[start:end] opened by a line
+    indented by exactly indent spaces"""
+    block_re = re.compile(rf'^ {{{indent}}}(?=[^\s#\-%])', re.MULTILINE)
+    block_start = None
+    for match in block_re.finditer(content, start, end):
+        if block_start is not None:
+            yield block_start, match.start()
+        block_start = match.start()
+    if block_start is not None:
+        yield block_start, end
+
+
+def load_yaml_spec_chunked(file_path: Path, content: str) -> list[APICall]:
+    """Spec APIs from YAML, loading one top-level block or path item at a time.
+
+    Blocks other than paths/openapi/swagger/basePath/servers (components
+    usually being the biggest) are never parsed at all.
+    """
+    head = {}
+    operations = []
+    for block_start, block_end in iter_yaml_blocks(content, 0, len(content), 0):
+        key_match = YAML_BLOCK_KEY_RE.match(content, block_start)
+        key = key_match.group(1).strip() if key_match else None
+        if key == 'paths':
+            # Path items are the next indentation level below "paths:"
+            body_start = content.find('\n', block_start, block_end) + 1
+            first_item = re.compile(r'^( +)[^\s#]', re.MULTILINE).search(content, body_start, block_end)
+            if body_start == 0 or not first_item:
+                continue
+            indent = len(first_item.group(1))
+            for item_start, item_end in iter_yaml_blocks(content, body_start, block_end, indent):
+                item = yaml.load(content[item_start:item_end], Loader=YAML_LOADER)
+                if isinstance(item, dict):
+                    for path, methods in item.items():
+                        operations.extend(openapi_operations(path, methods))
+        elif key is None or key in SPEC_HEAD_KEYS:
+            block = yaml.load(content[block_start:block_end], Loader=YAML_LOADER)
+            if isinstance(block, dict):
+                head.update(block)
+    return openapi_apis(file_path, head, operations)
+
+
 def find_openapi_specs(file_path: Path, content: str) -> list[APICall]:
     """Parse OpenAPI/Swagger specification files"""
-    apis = []
+    is_json = file_path.suffix == '.json'
+    if is_json or file_path.suffix in {'.yaml', '.yml'}:
+        if not sniff_openapi(content, is_json):
+            return []
 
     try:
-        if file_path.suffix == '.json':
+        if is_json:
+            if len(content) > SPEC_STREAM_CHARS:
+                return stream_json_spec(file_path, content)
             spec = json.loads(content)
+        elif file_path.suffix in {'.yaml', '.yml'}:
+            if yaml is None:
+                return []
+            try:
+                return load_yaml_spec_chunked(file_path, content)
+            except yaml.YAMLError:
+                # Aliases across blocks, flow style, ...: load the whole document
+                spec = yaml.load(content, Loader=YAML_LOADER)
         else:
-            # For YAML, try to parse as JSON-like structure
-            # In production, you'd use pyyaml
-            return apis
+            return []
 
-        # Check if this is an OpenAPI/Swagger spec
-        if not ('openapi' in spec or 'swagger' in spec):
-            return apis
-
-        # Get base path
-        base_path = ''
-        if 'basePath' in spec:  # Swagger 2.0
-            base_path = spec['basePath']
-        elif 'servers' in spec and spec['servers']:  # OpenAPI 3.x
-            server_url = spec['servers'][0].get('url', '')
-            # Extract path from URL if present
-            if '/' in server_url.replace('://', ''):
-                base_path = '/' + server_url.split('/', 3)[-1] if server_url.count('/') > 2 else ''
+        if not isinstance(spec, dict):
+            return []
 
         # Parse paths
         paths = spec.get('paths', {})
+        operations = []
         for path, methods in paths.items():
-            if not isinstance(methods, dict):
-                continue
+            operations.extend(openapi_operations(path, methods))
+        return openapi_apis(file_path, spec, operations)
+
+    except (ValueError, KeyError, TypeError, AttributeError, IndexError, *YAML_ERRORS):
+        return []
+
+
+# Admission control: files that are not worth reading in full. Only
+# ignore files apply by default; size limits and generated/minified
+# skipping are opt-in (0 = no limit)
+DEFAULT_MAX_FILE_SIZE = 0
+DEFAULT_MAX_SPEC_SIZE = 0
+PROJECT_IGNORE_FILE = '.prompt-inspector-ignore'
+MINIFIED_SUFFIXES = ('.min.js', '.min.mjs')
+# Minified/generated code is recognised from the first bytes only
+ADMISSION_HEAD_BYTES = 8192
+# A generator's header: a comment line with @generated or Go's
+# "Code generated ... DO NOT EDIT." in the first lines of the file
+GENERATED_MARKER_LINES = 5
+GENERATED_MARKER_RE = re.compile(
+    rb'^[ \t]*(?://|#|/\*+|\*|<!--)[ \t]*(?:@generated\b|Code generated\b[^\n]*\bDO NOT EDIT\.)', re.MULTILINE)
+MINIFIED_MIN_BYTES = 2048
+MINIFIED_AVG_LINE_LENGTH = 300
+# Smaller files are cheaper to read() than to map
+MMAP_MIN_BYTES = 64 * 1024
+# Bytes a text-mode scan would see differently: non-ASCII, \x1c-\x1f (str
+# \s whitespace) and a lone \r (a newline once decoded)
+TEXT_ONLY_BYTES_RE = re.compile(rb'[\x1c-\x1f\x80-\xff]|\r(?!\n)')
+
+
+def content_skip_reason(file_path, head: bytes) -> Optional[str]:
+    """'generated' or 'minified' for code files, judged by their first bytes"""
+    if os.path.splitext(file_path)[1].lower() in SPEC_EXTENSIONS:
+        # Compact one-line JSON and generated specs are still specs
+        return None
+    header_end = -1
+    for _ in range(GENERATED_MARKER_LINES):
+        header_end = head.find(b'\n', header_end + 1)
+        if header_end < 0:
+            header_end = len(head)
+            break
+    if GENERATED_MARKER_RE.search(head, 0, header_end):
+        return 'generated'
+    if len(head) >= MINIFIED_MIN_BYTES and len(head) / (head.count(b'\n') + 1) > MINIFIED_AVG_LINE_LENGTH:
+        return 'minified'
+    return None
 
-            full_path = base_path + path
 
-            for method, details in methods.items():
-                if method.upper() not in HTTP_METHODS_UPPER:
-                    continue
+def scans_bytes(file_path: Path, use_mmap: bool) -> bool:
+    """Whether the finders may run on raw bytes for this file (spec parsers need str)"""
+    return use_mmap and file_path.suffix.lower() not in SPEC_EXTENSIONS
 
-                summary = ''
-                if isinstance(details, dict):
-                    summary = details.get('summary', details.get('operationId', ''))
-
-                apis.append(APICall(
-                    type='spec',
-                    method=method.upper(),
-                    path=full_path,
-                    file=str(file_path),
-                    line=1,
-                    library='openapi',
-                    function_name=summary if summary else None
-                ))
-
-    except (json.JSONDecodeError, KeyError, TypeError):
-        pass
 
-    return apis
+def decode_source(data) -> str:
+    """File bytes as text, with the newlines of a text-mode read"""
+    content = str(data, 'utf-8')
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return content
+
 
+def source_content(file_path: Path, data, use_mmap: bool):
+    """What the finders run on: data itself when scanned as bytes, else its
+    text (UnicodeDecodeError if it is not UTF-8).
 
-def scan_directory(project_path: Path) -> list[APICall]:
-    """Scan a directory for all API calls and endpoints"""
-    all_apis = []
+    Bytes patterns only agree with the text ones on ASCII (\\w, \\s and
+    IGNORECASE differ beyond it), so in mmap mode a file with other
+    characters is decoded as well; it stays bytes only when it is not UTF-8
+    at all, which text mode could not read.
+    """
+    if not scans_bytes(file_path, use_mmap):
+        return decode_source(data)
+    if TEXT_ONLY_BYTES_RE.search(data) is None:
+        return data
+    try:
+        return decode_source(data)
+    except UnicodeDecodeError:
+        return data
+
+
+@contextmanager
+def open_source(file_path: Path, skip_generated: bool = False, use_mmap: bool = False):
+    """Yield (data, None) for an admitted file, (None, reason) for a skipped one.
+
+    data is the file's bytes; with use_mmap code files from MMAP_MIN_BYTES
+    up are a read-only mmap instead, scanned in place without a copy.
+    Files rejected as minified or generated are only read up to their head.
+    """
+    with open(file_path, 'rb') as f:
+        mapped = None
+        if scans_bytes(file_path, use_mmap) and os.fstat(f.fileno()).st_size >= MMAP_MIN_BYTES:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            head = mapped[:ADMISSION_HEAD_BYTES] if mapped is not None else f.read(ADMISSION_HEAD_BYTES)
+            reason = content_skip_reason(file_path, head) if skip_generated else None
+            if reason:
+                yield None, reason
+            elif mapped is not None:
+                yield mapped, None
+            else:
+                yield head + f.read(), None
+        finally:
+            if mapped is not None:
+                mapped.close()
+
+
+def translate_ignore_glob(glob: str) -> str:
+    """gitignore glob -> regex source (matched against '/'-separated paths)"""
+    out = []
+    i, n = 0, len(glob)
+    while i < n:
+        char = glob[i]
+        if glob.startswith('**/', i):
+            out.append('(?:.*/)?')
+            i += 3
+            continue
+        if glob.startswith('**', i):
+            out.append('.*')
+            i += 2
+            continue
+        if char == '*':
+            out.append('[^/]*')
+        elif char == '?':
+            out.append('[^/]')
+        elif char == '[' and glob.find(']', i + 2) > 0:
+            end = glob.find(']', i + 2)
+            body = glob[i + 1:end]
+            if body[0] in '!^':
+                body = '^' + body[1:]
+            out.append(f"[{body.replace(chr(92), chr(92) * 2)}]")
+            i = end + 1
+            continue
+        elif char == '\\' and i + 1 < n:
+            out.append(re.escape(glob[i + 1]))
+            i += 2
+            continue
+        else:
+            out.append(re.escape(char))
+        i += 1
+    return ''.join(out)
 
+
+def load_ignore_file(ignore_file: Path, reason: str) -> list[tuple]:
+    """gitignore-syntax file -> [(regex, negate, dir_only, reason)]"""
+    try:
+        lines = ignore_file.read_text(encoding='utf-8', errors='replace').splitlines()
+    except OSError:
+        return []
+
+    rules = []
+    for line in lines:
+        if not line.endswith('\\ '):
+            line = line.rstrip()
+        if not line or line.startswith('#'):
+            continue
+        negate = line.startswith('!')
+        if negate:
+            line = line[1:]
+        dir_only = line.endswith('/')
+        line = line.rstrip('/')
+        if not line:
+            continue
+        # A slash anywhere but the end anchors the pattern to the file's directory
+        anchored = '/' in line
+        regex = translate_ignore_glob(line.lstrip('/'))
+        if not anchored:
+            regex = '(?:.*/)?' + regex
+        rules.append((re.compile(regex + r'\Z', re.DOTALL), negate, dir_only, reason))
+    return rules
+
+
+class FileAdmission:
+    """Decides which files are read at all, counting every skip by reason.
+
+    Paths are matched against .gitignore files (each one applying below its
+    own directory, the deepest match winning, as in git) and the project's
+    .prompt-inspector-ignore. Files over the size limits are skipped from
+    their stat; minified and generated code is recognised by
+    read_admitted() from the first bytes.
+    """
+
+    def __init__(self, project_path: Path, max_file_size: int = DEFAULT_MAX_FILE_SIZE,
+                 max_spec_size: int = DEFAULT_MAX_SPEC_SIZE, skip_generated: bool = False,
+                 use_gitignore: bool = True):
+        self.project_path = project_path
+        self.max_file_size = max_file_size
+        self.max_spec_size = max_spec_size
+        self.skip_generated = skip_generated
+        self.use_gitignore = use_gitignore
+        # Files skipped per reason ('<reason>-dir' for pruned directories)
+        self.skipped = Counter()
+        # Relative directory ('' for the root) -> its ignore rules
+        self.rules = {}
+
+    def dir_rules(self, rel_dir: str) -> list[tuple]:
+        rules = self.rules.get(rel_dir)
+        if rules is None:
+            directory = self.project_path / rel_dir
+            rules = load_ignore_file(directory / '.gitignore', 'gitignore') if self.use_gitignore else []
+            if rel_dir == '':
+                rules += load_ignore_file(directory / PROJECT_IGNORE_FILE, 'ignore-file')
+            self.rules[rel_dir] = rules
+        return rules
+
+    def ignore_reason(self, rel_path: str, is_dir: bool) -> Optional[str]:
+        """Reason why rel_path ('/'-separated, relative to the project) is ignored, or None"""
+        parts = rel_path.split('/')
+        reason = None
+        for depth in range(len(parts)):
+            rules = self.dir_rules('/'.join(parts[:depth]))
+            if not rules:
+                continue
+            sub_path = '/'.join(parts[depth:])
+            for regex, negate, dir_only, rule_reason in rules:
+                if (is_dir or not dir_only) and regex.match(sub_path):
+                    reason = None if negate else rule_reason
+        return reason
+
+    def size_reason(self, file_path: Path) -> Optional[str]:
+        if file_path.name.endswith(MINIFIED_SUFFIXES) and self.skip_generated:
+            return 'minified'
+        limit = self.max_spec_size if file_path.suffix.lower() in SPEC_EXTENSIONS else self.max_file_size
+        try:
+            if limit and file_path.stat().st_size > limit:
+                return 'too-large'
+        except OSError:
+            pass
+        return None
+
+    def admit_dir(self, rel_dir: str) -> bool:
+        reason = self.ignore_reason(rel_dir, True)
+        if reason:
+            self.skipped[f'{reason}-dir'] += 1
+        return reason is None
+
+    def admit_file(self, file_path: Path, rel_path: str) -> bool:
+        """Path rules for a file whose directories were already admitted"""
+        reason = self.ignore_reason(rel_path, False) or self.size_reason(file_path)
+        if reason:
+            self.skipped[reason] += 1
+        return reason is None
+
+    def path_reason(self, file_path: Path) -> Optional[str]:
+        """Path rules for a single file, directories included (watch/--since)"""
+        try:
+            parts = file_path.relative_to(self.project_path).parts
+        except ValueError:
+            return None
+        for depth in range(1, len(parts)):
+            reason = self.ignore_reason('/'.join(parts[:depth]), True)
+            if reason:
+                return reason
+        return self.ignore_reason('/'.join(parts), False) or self.size_reason(file_path)
+
+
+def iter_source_files(project_path: Path, admission: Optional[FileAdmission] = None) -> Iterator[Path]:
+    """Yield scannable files in os.walk order, skipping ignored directories"""
     for root, dirs, files in os.walk(project_path):
         # Filter out ignored directories
         dirs[:] = [d for d in dirs if not should_skip_dir(d)]
 
+        rel_root = os.path.relpath(root, project_path).replace(os.sep, '/')
+        prefix = '' if rel_root == '.' else rel_root + '/'
+        if admission is not None:
+            dirs[:] = [d for d in dirs if admission.admit_dir(prefix + d)]
+
         for file in files:
             file_path = Path(root) / file
-            suffix = file_path.suffix.lower()
+            if file_path.suffix.lower() in SCAN_EXTENSIONS:
+                if admission is None or admission.admit_file(file_path, prefix + file):
+                    yield file_path
 
-            if suffix not in FRONTEND_EXTENSIONS | BACKEND_EXTENSIONS | SPEC_EXTENSIONS:
-                continue
 
-            try:
-                content = file_path.read_text(encoding='utf-8')
-            except (UnicodeDecodeError, PermissionError):
-                continue
+def scan_content(file_path: Path, content, profile: Optional[ScanProfile] = None) -> list[APICall]:
+    """Run every applicable finder on already-loaded file content.
 
-            # Check frontend patterns
-            if suffix in FRONTEND_EXTENSIONS:
-                all_apis.extend(find_frontend_apis(file_path, content))
+    content is a str, or bytes/mmap for code files: the finders then run
+    their bytes patterns in place and decode only the matched spans.
+    """
+    suffix = file_path.suffix.lower()
+    apis = []
+    timer = profile.timer(apis) if profile is not None else NO_TIMER
+    # Shared by all finders so newlines are indexed at most once per file
+    lines = LineIndex(content)
+
+    frontend = suffix in FRONTEND_EXTENSIONS
+    backend = suffix in BACKEND_EXTENSIONS
+    if frontend or backend:
+        # Literal prefilter
+        if isinstance(content, (str, bytes)):
+            lowered = content.lower()
+            frontend = frontend and may_have_frontend_apis(content, lowered)
+            backend = backend and (is_nextjs_route(file_path) or may_have_backend_apis(content, lowered))
+        else:
+            frontend = frontend and FRONTEND_PREFILTER_RE.search(content) is not None
+            backend = backend and (is_nextjs_route(file_path) or BACKEND_PREFILTER_RE.search(content) is not None)
+        timer.lap('prefilter')
+    if frontend or backend:
+        # One anchor scan shared by both finders
+        anchors = None
+        if frontend and backend:
+            anchors = scan_anchors(content, tuple(ANCHOR_TOKENS))
+        elif frontend:
+            anchors = scan_anchors(content, FRONTEND_ANCHORS)
+        elif backend:
+            anchors = scan_anchors(content, BACKEND_ANCHORS)
+        timer.lap('anchors')
+
+        # Check frontend patterns
+        if frontend:
+            apis.extend(find_frontend_apis(file_path, content, lines, anchors, profile))
+
+        # Check backend patterns
+        if backend:
+            apis.extend(find_backend_apis(file_path, content, lines, anchors, profile))
+        # The finders charged their own families
+        timer = profile.timer(apis) if profile is not None else NO_TIMER
+
+    # Check OpenAPI specs
+    if suffix in SPEC_EXTENSIONS and isinstance(content, str):
+        apis.extend(find_openapi_specs(file_path, content))
+        timer.lap('openapi')
 
-            # Check backend patterns
-            if suffix in BACKEND_EXTENSIONS:
-                all_apis.extend(find_backend_apis(file_path, content))
+    return apis
 
-            # Check OpenAPI specs
-            if suffix in SPEC_EXTENSIONS:
-                all_apis.extend(find_openapi_specs(file_path, content))
 
-    # Deduplicate
-    seen = set()
-    unique_apis = []
-    for api in all_apis:
-        key = (api.type, api.method, api.path, api.file, api.line)
-        if key not in seen:
-            seen.add(key)
-            unique_apis.append(api)
+def scan_file(file_path: Path, skip_generated: bool = False, skipped: Optional[Counter] = None,
+              use_mmap: bool = False, profile: Optional[ScanProfile] = None) -> list[APICall]:
+    """Run every applicable finder on a single file"""
+    start = time.perf_counter()
+    try:
+        with open_source(file_path, skip_generated, use_mmap) as (data, reason):
+            if reason:
+                if skipped is not None:
+                    skipped[reason] += 1
+                return []
+            size = len(data)
+            content = source_content(file_path, data, use_mmap)
+            if profile is not None:
+                profile.seconds['read'] += time.perf_counter() - start
+            apis = scan_content(file_path, content, profile)
+    except (UnicodeDecodeError, OSError, ValueError):
+        if profile is not None:
+            profile.files['unreadable'] += 1
+        return []
+
+    if profile is not None:
+        profile.record_file(str(file_path), time.perf_counter() - start, size, len(apis))
+    return apis
+
 
-    return unique_apis
+def scan_file_batch(file_paths: list[str], skip_generated: bool = False, use_mmap: bool = False,
+                    profile_top: Optional[int] = None) -> tuple[list[APICall], Counter, Optional[ScanProfile]]:
+    """Scan a chunk of files (runs inside a worker process): (apis, skips by
+    reason, batch profile when profile_top is set)"""
+    apis = []
+    skipped = Counter()
+    profile = ScanProfile(profile_top) if profile_top is not None else None
+    for file_path in file_paths:
+        apis.extend(scan_file(Path(file_path), skip_generated, skipped, use_mmap, profile))
+    return apis, skipped, profile
 
 
-def format_markdown(apis: list[APICall], project_path: str) -> str:
-    """Format API list as markdown"""
-    frontend = [a for a in apis if a.type == 'frontend']
-    backend = [a for a in apis if a.type == 'backend']
-    specs = [a for a in apis if a.type == 'spec']
+def content_digest(raw: bytes) -> str:
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
 
-    output = f"# API Discovery Report\n\n"
-    output += f"**Project:** `{project_path}`\n"
-    output += f"**Total APIs Found:** {len(apis)}\n"
-    output += f"- Frontend Calls: {len(frontend)}\n"
-    output += f"- Backend Endpoints: {len(backend)}\n"
-    output += f"- OpenAPI Specs: {len(specs)}\n\n"
+
+def scan_file_entry(file_path: str, skip_generated: bool = False, use_mmap: bool = False,
+                    profile: Optional[ScanProfile] = None) -> Optional[tuple]:
+    """Scan one file for the cache: (mtime_ns, size, digest, apis, skip_reason)
+    or None if unreadable. Skipped files have no digest and no APIs."""
+    path = Path(file_path)
+    start = time.perf_counter()
+    try:
+        st = path.stat()
+        with open_source(path, skip_generated, use_mmap) as (data, reason):
+            if reason:
+                return st.st_mtime_ns, st.st_size, None, [], reason
+            digest = content_digest(data)
+            try:
+                content = source_content(path, data, use_mmap)
+            except UnicodeDecodeError:
+                content = None
+            if profile is not None:
+                profile.seconds['read'] += time.perf_counter() - start
+            apis = scan_content(path, content, profile) if content is not None else []
+    except (OSError, ValueError):
+        if profile is not None:
+            profile.files['unreadable'] += 1
+        return None
+
+    if profile is not None:
+        if content is None:
+            profile.files['unreadable'] += 1
+        else:
+            profile.record_file(file_path, time.perf_counter() - start, st.st_size, len(apis))
+    return st.st_mtime_ns, st.st_size, digest, apis, None
+
+
+def scan_file_entry_batch(file_paths: list[str], skip_generated: bool = False, use_mmap: bool = False,
+                          profile_top: Optional[int] = None) -> tuple[list[Optional[tuple]], Optional[ScanProfile]]:
+    profile = ScanProfile(profile_top) if profile_top is not None else None
+    return [scan_file_entry(file_path, skip_generated, use_mmap, profile) for file_path in file_paths], profile
+
+
+class ScanCache:
+    """On-disk cache of per-file APICall results.
+
+    Entries are keyed by file path and validated by mtime/size; when those
+    changed the content hash decides whether the old results still apply.
+    The whole cache is dropped when the fingerprint (format version plus
+    a hash of this script, i.e. the pattern set) changes.
+    """
+
+    def __init__(self, cache_file: Path, options: str = ''):
+        self.cache_file = cache_file
+        # Options that change per-file results (e.g. skipping generated code)
+        self.fingerprint = self.compute_fingerprint(options)
+        self.files = {}
+        # "<blob oid> <file path>" -> encoded APIs of that file at a git revision
+        self.blobs = {}
+        # File path -> [mtime_ns, size, symbols] for the instance index
+        self.symbols = {}
+        self.dirty = False
+        self.hits = 0
+        self.misses = 0
+        self.load()
+
+    @staticmethod
+    def compute_fingerprint(options: str = '') -> str:
+        source = Path(__file__).read_bytes()
+        return f"{CACHE_FORMAT_VERSION}:{hashlib.sha256(source).hexdigest()}:{options}"
+
+    @staticmethod
+    def default_path(project_path: Path) -> Path:
+        cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+        project_key = hashlib.sha1(str(project_path).encode('utf-8')).hexdigest()[:16]
+        return Path(cache_home) / 'prompt-inspector' / f'apis-{project_key}.json'
+
+    def load(self):
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('fingerprint') == self.fingerprint:
+            self.files = data.get('files', {})
+            self.blobs = data.get('blobs', {})
+            self.symbols = data.get('symbols', {})
+
+    def save(self):
+        if not self.dirty:
+            return
+        tmp_file = self.cache_file.with_name(f'{self.cache_file.name}.{os.getpid()}.tmp')
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            # json.dumps uses the C encoder; json.dump to a file does not
+            payload = json.dumps({'fingerprint': self.fingerprint, 'files': self.files, 'blobs': self.blobs,
+                                  'symbols': self.symbols}, separators=(',', ':'))
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                f.write(payload)
+            os.replace(tmp_file, self.cache_file)
+            self.dirty = False
+        except OSError:
+            # An unwritable cache directory only costs the next run its head start
+            try:
+                os.unlink(tmp_file)
+            except OSError:
+                pass
+
+    @staticmethod
+    def encode_apis(apis: list[APICall]) -> list[list]:
+        return [[a.type, a.method, a.path, a.line, a.library, a.instance_name, a.function_name] for a in apis]
+
+    @staticmethod
+    def decode_apis(file_path: str, rows: list[list]) -> list[APICall]:
+        return [
+            APICall(type=t, method=m, path=p, file=file_path, line=line, library=lib,
+                    instance_name=inst, function_name=func)
+            for t, m, p, line, lib, inst, func in rows
+        ]
+
+    def lookup(self, file_path: str) -> Optional[list[APICall]]:
+        """Cached results if the file is unchanged, otherwise None"""
+        entry = self.files.get(file_path)
+        if entry is None:
+            return None
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return None
+        if entry['mtime_ns'] != st.st_mtime_ns or entry['size'] != st.st_size:
+            if entry['digest'] is None:
+                # Skipped without reading it all, so there is no hash to compare
+                return None
+            # Touched or rewritten: only rescan when the content really changed
+            try:
+                digest = content_digest(Path(file_path).read_bytes())
+            except OSError:
+                return None
+            if digest != entry['digest']:
+                return None
+            entry['mtime_ns'] = st.st_mtime_ns
+            entry['size'] = st.st_size
+            self.dirty = True
+        return self.decode_apis(file_path, entry['apis'])
+
+    def store(self, file_path: str, scanned: tuple):
+        mtime_ns, size, digest, apis, skip_reason = scanned
+        self.files[file_path] = {
+            'mtime_ns': mtime_ns,
+            'size': size,
+            'digest': digest,
+            'apis': self.encode_apis(apis),
+        }
+        if skip_reason:
+            self.files[file_path]['skipped'] = skip_reason
+        self.dirty = True
+
+    def skip_reason(self, file_path: str) -> Optional[str]:
+        """Why a cached file was skipped (after a successful lookup)"""
+        return self.files[file_path].get('skipped')
+
+    def lookup_symbols(self, file_path: str) -> Optional[list]:
+        """Cached [mtime_ns, size, symbols] if the file is unchanged, otherwise None"""
+        entry = self.symbols.get(file_path)
+        if entry is None:
+            return None
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return None
+        if entry[0] != st.st_mtime_ns or entry[1] != st.st_size:
+            return None
+        return entry
+
+    def store_symbols(self, file_path: str, entry: tuple):
+        self.symbols[file_path] = list(entry)
+        self.dirty = True
+
+    def prune(self, live_paths: list[str]):
+        """Forget files that no longer exist in the scan"""
+        live = set(live_paths)
+        if len(live) != len(self.files) or any(path not in live for path in self.files):
+            self.files = {path: entry for path, entry in self.files.items() if path in live}
+            self.dirty = True
+        if any(path not in live for path in self.symbols):
+            self.symbols = {path: entry for path, entry in self.symbols.items() if path in live}
+            self.dirty = True
+
+    def retain_blobs(self, keys: set[str]):
+        """Keep only the base-revision results used by the last --since run"""
+        if set(self.blobs) - keys:
+            self.blobs = {key: rows for key, rows in self.blobs.items() if key in keys}
+            self.dirty = True
+
+
+def is_module_file(file_path: str) -> bool:
+    return os.path.splitext(file_path)[1].lower() in FRONTEND_EXTENSIONS
+
+
+def read_symbols(file_path: str, skip_generated: bool = False) -> Optional[tuple]:
+    """(mtime_ns, size, symbols) of one module, or None if unreadable"""
+    # Called for every module before the scan: plain open() rather than
+    # Path/open_source, which cost as much as the read for small files
+    try:
+        with open(file_path, 'rb') as f:
+            st = os.fstat(f.fileno())
+            data = f.read(ADMISSION_HEAD_BYTES)
+            if skip_generated and content_skip_reason(file_path, data):
+                return st.st_mtime_ns, st.st_size, None
+            data += f.read()
+    except OSError:
+        return None
+    symbols = None
+    if b'import' in data or b'export' in data or b'require' in data:
+        symbols = extract_symbols(data.decode('utf-8', errors='replace'))
+    return st.st_mtime_ns, st.st_size, symbols
+
+
+def read_symbols_batch(file_paths: list[str], skip_generated: bool = False) -> list[Optional[tuple]]:
+    return [read_symbols(file_path, skip_generated) for file_path in file_paths]
+
+
+# Module specifier suffixes tried in order, as a bundler would
+MODULE_SUFFIXES = ('', '.ts', '.tsx', '.js', '.jsx', '.mjs',
+                   '/index.ts', '/index.tsx', '/index.js', '/index.jsx', '/index.mjs')
+# Finder labels that a resolved imported instance upgrades to custom-instance
+RELABELED_LIBRARIES = {'unknown', 'http-client'}
+
+
+class InstanceIndex:
+    """Project-wide index of HTTP client instances exported across modules.
+
+    Built from per-module symbol tables in a lightweight pass before the
+    scan. A call on a local name that resolves, through imports and
+    re-exports, to an instance declared in another module is labeled
+    custom-instance, like calls on instances declared in the same file.
+    Relative specifiers and the '@/' and '~/' root aliases (the project
+    root or src/) are followed; package imports are not.
+    """
+
+    def __init__(self, project_path: Path, symbols: dict[str, Optional[dict]]):
+        self.root = str(project_path)
+        # Every module file of the project, with or without symbols
+        self.symbols = symbols
+        self.exported = {}
+        self.resolving = set()
+        self.bound = {}
+
+    @classmethod
+    def build(cls, project_path: Path, file_paths: list[str], workers: int = 1, chunk_size: int = 64,
+              cache: Optional['ScanCache'] = None, skip_generated: bool = False) -> 'InstanceIndex':
+        symbols = {}
+        misses = []
+        for file_path in file_paths:
+            if not is_module_file(file_path):
+                continue
+            entry = cache.lookup_symbols(file_path) if cache is not None else None
+            if entry is None:
+                misses.append(file_path)
+            else:
+                symbols[file_path] = entry[2]
+
+        chunks = list(iter_chunks(misses, chunk_size))
+        read_batch = partial(read_symbols_batch, skip_generated=skip_generated)
+        for chunk, entries in zip(chunks, run_batches(read_batch, chunks, workers)):
+            for file_path, entry in zip(chunk, entries):
+                symbols[file_path] = entry[2] if entry is not None else None
+                if entry is not None and cache is not None:
+                    cache.store_symbols(file_path, entry)
+        return cls(project_path, symbols)
+
+    def update(self, file_path: str, symbols: Optional[dict], exists: bool = True) -> bool:
+        """Replace (or, when not exists, drop) one module; True if anything changed"""
+        if exists:
+            if file_path in self.symbols and self.symbols[file_path] == symbols:
+                return False
+            self.symbols[file_path] = symbols
+        elif self.symbols.pop(file_path, False) is False:
+            return False
+        self.exported.clear()
+        self.bound.clear()
+        return True
+
+    def resolve_module(self, from_file: str, spec: str) -> Optional[str]:
+        if spec.startswith('.'):
+            bases = [os.path.normpath(os.path.join(os.path.dirname(from_file), spec))]
+        elif spec.startswith(('@/', '~/')):
+            bases = [os.path.join(self.root, spec[2:]), os.path.join(self.root, 'src', spec[2:])]
+        else:
+            return None
+        for base in bases:
+            stem, ext = os.path.splitext(base)
+            if ext in {'.js', '.jsx', '.mjs'}:
+                # TypeScript ESM imports name the compiled .js file
+                bases.extend((stem + '.ts', stem + '.tsx'))
+            for suffix in MODULE_SUFFIXES:
+                if base + suffix in self.symbols:
+                    return base + suffix
+        return None
+
+    def exports_instance(self, file_path: Optional[str], name: str) -> bool:
+        """Whether the module exports name bound to an HTTP client instance"""
+        if file_path is None:
+            return False
+        key = (file_path, name)
+        if key in self.exported:
+            return self.exported[key]
+        if key in self.resolving:
+            # Import cycle
+            return False
+        self.resolving.add(key)
+        try:
+            result = self.lookup_export(file_path, name)
+        finally:
+            self.resolving.discard(key)
+        self.exported[key] = result
+        return result
+
+    def lookup_export(self, file_path: str, name: str) -> bool:
+        symbols = self.symbols.get(file_path) or {}
+        local = symbols.get('exports', {}).get(name)
+        if local is not None:
+            if local in symbols.get('instances', ()):
+                return True
+            imported = symbols.get('imports', {}).get(local)
+            return imported is not None and self.exports_instance(
+                self.resolve_module(file_path, imported[0]), imported[1])
+        for exported, spec, imported in symbols.get('reexports', ()):
+            if exported == name:
+                return self.exports_instance(self.resolve_module(file_path, spec), imported)
+            if exported == '*' and name != 'default':
+                if self.exports_instance(self.resolve_module(file_path, spec), name):
+                    return True
+        return False
+
+    def bindings(self, file_path: str) -> frozenset:
+        """Local names in a module that are imported client instances"""
+        names = self.bound.get(file_path)
+        if names is None:
+            imports = (self.symbols.get(file_path) or {}).get('imports', {})
+            names = frozenset(
+                local for local, (spec, imported) in imports.items()
+                if self.exports_instance(self.resolve_module(file_path, spec), imported)
+            )
+            self.bound[file_path] = names
+        return names
+
+    def classify(self, apis: Iterable[APICall]) -> Iterator[APICall]:
+        """Relabel calls on imported instances as custom-instance"""
+        for api in apis:
+            if (api.instance_name and api.library in RELABELED_LIBRARIES
+                    and api.instance_name in self.bindings(api.file)):
+                api = replace(api, library='custom-instance')
+            yield api
+
+
+def iter_chunks(items: Iterable, size: int) -> Iterator[list]:
+    """Group an iterable into lists of at most size items"""
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run_batches(func, chunks: Iterable[list], workers: int) -> Iterator:
+    """Apply a batch function to each chunk, serially or in a process pool.
+
+    Yields one result per chunk, in chunk order, as soon as it is ready.
+    The pool keeps at most two chunks per worker in flight so the walk
+    never runs far ahead of the consumer; it is only started when there
+    is more than one chunk.
+    """
+    chunks = iter(chunks)
+    first = next(chunks, None)
+    if first is None:
+        return
+    second = next(chunks, None)
+    if workers <= 1 or second is None:
+        yield func(first)
+        if second is not None:
+            yield func(second)
+            for chunk in chunks:
+                yield func(chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chain((first, second), chunks):
+            pending.append(pool.submit(func, chunk))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def iter_scan(project_path: Path, workers: int = 1, chunk_size: int = 64,
+              cache: Optional[ScanCache] = None, admission: Optional[FileAdmission] = None,
+              use_mmap: bool = False, profile: Optional[ScanProfile] = None,
+              file_paths: Optional[Iterable[str]] = None) -> Iterator[APICall]:
+    """Yield raw finder hits file by file in walk order (before dedup)
+
+    file_paths is the result of an earlier walk; by default the project
+    is walked while scanning.
+    """
+    if file_paths is None:
+        file_paths = (str(f) for f in iter_source_files(project_path, admission))
+    skip_generated = admission is not None and admission.skip_generated
+    skipped = admission.skipped if admission is not None else Counter()
+    profile_top = profile.top if profile is not None else None
+
+    if cache is None:
+        scan_batch = partial(scan_file_batch, skip_generated=skip_generated, use_mmap=use_mmap,
+                             profile_top=profile_top)
+        for apis, batch_skipped, batch_profile in run_batches(scan_batch, iter_chunks(file_paths, chunk_size), workers):
+            skipped.update(batch_skipped)
+            if profile is not None:
+                profile.merge(batch_profile)
+            yield from apis
+        return
+
+    live_paths = []
+    # (chunk, hits) for every chunk handed to run_batches, in order
+    pending = deque()
+
+    def miss_chunks():
+        for chunk in iter_chunks(file_paths, chunk_size):
+            live_paths.extend(chunk)
+            hits = {}
+            misses = []
+            for file_path in chunk:
+                cached = cache.lookup(file_path)
+                if cached is None:
+                    misses.append(file_path)
+                else:
+                    hits[file_path] = cached
+                    reason = cache.skip_reason(file_path)
+                    if reason:
+                        skipped[reason] += 1
+            cache.hits += len(hits)
+            cache.misses += len(misses)
+            pending.append((chunk, hits))
+            yield misses
+
+    completed = False
+    try:
+        scan_batch = partial(scan_file_entry_batch, skip_generated=skip_generated, use_mmap=use_mmap,
+                             profile_top=profile_top)
+        for batch, batch_profile in run_batches(scan_batch, miss_chunks(), workers):
+            chunk, hits = pending.popleft()
+            if profile is not None:
+                profile.merge(batch_profile)
+            scanned_entries = iter(batch)
+            for file_path in chunk:
+                if file_path in hits:
+                    yield from hits[file_path]
+                    continue
+                scanned = next(scanned_entries)
+                if scanned is None:
+                    continue
+                cache.store(file_path, scanned)
+                if scanned[4]:
+                    skipped[scanned[4]] += 1
+                yield from scanned[3]
+        completed = True
+    finally:
+        # Only a full walk knows which cached files are gone
+        if completed:
+            cache.prune(live_paths)
+        cache.save()
+
+
+def iter_unique_apis(apis: Iterable[APICall]) -> Iterator[APICall]:
+    """Drop repeated (type, method, path, file, line) hits, keeping first-seen order.
+
+    The key includes the file and hits arrive grouped by file, so only the
+    keys of the current file are remembered.
+    """
+    seen = set()
+    current_file = None
+    for api in apis:
+        if api.file != current_file:
+            current_file = api.file
+            seen.clear()
+        key = (api.type, api.method, api.path, api.file, api.line)
+        if key not in seen:
+            seen.add(key)
+            yield api
+
+
+def dedupe_apis(apis: list[APICall]) -> list[APICall]:
+    """Drop repeated (type, method, path, file, line) hits, keeping first-seen order"""
+    return list(iter_unique_apis(apis))
+
+
+def iter_apis(project_path: Path, workers: int = 1, chunk_size: int = 64,
+              cache: Optional[ScanCache] = None, admission: Optional[FileAdmission] = None,
+              use_mmap: bool = False, profile: Optional[ScanProfile] = None,
+              resolve_instances: bool = True) -> Iterator[APICall]:
+    """Stream deduplicated API calls and endpoints as files are scanned.
+
+    With resolve_instances the walk and the InstanceIndex pass come first,
+    so calls on client instances imported from other modules are labeled.
+    """
+    if not resolve_instances:
+        yield from iter_unique_apis(iter_scan(project_path, workers, chunk_size, cache, admission, use_mmap, profile))
+        return
+
+    file_paths = [str(f) for f in iter_source_files(project_path, admission)]
+    start = time.perf_counter()
+    skip_generated = admission is not None and admission.skip_generated
+    index = InstanceIndex.build(project_path, file_paths, workers, chunk_size, cache, skip_generated)
+    if profile is not None:
+        profile.seconds['instance-index'] += time.perf_counter() - start
+    apis = iter_scan(project_path, workers, chunk_size, cache, admission, use_mmap, profile, file_paths)
+    yield from index.classify(iter_unique_apis(apis))
+
+
+def scan_directory(project_path: Path, workers: int = 1, chunk_size: int = 64,
+                   cache: Optional[ScanCache] = None, admission: Optional[FileAdmission] = None,
+                   use_mmap: bool = False, profile: Optional[ScanProfile] = None,
+                   resolve_instances: bool = True) -> list[APICall]:
+    """Scan a directory for all API calls and endpoints
+
+    With workers > 1 files are scanned in chunks by a process pool. Chunk
+    results are merged in walk order, so the output is identical to a
+    serial scan. With a cache only new or changed files are scanned. With
+    an admission policy ignored, oversized, minified and generated files
+    are skipped (counted in admission.skipped). With use_mmap code files
+    are scanned as mapped bytes instead of decoded text. With a profile
+    per-family timings and the slowest files are recorded in it. With
+    resolve_instances calls on imported client instances are labeled
+    custom-instance (see InstanceIndex).
+    """
+    return list(iter_apis(project_path, workers, chunk_size, cache, admission, use_mmap, profile,
+                          resolve_instances))
+
+
+class RelPaths(dict):
+    """file -> path relative to the project, computed once per file"""
+
+    def __init__(self, project_path: str):
+        super().__init__()
+        self.project_path = project_path
+
+    def __missing__(self, file_path: str) -> str:
+        rel_path = self[file_path] = os.path.relpath(file_path, self.project_path)
+        return rel_path
+
+
+def write_markdown(apis: Iterable[APICall], project_path: str, out: TextIO):
+    """Write the API list as markdown to out, one row at a time"""
+    # One sort serves every section: partitioning keeps the (path, method)
+    # order, and a stable re-sort by file alone gives specs (file, path, method)
+    frontend = []
+    backend = []
+    specs = []
+    sections = {'frontend': frontend, 'backend': backend, 'spec': specs}
+    for api in sorted(apis, key=attrgetter('path', 'method')):
+        section = sections.get(api.type)
+        if section is not None:
+            section.append(api)
+    specs.sort(key=attrgetter('file'))
+    total = len(frontend) + len(backend) + len(specs)
+    rel_paths = RelPaths(project_path)
+    write = out.write
+
+    write("# API Discovery Report\n\n")
+    write(f"**Project:** `{project_path}`\n")
+    write(f"**Total APIs Found:** {total}\n")
+    write(f"- Frontend Calls: {len(frontend)}\n")
+    write(f"- Backend Endpoints: {len(backend)}\n")
+    write(f"- OpenAPI Specs: {len(specs)}\n\n")
 
     if specs:
-        output += "## OpenAPI Specifications\n\n"
-        output += "| Method | Path | Summary | File |\n"
-        output += "|--------|------|---------|------|\n"
-        for api in sorted(specs, key=lambda x: (x.file, x.path, x.method)):
-            rel_path = os.path.relpath(api.file, project_path)
+        write("## OpenAPI Specifications\n\n")
+        write("| Method | Path | Summary | File |\n")
+        write("|--------|------|---------|------|\n")
+        for api in specs:
             summary = api.function_name or '-'
-            output += f"| `{api.method}` | `{api.path}` | {summary} | `{rel_path}` |\n"
-        output += "\n"
+            write(f"| `{api.method}` | `{api.path}` | {summary} | `{rel_paths[api.file]}` |\n")
+        write("\n")
 
     if backend:
-        output += "## Backend Endpoints\n\n"
-        output += "| Method | Path | Library | File | Line |\n"
-        output += "|--------|------|---------|------|------|\n"
-        for api in sorted(backend, key=lambda x: (x.path, x.method)):
-            rel_path = os.path.relpath(api.file, project_path)
-            output += f"| `{api.method}` | `{api.path}` | {api.library} | `{rel_path}` | {api.line} |\n"
-        output += "\n"
+        write("## Backend Endpoints\n\n")
+        write("| Method | Path | Library | File | Line |\n")
+        write("|--------|------|---------|------|------|\n")
+        for api in backend:
+            write(f"| `{api.method}` | `{api.path}` | {api.library} | `{rel_paths[api.file]}` | {api.line} |\n")
+        write("\n")
 
     if frontend:
-        output += "## Frontend API Calls\n\n"
-        output += "| Method | Path | Library | Instance | File | Line |\n"
-        output += "|--------|------|---------|----------|------|------|\n"
-        for api in sorted(frontend, key=lambda x: (x.path, x.method)):
-            rel_path = os.path.relpath(api.file, project_path)
+        write("## Frontend API Calls\n\n")
+        write("| Method | Path | Library | Instance | File | Line |\n")
+        write("|--------|------|---------|----------|------|------|\n")
+        for api in frontend:
             instance = api.instance_name or '-'
-            output += f"| `{api.method}` | `{api.path}` | {api.library} | {instance} | `{rel_path}` | {api.line} |\n"
+            write(f"| `{api.method}` | `{api.path}` | {api.library} | {instance} | "
+                  f"`{rel_paths[api.file]}` | {api.line} |\n")
 
-    return output
+
+def format_markdown(apis: Iterable[APICall], project_path: str) -> str:
+    """Format API list as markdown"""
+    out = io.StringIO()
+    write_markdown(apis, project_path, out)
+    return out.getvalue()
 
 
 def format_json_for_inspector(apis: list[APICall]) -> list[dict]:
@@ -461,15 +2183,15 @@ def format_json_for_inspector(apis: list[APICall]) -> list[dict]:
     seen_paths = set()
 
     for api in apis:
-        # Create unique ID
-        api_id = f"{api.method}_{api.path}".replace('/', '_').replace('{', '').replace('}', '')
-
         # Skip duplicates (same method + path)
         key = (api.method, api.path)
         if key in seen_paths:
             continue
         seen_paths.add(key)
 
+        # Create unique ID
+        api_id = f"{api.method}_{api.path}".replace('/', '_').replace('{', '').replace('}', '')
+
         result.append({
             'id': api_id,
             'method': api.method,
@@ -480,11 +2202,1040 @@ def format_json_for_inspector(apis: list[APICall]) -> list[dict]:
     return result
 
 
+# Route matching (--coverage): frontend calls are bound to backend and spec
+# endpoints through canonical path templates. Parameters in any spelling
+# (${id}, {id}, :id, [id], <id>) become PARAM_SEGMENT and catch-alls
+# ([...slug] / {...slug}, {p:path}, <path:p>, *, :p*) become REST_SEGMENT.
+PARAM_SEGMENT = '{}'
+REST_SEGMENT = '{*}'
+TEMPLATE_EXPR_RE = re.compile(r'\$\{[^}]*\}')
+URL_ORIGIN_RE = re.compile(r'^(?:[a-zA-Z][\w+.-]*:)?//[^/]*')
+REST_PARAM_RE = re.compile(r'\*|:[\w$]+[*+]|\{+\.\.\.|\[+\.\.\.|\{[^}]*:path\}|<path:')
+PARAM_RE = re.compile(r'\x00|\{[^}]*\}|^:[\w$]|^\[[^\]]+\]$|^<[^>]+>$')
+
+
+@lru_cache(maxsize=1 << 16)
+def route_template(path: str) -> tuple[str, ...]:
+    """Canonical segments of an API path or URL: origin, query and fragment
+    dropped, each parameter segment replaced by PARAM_SEGMENT (memoized:
+    the same few paths are called from many places)"""
+    # Template expressions may contain '/', '?' or '#' themselves
+    path = TEMPLATE_EXPR_RE.sub('\x00', path)
+    path = URL_ORIGIN_RE.sub('', path)
+    path = path.split('?', 1)[0].split('#', 1)[0]
+    segments = path.split('/')
+    # `${baseUrl}/users`: a leading expression is a base URL, not a parameter
+    if len(segments) > 1 and '\x00' in segments[0]:
+        segments = segments[1:]
+
+    template = []
+    for segment in segments:
+        if not segment:
+            continue
+        if REST_PARAM_RE.match(segment):
+            template.append(REST_SEGMENT)
+            break
+        template.append(PARAM_SEGMENT if PARAM_RE.search(segment) else segment)
+    return tuple(template)
+
+
+@dataclass
+class Route:
+    """An endpoint (method + canonical path) with the APIs bound to it"""
+    __slots__ = ('method', 'template', 'endpoints', 'calls')
+    method: str
+    template: tuple
+    endpoints: list  # backend and spec APICalls
+    calls: list  # (frontend APICall, 'exact' | 'suffix')
+
+    @property
+    def path(self) -> str:
+        return '/' + '/'.join(self.template)
+
+    @property
+    def anchored(self) -> bool:
+        """Has a literal segment, so it can take suffix matches"""
+        return any(segment not in (PARAM_SEGMENT, REST_SEGMENT) for segment in self.template)
+
+
+class RouteNode:
+    __slots__ = ('literals', 'param', 'rest', 'routes')
+
+    def __init__(self):
+        self.literals = {}
+        self.param = None
+        self.rest = None
+        self.routes = None  # method -> Route
+
+
+class RouteTrie:
+    """Endpoints indexed by canonical path segment.
+
+    A lookup follows the trie one segment at a time (literal child first,
+    then parameter, then catch-all), so binding a call costs O(segments)
+    however many routes there are and no call is compared to every route."""
+
+    def __init__(self):
+        self.root = RouteNode()
+        self.routes = []
+
+    def add(self, api: APICall):
+        template = route_template(api.path)
+        node = self.root
+        for segment in template:
+            if segment == PARAM_SEGMENT:
+                if node.param is None:
+                    node.param = RouteNode()
+                node = node.param
+            elif segment == REST_SEGMENT:
+                if node.rest is None:
+                    node.rest = RouteNode()
+                node = node.rest
+            else:
+                child = node.literals.get(segment)
+                if child is None:
+                    child = node.literals[segment] = RouteNode()
+                node = child
+        if node.routes is None:
+            node.routes = {}
+        method = api.method.upper()
+        route = node.routes.get(method)
+        if route is None:
+            route = node.routes[method] = Route(method, template, [], [])
+            self.routes.append(route)
+        route.endpoints.append(api)
+
+    def walk(self, node: RouteNode, template: tuple, pos: int) -> Iterator[dict]:
+        """routes dicts of the nodes matching template[pos:], most specific first"""
+        if pos == len(template):
+            if node.routes:
+                yield node.routes
+            return
+        segment = template[pos]
+        if segment not in (PARAM_SEGMENT, REST_SEGMENT):
+            child = node.literals.get(segment)
+            if child is not None:
+                yield from self.walk(child, template, pos + 1)
+        if node.param is not None and segment != REST_SEGMENT:
+            yield from self.walk(node.param, template, pos + 1)
+        if node.rest is not None and node.rest.routes:
+            yield node.rest.routes
+
+    def match(self, api: APICall) -> tuple[Optional[Route], Optional[str], list[str]]:
+        """(route, 'exact' | 'suffix', []) for a call, or (None, None, methods
+        the path does serve). A call that matches nothing as a whole is
+        retried without its leading segments, for routers mounted under a
+        prefix (app.use('/api', router)); such matches need a route with a
+        literal segment, and a route without one only takes calls of the
+        same template."""
+        template = route_template(api.path)
+        method = api.method.upper()
+        methods = []
+        for start in range(max(1, len(template))):
+            for routes in self.walk(self.root, template, start):
+                # A route of parameters only ('/:id') says nothing about
+                # the path: it only takes calls with the same template
+                sample = next(iter(routes.values()))
+                if not sample.anchored and (start or sample.template != template):
+                    continue
+                route = routes.get(method)
+                if route is not None:
+                    return route, 'suffix' if start else 'exact', []
+                if not start and not methods:
+                    methods = sorted(routes)
+        return None, None, methods
+
+
+def bind_routes(apis: Iterable[APICall]) -> tuple[RouteTrie, list[tuple]]:
+    """Index the backend/spec endpoints among apis and match every frontend
+    call against them: (trie, [(call, route or None, kind, served methods)]).
+    Matched calls are also recorded on their Route."""
+    trie = RouteTrie()
+    calls = []
+    declared = set()
+    for api in apis:
+        if api.type == 'frontend':
+            calls.append(api)
+        else:
+            trie.add(api)
+            declared.add((api.file, api.line))
+    # router.get('/users', ...) is also seen as a call on a "router" instance:
+    # a route declaration would otherwise count as calling itself
+    calls = [api for api in calls if (api.file, api.line) not in declared]
+
+    bindings = []
+    for api in calls:
+        route, kind, methods = trie.match(api)
+        if route is not None:
+            route.calls.append((api, kind))
+        bindings.append((api, route, kind, methods))
+    return trie, bindings
+
+
+def route_coverage(apis: Iterable[APICall], profile: Optional[ScanProfile] = None) -> dict:
+    """Bind frontend calls to backend/spec endpoints: matched routes,
+    frontend-only calls (nothing serves them) and backend-only endpoints
+    (nothing calls them)"""
+    start = time.perf_counter()
+    trie, bindings = bind_routes(apis)
+    frontend_only = [(api, methods) for api, route, _, methods in bindings if route is None]
+    suffix_matches = sum(kind == 'suffix' for _, _, kind, _ in bindings)
+
+    def route_entry(route: Route) -> dict:
+        return {
+            'method': route.method,
+            'route': route.path,
+            'endpoints': [{'type': api.type, 'path': api.path, 'file': api.file, 'line': api.line,
+                           'library': api.library} for api in route.endpoints],
+            'calls': [{'path': api.path, 'file': api.file, 'line': api.line, 'match': kind}
+                      for api, kind in route.calls],
+        }
+
+    routes = sorted(trie.routes, key=lambda route: (route.path, route.method))
+    matched = [route_entry(route) for route in routes if route.calls]
+    backend_only = [route_entry(route) for route in routes if not route.calls]
+    unbound = []
+    for api, methods in frontend_only:
+        entry = {'method': api.method, 'path': api.path, 'file': api.file, 'line': api.line,
+                 'library': api.library}
+        if methods:
+            entry['routeMethods'] = methods
+        unbound.append(entry)
+
+    if profile is not None:
+        profile.seconds['route-match'] += time.perf_counter() - start
+        profile.matches['route-match'] += len(bindings) - len(frontend_only)
+    return {
+        'summary': {
+            'calls': len(bindings),
+            'matchedCalls': len(bindings) - len(frontend_only),
+            'suffixMatchedCalls': suffix_matches,
+            'frontendOnlyCalls': len(frontend_only),
+            'endpoints': len(routes),
+            'matchedEndpoints': len(matched),
+            'backendOnlyEndpoints': len(backend_only),
+        },
+        'matched': matched,
+        'frontendOnly': unbound,
+        'backendOnly': backend_only,
+    }
+
+
+def format_coverage_markdown(report: dict, project_path: str) -> str:
+    """Format a route coverage report as markdown"""
+    summary = report['summary']
+    output = "# API Coverage Report\n\n"
+    output += f"**Project:** `{project_path}`\n"
+    output += f"**Frontend Calls:** {summary['calls']}\n"
+    output += f"- Matched: {summary['matchedCalls']} ({summary['suffixMatchedCalls']} by path suffix)\n"
+    output += f"- Frontend Only: {summary['frontendOnlyCalls']}\n\n"
+    output += f"**Endpoints:** {summary['endpoints']}\n"
+    output += f"- Called: {summary['matchedEndpoints']}\n"
+    output += f"- Backend Only: {summary['backendOnlyEndpoints']}\n"
+
+    if report['frontendOnly']:
+        output += "\n## Frontend-only Calls\n\n"
+        output += "| Method | Path | Served Methods | File | Line |\n"
+        output += "|--------|------|----------------|------|------|\n"
+        for call in report['frontendOnly']:
+            rel_path = os.path.relpath(call['file'], project_path)
+            served = ', '.join(call.get('routeMethods', [])) or '-'
+            output += f"| `{call['method']}` | `{call['path']}` | {served} | `{rel_path}` | {call['line']} |\n"
+
+    if report['backendOnly']:
+        output += "\n## Backend-only Endpoints\n\n"
+        output += "| Method | Route | Source | File | Line |\n"
+        output += "|--------|-------|--------|------|------|\n"
+        for route in report['backendOnly']:
+            for endpoint in route['endpoints']:
+                rel_path = os.path.relpath(endpoint['file'], project_path)
+                output += (f"| `{route['method']}` | `{route['route']}` | {endpoint['library']} | "
+                           f"`{rel_path}` | {endpoint['line']} |\n")
+
+    if report['matched']:
+        output += "\n## Matched Routes\n\n"
+        output += "| Method | Route | Calls | Endpoint Files |\n"
+        output += "|--------|-------|-------|----------------|\n"
+        for route in report['matched']:
+            files = ', '.join(f"`{os.path.relpath(endpoint['file'], project_path)}`"
+                              for endpoint in route['endpoints'])
+            output += f"| `{route['method']}` | `{route['route']}` | {len(route['calls'])} | {files} |\n"
+
+    return output
+
+
+# SQLite API catalog (--output sqlite): one row per discovered API, updated
+# in place by each rescan. route is the canonical template of an endpoint
+# and, on a call, of the endpoint it is bound to, so calls and endpoints
+# join on (route, method). WAL lets readers query while a rescan writes.
+CATALOG_SCHEMA_VERSION = 1
+CATALOG_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS apis (
+    id INTEGER PRIMARY KEY,
+    type TEXT NOT NULL,
+    method TEXT NOT NULL,
+    path TEXT NOT NULL,
+    file TEXT NOT NULL,
+    line INTEGER NOT NULL,
+    library TEXT NOT NULL,
+    instance_name TEXT,
+    function_name TEXT,
+    route TEXT,
+    binding TEXT,  -- calls: exact, suffix, declaration (an endpoint's own route) or NULL
+    scan INTEGER NOT NULL
+);
+-- The upsert key; it leads with file, so it is the per-file index too
+CREATE UNIQUE INDEX IF NOT EXISTS apis_key ON apis (file, line, type, method, path);
+CREATE INDEX IF NOT EXISTS apis_method ON apis (method);
+CREATE INDEX IF NOT EXISTS apis_path ON apis (path);
+CREATE INDEX IF NOT EXISTS apis_library ON apis (library);
+CREATE INDEX IF NOT EXISTS apis_route ON apis (route, method);
+CREATE VIEW IF NOT EXISTS unbound_calls AS
+    SELECT * FROM apis WHERE type = 'frontend' AND binding IS NULL;
+CREATE VIEW IF NOT EXISTS uncalled_endpoints AS
+    SELECT * FROM apis AS endpoint WHERE endpoint.type != 'frontend' AND NOT EXISTS (
+        SELECT 1 FROM apis AS call
+        WHERE call.route = endpoint.route AND call.method = endpoint.method AND call.type = 'frontend');
+"""
+CATALOG_DROP = """
+DROP VIEW IF EXISTS unbound_calls;
+DROP VIEW IF EXISTS uncalled_endpoints;
+DROP TABLE IF EXISTS apis;
+DROP TABLE IF EXISTS meta;
+"""
+CATALOG_UPSERT = """
+INSERT INTO apis (type, method, path, file, line, library, instance_name, function_name, route, binding, scan)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (file, line, type, method, path) DO UPDATE SET
+    library = excluded.library, instance_name = excluded.instance_name, function_name = excluded.function_name,
+    route = excluded.route, binding = excluded.binding, scan = excluded.scan
+"""
+
+
+def catalog_rows(apis: list[APICall], scan: int) -> Iterator[tuple]:
+    """apis as catalog rows, with every call bound to its endpoint's route"""
+    trie, bindings = bind_routes(apis)
+    routes = {id(api): route.path for route in trie.routes for api in route.endpoints}
+    calls = {id(call): (route.path if route is not None else None, kind) for call, route, kind, _ in bindings}
+    for api in apis:
+        if api.type != 'frontend':
+            route, binding = routes.get(id(api)), None
+        else:
+            # Calls left out of the binding are route declarations (router.get)
+            route, binding = calls.get(id(api), (None, 'declaration'))
+        yield (api.type, api.method, api.path, api.file, api.line, api.library, api.instance_name,
+               api.function_name, route, binding, scan)
+
+
+def write_catalog(apis: Iterable[APICall], project_path: Path, db_path: Path) -> dict:
+    """Upsert a full scan into the SQLite catalog at db_path in one
+    transaction. Unchanged APIs keep their row ids; rows the scan no longer
+    found are deleted. Raises ValueError for another project's catalog."""
+    apis = list(apis)
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        conn.execute('PRAGMA journal_mode = WAL')
+        conn.execute('PRAGMA synchronous = NORMAL')
+        if conn.execute('PRAGMA user_version').fetchone()[0] != CATALOG_SCHEMA_VERSION:
+            # Derived data: an older layout is simply rebuilt
+            conn.executescript(CATALOG_DROP + CATALOG_SCHEMA)
+            conn.execute(f'PRAGMA user_version = {CATALOG_SCHEMA_VERSION}')
+
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            meta = dict(conn.execute('SELECT key, value FROM meta'))
+            if meta.get('project', str(project_path)) != str(project_path):
+                raise ValueError(f"{db_path} is the API catalog of {meta['project']}")
+            scan = int(meta.get('scan', 0)) + 1
+            before = conn.execute('SELECT COUNT(*) FROM apis').fetchone()[0]
+            conn.executemany(CATALOG_UPSERT, catalog_rows(apis, scan))
+            added = conn.execute('SELECT COUNT(*) FROM apis').fetchone()[0] - before
+            removed = conn.execute('DELETE FROM apis WHERE scan != ?', (scan,)).rowcount
+            conn.executemany('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', [
+                ('project', str(project_path)), ('scan', str(scan)), ('scannedAt', str(int(time.time()))),
+            ])
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+    finally:
+        conn.close()
+    return {'catalog': str(db_path), 'scan': scan, 'apis': len(apis), 'added': added, 'removed': removed}
+
+
+def run_git(project_path: Path, *args: str, input_bytes: Optional[bytes] = None) -> bytes:
+    """Run git inside project_path; raises CalledProcessError on failure"""
+    return subprocess.run(['git', '-C', str(project_path), *args], input=input_bytes,
+                          capture_output=True, check=True).stdout
+
+
+def changed_files_since(project_path: Path, rev: str) -> list[str]:
+    """Project-relative paths that differ between rev and the working tree,
+    untracked (not ignored) files included"""
+    # --no-renames reports a rename as delete + add, so both sides get scanned
+    diff = run_git(project_path, 'diff', '--name-only', '--no-renames', '--relative', '-z', rev, '--')
+    untracked = run_git(project_path, 'ls-files', '--others', '--exclude-standard', '-z')
+    return sorted({os.fsdecode(name) for name in (diff + b'\0' + untracked).split(b'\0') if name})
+
+
+def read_blob_ids(project_path: Path, rev: str, rel_paths: list[str]) -> dict[str, str]:
+    """Blob oid of each path at rev (paths missing at rev are left out)"""
+    blob_ids = {}
+    for chunk in iter_chunks(rel_paths, 500):
+        listing = run_git(project_path, 'ls-tree', '-z', rev, '--', *chunk)
+        for record in listing.split(b'\0'):
+            if not record:
+                continue
+            meta, name = record.split(b'\t', 1)
+            _mode, kind, oid = meta.split()
+            if kind == b'blob':
+                blob_ids[os.fsdecode(name)] = oid.decode('ascii')
+    return blob_ids
+
+
+def read_blobs(project_path: Path, oids: list[str]) -> dict[str, bytes]:
+    """Contents of several blobs through a single git cat-file --batch"""
+    if not oids:
+        return {}
+    out = run_git(project_path, 'cat-file', '--batch', input_bytes=''.join(f'{oid}\n' for oid in oids).encode())
+    blobs = {}
+    offset = 0
+    for oid in oids:
+        header_end = out.index(b'\n', offset)
+        header = out[offset:header_end].split()
+        offset = header_end + 1
+        if len(header) < 3 or header[1] == b'missing':
+            continue
+        size = int(header[2])
+        blobs[oid] = out[offset:offset + size]
+        offset += size + 1
+    return blobs
+
+
+def base_revision_apis(project_path: Path, rev: str, rel_paths: list[str], cache: Optional[ScanCache] = None,
+                       skip_generated: bool = False, use_mmap: bool = False) -> dict[str, list[APICall]]:
+    """APIs of the given files as they were at rev, keyed by absolute file path.
+    Blobs go through the same read mode as working_tree_apis, so an
+    unchanged file gives the same APIs on both sides."""
+    blob_ids = read_blob_ids(project_path, rev, rel_paths)
+    results = {}
+    used_keys = set()
+    to_read = {}
+    for rel_path, oid in blob_ids.items():
+        file_path = str(project_path / rel_path)
+        key = f'{oid} {file_path}'
+        used_keys.add(key)
+        if cache is not None and key in cache.blobs:
+            results[file_path] = cache.decode_apis(file_path, cache.blobs[key])
+        else:
+            to_read[oid] = to_read.get(oid, []) + [file_path]
+
+    for oid, raw in read_blobs(project_path, list(to_read)).items():
+        for file_path in to_read[oid]:
+            try:
+                if skip_generated and content_skip_reason(Path(file_path), raw[:ADMISSION_HEAD_BYTES]):
+                    apis = []
+                else:
+                    content = source_content(Path(file_path), raw, use_mmap)
+                    apis = list(iter_unique_apis(scan_content(Path(file_path), content)))
+            except UnicodeDecodeError:
+                apis = []
+            results[file_path] = apis
+            if cache is not None:
+                cache.blobs[f'{oid} {file_path}'] = cache.encode_apis(apis)
+                cache.dirty = True
+
+    if cache is not None:
+        cache.retain_blobs(used_keys)
+    return results
+
+
+def working_tree_apis(file_paths: list[str], cache: Optional[ScanCache] = None,
+                      skip_generated: bool = False, use_mmap: bool = False) -> dict[str, list[APICall]]:
+    """APIs of the given files as they are on disk, keyed by absolute file path"""
+    results = {}
+    for file_path in file_paths:
+        if not os.path.isfile(file_path):
+            continue
+        apis = cache.lookup(file_path) if cache is not None else None
+        if apis is None:
+            scanned = scan_file_entry(file_path, skip_generated, use_mmap)
+            if scanned is None:
+                continue
+            if cache is not None:
+                cache.store(file_path, scanned)
+            apis = scanned[3]
+        results[file_path] = list(iter_unique_apis(apis))
+    return results
+
+
+def api_delta_key(api: APICall) -> tuple:
+    # Line numbers are left out: code moving around inside a file is no API change
+    return (api.type, api.method, api.path, api.file)
+
+
+def scan_since(project_path: Path, rev: str, cache: Optional[ScanCache] = None,
+               admission: Optional[FileAdmission] = None, use_mmap: bool = False) -> dict:
+    """API delta between rev and the working tree, scanning only changed files"""
+    base_commit = run_git(project_path, 'rev-parse', '--verify', f'{rev}^{{commit}}').decode().strip()
+    rel_paths = []
+    for path in changed_files_since(project_path, base_commit):
+        file_path = project_path / path
+        if not is_source_file(project_path, str(file_path)):
+            continue
+        reason = admission.path_reason(file_path) if admission is not None else None
+        if reason:
+            admission.skipped[reason] += 1
+            continue
+        rel_paths.append(path)
+
+    skip_generated = admission is not None and admission.skip_generated
+    base = base_revision_apis(project_path, base_commit, rel_paths, cache, skip_generated, use_mmap)
+    head = working_tree_apis([str(project_path / path) for path in rel_paths], cache, skip_generated, use_mmap)
+    if cache is not None:
+        cache.save()
+
+    added, removed, unchanged = [], [], []
+    for rel_path in rel_paths:
+        file_path = str(project_path / rel_path)
+        base_keys = {api_delta_key(api) for api in base.get(file_path, [])}
+        head_keys = {api_delta_key(api) for api in head.get(file_path, [])}
+        for api in head.get(file_path, []):
+            (unchanged if api_delta_key(api) in base_keys else added).append(api)
+        removed.extend(api for api in base.get(file_path, []) if api_delta_key(api) not in head_keys)
+
+    return {
+        'base': rev,
+        'baseCommit': base_commit,
+        'changedFiles': len(rel_paths),
+        'added': added,
+        'removed': removed,
+        'unchanged': unchanged,
+    }
+
+
+def format_delta_markdown(delta: dict, project_path: str) -> str:
+    """Format an API delta as markdown"""
+    output = f"# API Changes since `{delta['base']}`\n\n"
+    output += f"**Project:** `{project_path}`\n"
+    output += f"**Base Commit:** `{delta['baseCommit']}`\n"
+    output += f"**Changed Files Scanned:** {delta['changedFiles']}\n"
+    output += f"- Added: {len(delta['added'])}\n"
+    output += f"- Removed: {len(delta['removed'])}\n"
+    output += f"- Unchanged: {len(delta['unchanged'])}\n"
+
+    for title, key in (('Added', 'added'), ('Removed', 'removed')):
+        if not delta[key]:
+            continue
+        output += f"\n## {title}\n\n"
+        output += "| Type | Method | Path | File | Line |\n"
+        output += "|------|--------|------|------|------|\n"
+        for api in sorted(delta[key], key=lambda x: (x.type, x.path, x.method)):
+            rel_path = os.path.relpath(api.file, project_path)
+            output += f"| {api.type} | `{api.method}` | `{api.path}` | `{rel_path}` | {api.line} |\n"
+
+    return output
+
+
+def is_source_file(project_path: Path, file_path: str) -> bool:
+    """Would iter_source_files(project_path) yield this path?"""
+    path = Path(file_path)
+    if path.suffix.lower() not in SCAN_EXTENSIONS:
+        return False
+    try:
+        parts = path.relative_to(project_path).parts[:-1]
+    except ValueError:
+        return False
+    return not any(should_skip_dir(part) for part in parts)
+
+
+class InotifyTreeWatcher:
+    """Watch a project tree through Linux inotify (ctypes, no extra deps).
+
+    Every non-ignored directory gets its own watch; directories created or
+    moved in later are watched as they appear and their files reported.
+    """
+
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ISDIR = 0x40000000
+    MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    EVENT_HEADER = struct.Struct('iIII')
+
+    def __init__(self, project_path: Path):
+        libc_name = ctypes.util.find_library('c') or 'libc.so.6'
+        self.libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        # wd -> directory
+        self.watches = {}
+        # Set when the kernel queue overflowed and events were lost
+        self.overflowed = False
+        self.add_tree(str(project_path))
+
+    def add_tree(self, directory: str) -> list[str]:
+        """Watch directory and its subdirectories; return the files found"""
+        files = []
+        for root, dirs, names in os.walk(directory):
+            dirs[:] = [d for d in dirs if not should_skip_dir(d)]
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(root), self.MASK)
+            if wd < 0:
+                if root == directory:
+                    raise OSError(ctypes.get_errno(), f'inotify_add_watch failed: {root}')
+                continue
+            self.watches[wd] = root
+            files.extend(os.path.join(root, name) for name in names)
+        return files
+
+    def remove_tree(self, directory: str):
+        prefix = directory + os.sep
+        for wd, watched in list(self.watches.items()):
+            if watched == directory or watched.startswith(prefix):
+                self.libc.inotify_rm_watch(self.fd, wd)
+                del self.watches[wd]
+
+    def fileno(self) -> int:
+        return self.fd
+
+    def read_events(self) -> set[str]:
+        """Drain pending events and return the set of changed paths"""
+        changed = set()
+        while True:
+            try:
+                buf = os.read(self.fd, 64 * 1024)
+            except OSError:
+                break
+            if not buf:
+                break
+            offset = 0
+            while offset + self.EVENT_HEADER.size <= len(buf):
+                wd, mask, _cookie, name_len = self.EVENT_HEADER.unpack_from(buf, offset)
+                offset += self.EVENT_HEADER.size
+                name = os.fsdecode(buf[offset:offset + name_len].rstrip(b'\0'))
+                offset += name_len
+
+                if mask & self.IN_Q_OVERFLOW:
+                    self.overflowed = True
+                    continue
+                if mask & self.IN_IGNORED:
+                    self.watches.pop(wd, None)
+                    continue
+                directory = self.watches.get(wd)
+                if directory is None or not name:
+                    continue
+                path = os.path.join(directory, name)
+                if mask & self.IN_ISDIR:
+                    if should_skip_dir(name):
+                        continue
+                    if mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                        changed.update(self.add_tree(path))
+                    elif mask & self.IN_MOVED_FROM:
+                        self.remove_tree(path)
+                changed.add(path)
+        return changed
+
+    def close(self):
+        try:
+            os.close(self.fd)
+        except OSError:
+            pass
+
+
+class PollingTreeWatcher:
+    """Fallback watcher re-walking the tree and comparing (mtime_ns, size, inode)"""
+
+    def __init__(self, project_path: Path, interval: float = 1.0):
+        self.project_path = project_path
+        self.interval = interval
+        self.overflowed = False
+        self.signatures = self.snapshot()
+
+    def snapshot(self) -> dict:
+        signatures = {}
+        for file_path in iter_source_files(self.project_path):
+            try:
+                st = file_path.stat()
+            except OSError:
+                continue
+            signatures[str(file_path)] = (st.st_mtime_ns, st.st_size, st.st_ino)
+        return signatures
+
+    def fileno(self):
+        return None
+
+    def read_events(self) -> set[str]:
+        old = self.signatures
+        self.signatures = self.snapshot()
+        changed = {path for path, sig in self.signatures.items() if old.get(path) != sig}
+        changed.update(path for path in old if path not in self.signatures)
+        return changed
+
+    def close(self):
+        pass
+
+
+def create_tree_watcher(project_path: Path, poll_interval: float = 1.0):
+    """Return an inotify watcher when available, otherwise a polling watcher"""
+    if sys.platform.startswith('linux'):
+        try:
+            return InotifyTreeWatcher(project_path)
+        except (OSError, AttributeError):
+            pass
+    return PollingTreeWatcher(project_path, poll_interval)
+
+
+class ApiIndex:
+    """Deduplicated APICall lists per file, kept current by rescanning single files.
+
+    Files keep the position of the initial walk; files created later are
+    appended, so the flattened list matches a full scan except for the
+    placement of new files.
+    """
+
+    def __init__(self, project_path: Path, cache: Optional[ScanCache] = None,
+                 admission: Optional[FileAdmission] = None, use_mmap: bool = False,
+                 resolve_instances: bool = True):
+        self.project_path = project_path
+        self.cache = cache
+        self.admission = admission
+        self.use_mmap = use_mmap
+        self.resolve_instances = resolve_instances
+        self.skip_generated = admission is not None and admission.skip_generated
+        self.files = {}
+        self.instances = None
+        self.resync()
+
+    def resync(self):
+        """Full scan (using the cache when there is one)"""
+        file_paths = [str(f) for f in iter_source_files(self.project_path, self.admission)]
+        if self.resolve_instances:
+            self.instances = InstanceIndex.build(self.project_path, file_paths, cache=self.cache,
+                                                 skip_generated=self.skip_generated)
+        files = {}
+        apis = iter_scan(self.project_path, cache=self.cache, admission=self.admission, use_mmap=self.use_mmap,
+                         file_paths=file_paths)
+        for api in iter_unique_apis(apis):
+            files.setdefault(api.file, []).append(api)
+        self.files = files
+
+    def admits(self, file_path: str) -> bool:
+        if not is_source_file(self.project_path, file_path) or not os.path.isfile(file_path):
+            return False
+        return self.admission is None or self.admission.path_reason(Path(file_path)) is None
+
+    def scan(self, file_path: str) -> list[APICall]:
+        if self.cache is None:
+            return list(iter_unique_apis(scan_file(Path(file_path), self.skip_generated, use_mmap=self.use_mmap)))
+        scanned = scan_file_entry(file_path, self.skip_generated, self.use_mmap)
+        if scanned is None:
+            return []
+        self.cache.store(file_path, scanned)
+        return list(iter_unique_apis(scanned[3]))
+
+    def update_symbols(self, path: str, admitted: bool) -> bool:
+        """Refresh the instance index for a changed path; True if it changed"""
+        if self.instances is None:
+            return False
+        if admitted:
+            if not is_module_file(path):
+                return False
+            entry = read_symbols(path, self.skip_generated)
+            if entry is None:
+                return self.instances.update(path, None, exists=False)
+            if self.cache is not None:
+                self.cache.store_symbols(path, entry)
+            return self.instances.update(path, entry[2])
+        changed = self.instances.update(path, None, exists=False)
+        prefix = path + os.sep
+        for module in [f for f in self.instances.symbols if f.startswith(prefix)]:
+            changed = self.instances.update(module, None, exists=False) or changed
+        return changed
+
+    def update(self, changed_paths: set[str]) -> bool:
+        """Rescan changed paths; True when any file's APIs (or, conservatively,
+        the imported instances that label them) changed"""
+        modified = False
+        for path in sorted(changed_paths):
+            if os.path.isdir(path):
+                # Files of a moved-in directory are reported individually
+                continue
+            admitted = self.admits(path)
+            if self.update_symbols(path, admitted):
+                modified = True
+            if admitted:
+                apis = self.scan(path)
+            else:
+                # Deleted file, or a removed/moved-away directory
+                apis = []
+                prefix = path + os.sep
+                for file_path in [f for f in self.files if f.startswith(prefix)]:
+                    del self.files[file_path]
+                    modified = True
+            if apis != self.files.get(path, []):
+                modified = True
+                if apis:
+                    self.files[path] = apis
+                else:
+                    del self.files[path]
+        return modified
+
+    def apis(self) -> list[APICall]:
+        apis = (api for apis in self.files.values() for api in apis)
+        if self.instances is not None:
+            apis = self.instances.classify(apis)
+        return list(apis)
+
+
+def render_watch_output(apis: list[APICall], output: str):
+    if output == 'inspector':
+        return format_json_for_inspector(apis)
+    return [api_dict(api) for api in apis]
+
+
+def watch_project(project_path: Path, output: str, cache: Optional[ScanCache] = None,
+                  admission: Optional[FileAdmission] = None, use_mmap: bool = False,
+                  resolve_instances: bool = True, poll_interval: float = 1.0, debounce: float = 0.05) -> int:
+    """Print the API list, then a new one (one JSON document per line)
+    every time an edit changes it. Runs until interrupted."""
+    # Start watching before the initial scan so no edit falls in between
+    watcher = create_tree_watcher(project_path, poll_interval)
+    index = ApiIndex(project_path, cache, admission, use_mmap, resolve_instances)
+    last = render_watch_output(index.apis(), output)
+    print(json.dumps(last), flush=True)
+
+    try:
+        while True:
+            fd = watcher.fileno()
+            if fd is None:
+                time.sleep(watcher.interval)
+                changed = watcher.read_events()
+            else:
+                select.select([fd], [], [])
+                changed = watcher.read_events()
+                # Editors save in several steps: collect the burst first
+                while debounce > 0 and select.select([fd], [], [], debounce)[0]:
+                    changed |= watcher.read_events()
+
+            if watcher.overflowed:
+                watcher.overflowed = False
+                index.resync()
+            elif not changed or not index.update(changed):
+                continue
+
+            current = render_watch_output(index.apis(), output)
+            if current != last:
+                last = current
+                print(json.dumps(current), flush=True)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+        if cache is not None:
+            cache.save()
+    return 0
+
+
+@contextmanager
+def report_output(path: Optional[Path]) -> Iterator[TextIO]:
+    """stdout, or a temporary file next to path that replaces it once the
+    report is written: an interrupted run, or one that fails before writing
+    anything, leaves an existing report alone. A path that cannot be
+    written ends the run with exit status 1."""
+    if path is None:
+        yield sys.stdout
+        return
+    tmp_file = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    try:
+        out = open(tmp_file, 'w', encoding='utf-8')
+    except OSError as e:
+        print(f"Error: cannot write {path}: {e.strerror or e}", file=sys.stderr)
+        raise SystemExit(1)
+    try:
+        yield out
+        try:
+            written = out.tell() > 0
+            out.close()
+            if written:
+                os.replace(tmp_file, path)
+        except OSError as e:
+            print(f"Error: cannot write {path}: {e.strerror or e}", file=sys.stderr)
+            raise SystemExit(1)
+    finally:
+        out.close()
+        if os.path.exists(tmp_file):
+            os.unlink(tmp_file)
+
+
+def print_since(project_path: Path, rev: str, output: str, cache: Optional[ScanCache],
+                admission: FileAdmission, use_mmap: bool, out: Optional[TextIO] = None) -> int:
+    """--since: print the API delta against rev"""
+    out = out if out is not None else sys.stdout
+    try:
+        delta = scan_since(project_path, rev, cache, admission, use_mmap)
+    except FileNotFoundError:
+        print("Error: git is not installed", file=sys.stderr)
+        return 1
+    except subprocess.CalledProcessError as e:
+        print(f"Error: git {e.cmd[3]} failed: {e.stderr.decode(errors='replace').strip()}", file=sys.stderr)
+        return 1
+    if output == 'markdown':
+        print(format_delta_markdown(delta, str(project_path)), file=out)
+        return 0
+    for key in ('added', 'removed', 'unchanged'):
+        if output == 'inspector':
+            delta[key] = format_json_for_inspector(delta[key])
+        else:
+            delta[key] = [api_dict(api) for api in delta[key]]
+    if output == 'ndjson':
+        for key in ('added', 'removed', 'unchanged'):
+            for entry in delta[key]:
+                print(json.dumps({'change': key, **entry}), file=out)
+    else:
+        print(json.dumps(delta, indent=2), file=out)
+    return 0
+
+
+def print_scan(project_path: Path, output: str, workers: int, chunk_size: int,
+               cache: Optional[ScanCache], admission: FileAdmission, use_mmap: bool,
+               profile: Optional[ScanProfile] = None, resolve_instances: bool = True,
+               coverage: bool = False, out: Optional[TextIO] = None) -> int:
+    """Full scan: print every discovered API, or with coverage the
+    frontend-to-backend route coverage report"""
+    out = out if out is not None else sys.stdout
+    apis = iter_apis(project_path, workers=workers, chunk_size=chunk_size, cache=cache, admission=admission,
+                     use_mmap=use_mmap, profile=profile, resolve_instances=resolve_instances)
+
+    if coverage:
+        report = route_coverage(apis, profile)
+        if output == 'json':
+            print(json.dumps(report, indent=2), file=out)
+        else:
+            print(format_coverage_markdown(report, str(project_path)), file=out)
+        return 0
+
+    if output == 'ndjson':
+        current_file = None
+        for api in apis:
+            # Flush per file rather than per line: consumers still see
+            # results as the walk progresses without a syscall per hit
+            if api.file != current_file:
+                current_file = api.file
+                out.flush()
+            out.write(api_json(api) + '\n')
+        out.flush()
+        return 0
+
+    if output == 'json':
+        write_json_apis(apis, out)
+    elif output == 'inspector':
+        print(json.dumps(format_json_for_inspector(apis), indent=2), file=out)
+    else:
+        write_markdown(apis, str(project_path), out)
+        out.write('\n')
+
+    return 0
+
+
+def print_catalog(project_path: Path, db_path: Path, workers: int, chunk_size: int,
+                  cache: Optional[ScanCache], admission: FileAdmission, use_mmap: bool,
+                  profile: Optional[ScanProfile] = None, resolve_instances: bool = True) -> int:
+    """--output sqlite: scan and upsert the results into the catalog at db_path"""
+    apis = list(iter_apis(project_path, workers=workers, chunk_size=chunk_size, cache=cache, admission=admission,
+                          use_mmap=use_mmap, profile=profile, resolve_instances=resolve_instances))
+    start = time.perf_counter()
+    try:
+        summary = write_catalog(apis, project_path, db_path)
+    except (ValueError, sqlite3.Error) as e:
+        print(f"Error: {e}")
+        return 1
+    if profile is not None:
+        profile.seconds['catalog-write'] += time.perf_counter() - start
+    print(json.dumps(summary))
+    return 0
+
+
+def format_skipped(skipped: Counter) -> str:
+    """One stderr line: 'Skipped 3 files (gitignore: 2, too-large: 1) and 1 directory (gitignore: 1)'"""
+    parts = []
+    for kind, counts in (('file', {reason: count for reason, count in skipped.items() if not reason.endswith('-dir')}),
+                         ('directory', {reason[:-4]: count for reason, count in skipped.items()
+                                        if reason.endswith('-dir')})):
+        total = sum(counts.values())
+        if total:
+            noun = kind if total == 1 else ('directories' if kind == 'directory' else 'files')
+            details = ', '.join(f'{reason}: {count}' for reason, count in sorted(counts.items()))
+            parts.append(f'{total} {noun} ({details})')
+    return f"Skipped {' and '.join(parts)}; --skip-report prints the counts as JSON"
+
+
 def main():
     parser = argparse.ArgumentParser(description='Discover APIs in a project')
     parser.add_argument('project_path', help='Path to the project directory')
-    parser.add_argument('--output', choices=['json', 'markdown', 'inspector'], default='markdown',
-                        help='Output format (default: markdown, inspector for PromptInspector format)')
+    parser.add_argument('--output', choices=['json', 'ndjson', 'markdown', 'inspector', 'sqlite'], default='markdown',
+                        help='Output format (default: markdown, inspector for PromptInspector format, '
+                             'ndjson streams one API per line while scanning, sqlite upserts into the '
+                             'indexed catalog database given by --output-file)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Worker processes for scanning (default: 1, 0 = one per CPU)')
+    parser.add_argument('--chunk-size', type=int, default=64,
+                        help='Files per worker batch (default: 64)')
+    cache_group = parser.add_mutually_exclusive_group()
+    cache_group.add_argument('--cache', action='store_true',
+                             help='Keep a per-file result cache under $XDG_CACHE_HOME/prompt-inspector/ '
+                                  '(~/.cache when unset) so rescans only read changed files')
+    cache_group.add_argument('--cache-file', type=Path, metavar='PATH',
+                             help='Keep the per-file result cache in PATH')
+    cache_group.add_argument('--no-cache', action='store_true',
+                             help='Scan every file without reading or writing a cache (the default)')
+    parser.add_argument('--watch', action='store_true',
+                        help='Keep running and print the json/inspector output again (one document '
+                             'per line) whenever an edit changes the discovered APIs')
+    parser.add_argument('--since', metavar='REV',
+                        help='Only scan files changed since a git revision and report the '
+                             'added/removed/unchanged APIs')
+    parser.add_argument('--poll-interval', type=float, default=1.0,
+                        help='Seconds between tree rescans when inotify is unavailable (default: 1.0)')
+    parser.add_argument('--max-file-size', type=int, default=DEFAULT_MAX_FILE_SIZE,
+                        help='Skip source files larger than this many bytes, e.g. 1048576 (default: 0 = no limit)')
+    parser.add_argument('--max-spec-size', type=int, default=DEFAULT_MAX_SPEC_SIZE,
+                        help='Skip .json/.yaml files larger than this many bytes (default: 0 = no limit)')
+    generated = parser.add_mutually_exclusive_group()
+    generated.add_argument('--skip-generated', action='store_true',
+                           help='Skip minified bundles and files whose header says @generated or '
+                                '"Code generated ... DO NOT EDIT."')
+    generated.add_argument('--include-generated', action='store_false', dest='skip_generated',
+                           help='Scan generated and minified files (the default)')
+    parser.add_argument('--no-gitignore', action='store_true',
+                        help=f'Do not honor .gitignore files ({PROJECT_IGNORE_FILE} is always honored)')
+    parser.add_argument('--read-mode', choices=['mmap', 'text'], default='text',
+                        help='text: decode whole files as UTF-8 and skip those that fail; mmap: match '
+                             'ASCII code files as raw bytes (mapped from 64 KiB up) and decode only the '
+                             'matches, so files that are not UTF-8 are still scanned (default: text)')
+    parser.add_argument('--no-instance-index', action='store_true',
+                        help='Skip the pass that follows imports/re-exports of HTTP client instances '
+                             'across modules (calls then only see instances declared in the same file)')
+    parser.add_argument('--coverage', action='store_true',
+                        help='Match frontend calls to backend/OpenAPI endpoints and report matched routes, '
+                             'frontend-only calls and backend-only endpoints instead of the API list')
+    parser.add_argument('--output-file', type=Path, metavar='PATH',
+                        help='Write the report to PATH instead of stdout (replaced only once the report '
+                             'is written)')
+    parser.add_argument('--skip-report', action='store_true',
+                        help='Print the number of skipped files per reason to stderr as JSON (a one-line '
+                             'summary is printed whenever files were skipped)')
+    parser.add_argument('--profile', action='store_true',
+                        help='Print a JSON scan profile to stderr: time and matches per pattern family, '
+                             'bytes read, skipped files and the slowest files (without --cache every '
+                             'file is timed)')
+    parser.add_argument('--profile-top', type=int, default=10, metavar='N',
+                        help='Slowest files listed in the --profile report (default: 10)')
     args = parser.parse_args()
 
     project_path = Path(args.project_path).resolve()
@@ -493,16 +3244,58 @@ def main():
         print(f"Error: Path '{project_path}' does not exist")
         return 1
 
-    apis = scan_directory(project_path)
-
-    if args.output == 'json':
-        print(json.dumps([asdict(api) for api in apis], indent=2))
-    elif args.output == 'inspector':
-        print(json.dumps(format_json_for_inspector(apis), indent=2))
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+    admission = FileAdmission(project_path, max_file_size=args.max_file_size, max_spec_size=args.max_spec_size,
+                              skip_generated=args.skip_generated, use_gitignore=not args.no_gitignore)
+    use_mmap = args.read_mode == 'mmap'
+    cache = None
+    if args.cache or args.cache_file:
+        options = [args.read_mode] + (['skip-generated'] if admission.skip_generated else [])
+        cache = ScanCache(args.cache_file or ScanCache.default_path(project_path), options=','.join(options))
+
+    if args.profile and (args.watch or args.since):
+        parser.error('--profile only applies to full scans')
+    if args.coverage and (args.watch or args.since):
+        parser.error('--coverage only applies to full scans')
+    if args.coverage and args.output not in {'json', 'markdown'}:
+        parser.error('--coverage needs --output json or --output markdown')
+    if args.output == 'sqlite':
+        if args.watch or args.since:
+            parser.error('--output sqlite only applies to full scans')
+        if not args.output_file:
+            parser.error('--output sqlite needs --output-file PATH (the catalog database)')
+        if sqlite3 is None:
+            parser.error('--output sqlite needs Python built with the sqlite3 module')
+
+    if args.watch:
+        if args.output_file:
+            parser.error('--output-file does not apply to --watch')
+        if args.output not in {'json', 'inspector'}:
+            parser.error('--watch needs --output json or --output inspector')
+        return watch_project(project_path, args.output, cache, admission, use_mmap, not args.no_instance_index,
+                             poll_interval=args.poll_interval)
+
+    profile = ScanProfile(max(0, args.profile_top)) if args.profile else None
+    start = time.perf_counter()
+    if args.output == 'sqlite':
+        status = print_catalog(project_path, args.output_file, workers, max(1, args.chunk_size), cache, admission,
+                               use_mmap, profile, not args.no_instance_index)
     else:
-        print(format_markdown(apis, str(project_path)))
-
-    return 0
+        with report_output(args.output_file) as out:
+            if args.since:
+                status = print_since(project_path, args.since, args.output, cache, admission, use_mmap, out)
+            else:
+                status = print_scan(project_path, args.output, workers, max(1, args.chunk_size), cache,
+                                    admission, use_mmap, profile, not args.no_instance_index, args.coverage, out)
+
+    if profile is not None:
+        report = profile.report(project_path, time.perf_counter() - start, admission.skipped, cache)
+        print(json.dumps(report, indent=2), file=sys.stderr)
+    if args.skip_report:
+        print(json.dumps({'skipped': dict(sorted(admission.skipped.items()))}), file=sys.stderr)
+    elif admission.skipped:
+        print(format_skipped(admission.skipped), file=sys.stderr)
+    return status
 
 
 if __name__ == '__main__':